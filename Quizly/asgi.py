@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Quizly.settings')
 
 application = get_asgi_application()
+
+# Imported once the apps are loaded
+from quiz_management.jobs import start_embedded_workers  # noqa: E402
+
+start_embedded_workers()
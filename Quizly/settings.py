@@ -32,6 +32,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'quiz_management.middleware.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -60,11 +61,46 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'Quizly.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# --- Database Configuration ---
+# SQLite by default. Set DB_ENGINE (e.g. django.db.backends.postgresql) and the
+# DB_* variables below to use a database server.
+DB_ENGINE = os.getenv('DB_ENGINE', 'django.db.backends.sqlite3')
+
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'OPTIONS': {
+                # Take the write lock when a transaction starts instead of failing on upgrade
+                'transaction_mode': 'IMMEDIATE',
+                # Seconds to wait for the write lock
+                'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '20')),
+            },
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': DB_ENGINE,
+            'NAME': os.getenv('DB_NAME', 'quizly'),
+            'USER': os.getenv('DB_USER', ''),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', ''),
+            # Keep connections open between requests and check them before reuse
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            'CONN_HEALTH_CHECKS': True,
+        }
     }
+
+# PRAGMAs applied to every new SQLite connection (see quiz_management.signals)
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', '20')) * 1000,
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))),
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -88,6 +124,33 @@ REST_FRAMEWORK = {
     )
 }
 
+SIMPLE_JWT = {
+    # Checks the hash of the user's password hash that tokens carry; changing the password revokes them.
+    # Tokens issued without the claim are rejected, so enable it only once they have expired
+    'CHECK_REVOKE_TOKEN': os.getenv('JWT_CHECK_REVOKE_TOKEN', 'False') == 'True',
+}
+
+# Seconds an authenticated user is cached per process (0 looks the user up on every request)
+AUTH_USER_CACHE_SECONDS = int(os.getenv('AUTH_USER_CACHE_SECONDS', '30'))
+
+# Maximum number of users cached per process (least recently used ones are dropped)
+AUTH_USER_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_USER_CACHE_MAX_ENTRIES', '10000'))
+
+# Authenticate GET/HEAD/OPTIONS requests from the token claims alone, without a user lookup
+AUTH_STATELESS_READS = os.getenv('AUTH_STATELESS_READS', 'False') == 'True'
+
+# Check refresh tokens against an in-process filter of blacklisted token ids before querying the blacklist
+BLACKLIST_FILTER_ENABLED = os.getenv('BLACKLIST_FILTER_ENABLED', 'True') == 'True'
+
+# Seconds between two reads of newly blacklisted tokens into the filter. A refresh token that
+# was blacklisted by another process stays usable here for up to this long (0 syncs on every check)
+BLACKLIST_FILTER_SYNC_SECONDS = float(os.getenv('BLACKLIST_FILTER_SYNC_SECONDS', '5'))
+
+# Blacklisted tokens the filter holds before it is rebuilt, and its false positive rate at that size.
+# A rebuild makes room for twice the current blacklist if that is larger
+BLACKLIST_FILTER_CAPACITY = int(os.getenv('BLACKLIST_FILTER_CAPACITY', '100000'))
+BLACKLIST_FILTER_ERROR_RATE = float(os.getenv('BLACKLIST_FILTER_ERROR_RATE', '0.001'))
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -118,4 +181,203 @@ CSRF_TRUSTED_ORIGINS = [
     "http://127.0.0.1:5173",
     "http://localhost:5500",
     "http://127.0.0.1:5500",
-]
\ No newline at end of file
+]
+
+# --- Cache Configuration ---
+# Local memory by default; set CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# and CACHE_LOCATION to a directory to share the cache between worker processes.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'quizly'),
+    }
+}
+
+
+# --- Quiz API Configuration ---
+
+# Default and maximum number of quizzes per page in quiz lists
+QUIZ_PAGE_SIZE = int(os.getenv('QUIZ_PAGE_SIZE', '20'))
+QUIZ_MAX_PAGE_SIZE = int(os.getenv('QUIZ_MAX_PAGE_SIZE', '100'))
+
+# Seconds a serialized quiz detail response stays in the cache
+QUIZ_DETAIL_CACHE_SECONDS = int(os.getenv('QUIZ_DETAIL_CACHE_SECONDS', '3600'))
+
+
+# --- ASGI Configuration ---
+
+# Serve the quiz list/detail and auth endpoints with native async views (enable under an ASGI server)
+ASYNC_VIEWS_ENABLED = os.getenv('ASYNC_VIEWS_ENABLED', 'False') == 'True'
+
+# Threads per process that hash and verify passwords for the async auth views
+PASSWORD_HASHING_WORKERS = int(os.getenv('PASSWORD_HASHING_WORKERS', '2'))
+
+
+# --- Metrics Configuration ---
+
+# Record per-view request and query histograms and per-stage generation timings (served on /metrics)
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+
+# /metrics requires the header "Authorization: Bearer <METRICS_TOKEN>"; without a token
+# it is only served when DEBUG is on
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Seconds the job queue and transcript cache gauges are reused between scrapes
+METRICS_STATE_CACHE_SECONDS = float(os.getenv('METRICS_STATE_CACHE_SECONDS', '10'))
+
+# Add a Server-Timing header with database and stage timings to every response
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING_ENABLED', 'True') == 'True'
+
+
+# --- Quiz Generation Configuration ---
+
+# Whisper model size used for transcription (tiny, base, small, medium, large)
+WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'base')
+
+# Load the Whisper model when the worker starts instead of on the first request
+WHISPER_PRELOAD = os.getenv('WHISPER_PRELOAD', 'False') == 'True'
+
+# Maximum number of Whisper models kept in memory per process (LRU eviction)
+WHISPER_MAX_LOADED_MODELS = int(os.getenv('WHISPER_MAX_LOADED_MODELS', '1'))
+
+# Number of background threads per process that run quiz generation jobs
+GENERATION_WORKERS = int(os.getenv('GENERATION_WORKERS', '2'))
+
+# Run generation workers inside the web process (disable when using run_generation_workers)
+GENERATION_EMBEDDED_WORKERS = os.getenv('GENERATION_EMBEDDED_WORKERS', 'True') == 'True'
+
+# Seconds a worker may hold a job before another worker is allowed to take it over
+GENERATION_JOB_LEASE_SECONDS = int(os.getenv('GENERATION_JOB_LEASE_SECONDS', '900'))
+
+# Number of times a job is started before it is marked as failed
+GENERATION_JOB_MAX_ATTEMPTS = int(os.getenv('GENERATION_JOB_MAX_ATTEMPTS', '3'))
+
+# Seconds an idle worker waits before polling the queue again
+GENERATION_WORKER_POLL_SECONDS = float(os.getenv('GENERATION_WORKER_POLL_SECONDS', '2'))
+
+# Maximum number of jobs of one batch (URL list or playlist) that run at the same time
+GENERATION_BATCH_CONCURRENCY = int(os.getenv('GENERATION_BATCH_CONCURRENCY', '2'))
+
+# Maximum number of videos in one batch; longer playlists are cut off
+GENERATION_BATCH_MAX_ITEMS = int(os.getenv('GENERATION_BATCH_MAX_ITEMS', '50'))
+
+# Minimum seconds between two stored progress updates of a running job
+GENERATION_PROGRESS_INTERVAL_SECONDS = float(os.getenv('GENERATION_PROGRESS_INTERVAL_SECONDS', '1'))
+
+# Seconds between two job lookups of an open progress event stream. The interval doubles
+# while the job does not change, up to GENERATION_EVENTS_MAX_POLL_SECONDS
+GENERATION_EVENTS_POLL_SECONDS = float(os.getenv('GENERATION_EVENTS_POLL_SECONDS', '0.5'))
+GENERATION_EVENTS_MAX_POLL_SECONDS = float(os.getenv('GENERATION_EVENTS_MAX_POLL_SECONDS', '4'))
+
+# Seconds of silence after which an event stream sends a keep-alive comment
+GENERATION_EVENTS_HEARTBEAT_SECONDS = float(os.getenv('GENERATION_EVENTS_HEARTBEAT_SECONDS', '15'))
+
+# Maximum lifetime of an event stream; clients reconnect automatically afterwards
+GENERATION_EVENTS_MAX_SECONDS = float(os.getenv('GENERATION_EVENTS_MAX_SECONDS', '600'))
+
+# Reuse transcripts of videos that were already transcribed
+TRANSCRIPT_CACHE_ENABLED = os.getenv('TRANSCRIPT_CACHE_ENABLED', 'True') == 'True'
+
+# Maximum total size of cached transcripts in bytes (least recently used entries are evicted)
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv('TRANSCRIPT_CACHE_MAX_BYTES', str(200 * 1024 * 1024)))
+
+# Seconds a running generation may go without progress before waiting requests take over
+SINGLE_FLIGHT_LEASE_SECONDS = int(os.getenv('SINGLE_FLIGHT_LEASE_SECONDS', '900'))
+
+# Seconds a finished generation is shared with requests for the same video
+SINGLE_FLIGHT_RESULT_SECONDS = int(os.getenv('SINGLE_FLIGHT_RESULT_SECONDS', '30'))
+
+# Seconds between checks while waiting for a generation running in another process
+SINGLE_FLIGHT_POLL_SECONDS = float(os.getenv('SINGLE_FLIGHT_POLL_SECONDS', '1'))
+
+# Use the video's published or auto-generated captions before falling back to Whisper
+CAPTIONS_ENABLED = os.getenv('CAPTIONS_ENABLED', 'True') == 'True'
+
+# Preferred caption languages, in order (comma-separated language codes)
+CAPTION_LANGUAGES = os.getenv('CAPTION_LANGUAGES', 'de,en').split(',')
+
+# Captions shorter than this many characters are ignored and Whisper is used instead
+CAPTION_MIN_CHARS = int(os.getenv('CAPTION_MIN_CHARS', '200'))
+
+# Transcribe audio segments while the rest of the stream is still downloading
+TRANSCRIBE_PIPELINE_ENABLED = os.getenv('TRANSCRIBE_PIPELINE_ENABLED', 'True') == 'True'
+
+# Length of the audio segments handed to Whisper in pipelined mode (seconds)
+TRANSCRIBE_SEGMENT_SECONDS = int(os.getenv('TRANSCRIBE_SEGMENT_SECONDS', '120'))
+
+# Number of decoded segments buffered ahead of the transcriber
+TRANSCRIBE_PIPELINE_DEPTH = int(os.getenv('TRANSCRIBE_PIPELINE_DEPTH', '4'))
+
+# Transcribe long videos in chunks split at silence, in parallel worker processes
+TRANSCRIBE_PARALLEL_ENABLED = os.getenv('TRANSCRIBE_PARALLEL_ENABLED', 'False') == 'True'
+
+# Number of transcription worker processes (each loads its own Whisper model)
+TRANSCRIBE_PARALLEL_WORKERS = int(os.getenv('TRANSCRIBE_PARALLEL_WORKERS', '2'))
+
+# Torch threads used by each transcription worker process
+TRANSCRIBE_THREADS_PER_WORKER = int(os.getenv('TRANSCRIBE_THREADS_PER_WORKER', '2'))
+
+# Target chunk length for parallel transcription (seconds)
+TRANSCRIBE_CHUNK_SECONDS = int(os.getenv('TRANSCRIBE_CHUNK_SECONDS', '300'))
+
+# How far around each chunk boundary to look for silence (seconds)
+TRANSCRIBE_SILENCE_SEARCH_SECONDS = float(os.getenv('TRANSCRIBE_SILENCE_SEARCH_SECONDS', '10'))
+
+# Audio shared by neighbouring chunks so words at the edges are not lost (seconds)
+TRANSCRIBE_CHUNK_OVERLAP_SECONDS = float(os.getenv('TRANSCRIBE_CHUNK_OVERLAP_SECONDS', '1'))
+
+# Gemini model used for question generation
+GEMINI_MODEL = os.getenv('GEMINI_MODEL', 'gemini-flash-latest')
+
+# Number of questions per generated quiz
+QUIZ_QUESTION_COUNT = int(os.getenv('QUIZ_QUESTION_COUNT', '10'))
+
+# Transcripts longer than this are split into windows of this many tokens
+GEMINI_CHUNK_TOKENS = int(os.getenv('GEMINI_CHUNK_TOKENS', '6000'))
+
+# Tokens shared by neighbouring windows so no passage is cut off
+GEMINI_CHUNK_OVERLAP_TOKENS = int(os.getenv('GEMINI_CHUNK_OVERLAP_TOKENS', '300'))
+
+# Maximum number of Gemini requests running at once for one quiz
+GEMINI_MAX_PARALLEL_REQUESTS = int(os.getenv('GEMINI_MAX_PARALLEL_REQUESTS', '4'))
+
+# tiktoken encoding used to measure transcript length
+GEMINI_TOKENIZER_ENCODING = os.getenv('GEMINI_TOKENIZER_ENCODING', 'cl100k_base')
+
+# Backend that answers Gemini requests (use FakeBackend for offline load tests)
+GEMINI_BACKEND = os.getenv('GEMINI_BACKEND', 'quiz_management.gemini_client.GenaiBackend')
+
+# Response delay of the fake Gemini backend (seconds)
+GEMINI_FAKE_LATENCY_SECONDS = float(os.getenv('GEMINI_FAKE_LATENCY_SECONDS', '0.5'))
+
+# Maximum number of Gemini requests in flight per process
+GEMINI_MAX_CONCURRENT_REQUESTS = int(os.getenv('GEMINI_MAX_CONCURRENT_REQUESTS', '8'))
+
+# Average Gemini requests per second per process (0 disables the rate limiter)
+GEMINI_REQUESTS_PER_SECOND = float(os.getenv('GEMINI_REQUESTS_PER_SECOND', '2'))
+
+# Number of Gemini requests that may be sent in a burst
+GEMINI_REQUEST_BURST = int(os.getenv('GEMINI_REQUEST_BURST', '5'))
+
+# Attempts per Gemini request for rate limits, server errors and timeouts
+GEMINI_MAX_ATTEMPTS = int(os.getenv('GEMINI_MAX_ATTEMPTS', '5'))
+
+# Exponential backoff between retries (seconds)
+GEMINI_RETRY_INITIAL_SECONDS = float(os.getenv('GEMINI_RETRY_INITIAL_SECONDS', '1'))
+GEMINI_RETRY_MAX_SECONDS = float(os.getenv('GEMINI_RETRY_MAX_SECONDS', '30'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'quiz_management': {
+            'handlers': ['console'],
+            'level': os.getenv('QUIZ_LOG_LEVEL', 'INFO'),
+        },
+    },
+}
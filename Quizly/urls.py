@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from quiz_management.views import MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     
@@ -12,4 +14,7 @@ urlpatterns = [
 
     # 3. Legacy support: Keeps /api/token/refresh/ working to avoid breaking existing clients
     path('api/token/', include('authentication.urls')),
+
+    # 4. Prometheus scrape endpoint
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
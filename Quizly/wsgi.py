@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Quizly.settings')
 
 application = get_wsgi_application()
+
+# Imported once the apps are loaded
+from quiz_management.jobs import start_embedded_workers  # noqa: E402
+
+start_embedded_workers()
@@ -1,19 +1,128 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from . import user_cache
+
+
 class CookieJWTAuthentication(JWTAuthentication):
     """
     Custom JWT Authentication class that reads the access token from an HTTP-only cookie.
-    
+
     Falls back to the standard header-based authentication if the header is present.
+
+    Users are kept in a short-lived per-process cache (user_cache), so most
+    requests do not query auth_user. With AUTH_STATELESS_READS, read-only
+    requests get a user built from the token claims without any lookup.
     """
     def authenticate(self, request):
+        validated_token = self.get_request_token(request)
+        if validated_token is None:
+            return None
+        if self.is_stateless(request):
+            return user_cache.token_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    async def aauthenticate(self, request):
+        """
+        Async variant of authenticate() for async views.
+        Only a cache miss needs a thread for the database lookup.
+        """
+        validated_token = self.get_request_token(request)
+        if validated_token is None:
+            return None
+        if self.is_stateless(request):
+            return user_cache.token_user(validated_token), validated_token
+
+        key = user_cache.key_for(validated_token)
+        user = user_cache.lookup(key)
+        if user is None:
+            # The parent's lookup, so the miss is not counted a second time
+            user = await sync_to_async(super().get_user)(validated_token)
+            user_cache.store(key, user)
+        return user, validated_token
+
+    def get_user(self, validated_token):
+        """
+        Returns the token's user from the cache, or loads, checks and caches it.
+        Inactive users and tokens issued before a password change are rejected
+        by the parent class and never cached.
+        """
+        key = user_cache.key_for(validated_token)
+        user = user_cache.lookup(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.store(key, user)
+        return user
+
+    def is_stateless(self, request):
+        return settings.AUTH_STATELESS_READS and request.method in SAFE_METHODS
+
+    def get_request_token(self, request):
+        """
+        Returns the validated token from the Authorization header or, without
+        that header, from the access token cookie. Returns None if there is none.
+        """
         header = self.get_header(request)
         if header is not None:
-            return super().authenticate(request)
+            raw_token = self.get_raw_token(header)
+        else:
+            raw_token = request.COOKIES.get('access_token')
 
-        raw_token = request.COOKIES.get('access_token')
         if raw_token is None:
             return None
+        return self.get_validated_token(raw_token)
+
+
+class AsyncAPIView(View):
+    """
+    Base class for native async views served by the ASGI application.
+
+    Authenticates like the DRF views (JWT from header or cookie) and
+    answers 401 before dispatching if `authentication_required` is set.
+    As with APIView, CSRF checks are skipped because authentication does
+    not rely on sessions.
+    """
+    authentication_required = True
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.authentication_required:
+            try:
+                user_auth = await CookieJWTAuthentication().aauthenticate(request)
+            except AuthenticationFailed as e:
+                detail = e.detail if isinstance(e.detail, dict) else {"detail": e.detail}
+                return JsonResponse(detail, status=status.HTTP_401_UNAUTHORIZED)
+
+            if user_auth is None:
+                return JsonResponse(
+                    {"detail": "Authentication credentials were not provided."},
+                    status=status.HTTP_401_UNAUTHORIZED
+                )
+            request.user = user_auth[0]
+
+        return await super().dispatch(request, *args, **kwargs)
 
-        validated_token = self.get_validated_token(raw_token)
-        return self.get_user(validated_token), validated_token
\ No newline at end of file
+    def parse_json(self, request):
+        """
+        Returns the JSON object in the request body ({} for an empty body).
+        Raises ValueError if the body is not a JSON object.
+        """
+        if not request.body:
+            return {}
+        data = json.loads(request.body)
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object.")
+        return data
@@ -0,0 +1,120 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+# Seconds a missing blacklist id is waited for before it is skipped. Ids can
+# become visible out of order when transactions commit in a different order
+# than they were started in, or never when an insert was rolled back.
+GAP_TIMEOUT_SECONDS = 60
+
+# Larger jumps between consecutive ids are not tracked as missing ids
+MAX_TRACKED_GAP = 1000
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter of strings. `might_contain()` never misses an
+    added value and is wrong for other values with about `error_rate`
+    probability once `capacity` values were added.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(1, capacity)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def add(self, value):
+        for index in self._indexes(value):
+            self.bits[index >> 3] |= 1 << (index & 7)
+        self.count += 1
+
+    def might_contain(self, value):
+        return all(self.bits[index >> 3] & (1 << (index & 7)) for index in self._indexes(value))
+
+    def _indexes(self, value):
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
+
+
+class BlacklistFilter:
+    """
+    Per-process filter of blacklisted refresh token JTIs.
+
+    A JTI the filter has never seen is certainly not blacklisted (as of the
+    last sync), so the database is only asked for the rare positives. The
+    filter is synced incrementally from BlacklistedToken rows with ids
+    above the highest one seen, at most every BLACKLIST_FILTER_SYNC_SECONDS.
+    Ids skipped on the way are polled again until they show up or time out.
+    Tokens blacklisted in this process are added immediately; tokens
+    blacklisted by other processes are only rejected after the next sync,
+    so they can still be refreshed for up to BLACKLIST_FILTER_SYNC_SECONDS.
+    Once full, the filter is rebuilt from the table without the expired
+    tokens, with room for at least twice as many as are still blacklisted.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._watermark = 0
+        self._missing = {}
+        self._synced_at = 0.0
+
+    def might_be_blacklisted(self, jti):
+        with self._lock:
+            if self._filter is None or self._filter.count > self._filter.capacity:
+                self._rebuild()
+            elif time.monotonic() - self._synced_at >= settings.BLACKLIST_FILTER_SYNC_SECONDS:
+                self._sync()
+            return self._filter.might_contain(jti)
+
+    def add(self, jti):
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def reset(self):
+        with self._lock:
+            self._filter = None
+
+    def _rebuild(self):
+        rows = BlacklistedToken.objects.filter(token__expires_at__gt=timezone.now())
+        # Sized from the current rows, so a blacklist larger than the setting
+        # does not leave the filter full and trigger a rebuild on every check
+        capacity = max(settings.BLACKLIST_FILTER_CAPACITY, 2 * rows.count())
+        self._filter = BloomFilter(capacity, settings.BLACKLIST_FILTER_ERROR_RATE)
+        self._watermark = 0
+        self._missing = {}
+        self._load(rows, track_gaps=False)
+
+    def _sync(self):
+        rows = BlacklistedToken.objects.filter(Q(id__gt=self._watermark) | Q(id__in=list(self._missing)))
+        self._load(rows, track_gaps=True)
+
+        # Ids that never showed up were rolled back or deleted
+        cutoff = time.monotonic() - GAP_TIMEOUT_SECONDS
+        self._missing = {row_id: since for row_id, since in self._missing.items() if since > cutoff}
+
+    def _load(self, rows, track_gaps):
+        now = time.monotonic()
+        for row_id, jti in rows.order_by("id").values_list("id", "token__jti"):
+            self._filter.add(jti)
+            self._missing.pop(row_id, None)
+            if row_id > self._watermark:
+                if track_gaps and row_id - self._watermark <= MAX_TRACKED_GAP:
+                    for skipped in range(self._watermark + 1, row_id):
+                        self._missing.setdefault(skipped, now)
+                self._watermark = row_id
+        self._synced_at = now
+
+
+blacklist_filter = BlacklistFilter()
@@ -0,0 +1,74 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth import hashers
+from django.contrib.auth.signals import user_login_failed
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Returns the process-wide pool for password hashing, creating it on first use.
+    Its size bounds how many CPU-heavy hashes async views run at once.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASHING_WORKERS,
+                thread_name_prefix="password-hashing",
+            )
+        return _executor
+
+
+async def _run(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args))
+
+
+async def make_password(raw_password):
+    return await _run(hashers.make_password, raw_password)
+
+
+async def verify_password(raw_password, encoded):
+    """
+    Returns (is_correct, must_update) like django.contrib.auth.hashers.verify_password().
+    """
+    return await _run(hashers.verify_password, raw_password, encoded)
+
+
+async def authenticate_user(request, username, password):
+    """
+    Async counterpart of django.contrib.auth.authenticate() with the
+    ModelBackend rules: the user is loaded with the async ORM and the
+    password is checked in the hashing pool. Returns the user or None.
+    """
+    if username is None or password is None:
+        return None
+
+    user_model = get_user_model()
+    try:
+        user = await user_model._default_manager.aget_by_natural_key(username)
+    except user_model.DoesNotExist:
+        # Hash anyway so unknown usernames take as long as wrong passwords
+        await make_password(password)
+        user = None
+    else:
+        is_correct, must_update = await verify_password(password, user.password)
+        if is_correct and must_update:
+            user.password = await make_password(password)
+            await user.asave(update_fields=['password'])
+        if not is_correct or not user.is_active:
+            user = None
+
+    if user is None:
+        await user_login_failed.asend(
+            sender=__name__, credentials={'username': username}, request=request
+        )
+    return user
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+
+class Command(BaseCommand):
+    """
+    Deletes expired outstanding refresh tokens and their blacklist entries.
+
+    Unlike simplejwt's flushexpiredtokens, which deletes everything in one
+    statement, rows are deleted in short transactions of --batch-size
+    tokens, walking the primary key, so logins and logouts are never
+    blocked for long. Meant to run regularly, e.g. hourly from cron.
+    """
+    help = "Prunes expired outstanding and blacklisted JWT refresh tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Tokens deleted per transaction.")
+        parser.add_argument('--pause', type=float, default=0.1, help="Seconds to sleep between batches.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the expired tokens.")
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        expired = OutstandingToken.objects.filter(expires_at__lt=now)
+
+        if options['dry_run']:
+            blacklisted = BlacklistedToken.objects.filter(token__expires_at__lt=now).count()
+            self.stdout.write(f"{expired.count()} expired tokens, {blacklisted} of them blacklisted.")
+            return
+
+        last_id = 0
+        tokens = blacklisted = 0
+        while True:
+            ids = list(
+                expired.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:options['batch_size']]
+            )
+            if not ids:
+                break
+
+            with transaction.atomic():
+                blacklisted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+                tokens += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+            last_id = ids[-1]
+
+            if len(ids) < options['batch_size']:
+                break
+            time.sleep(options['pause'])
+
+        self.stdout.write(f"Deleted {tokens} expired tokens and {blacklisted} blacklist entries.")
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:40
+
+from django.db import migrations, models
+
+INDEX = models.Index(fields=['email'], name='auth_user_email_idx')
+
+
+def index_exists(schema_editor, user_model):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, user_model._meta.db_table)
+    return INDEX.name in constraints
+
+
+def add_email_index(apps, schema_editor):
+    user_model = apps.get_model('auth', 'User')
+    if not index_exists(schema_editor, user_model):
+        schema_editor.add_index(user_model, INDEX)
+
+
+def remove_email_index(apps, schema_editor):
+    user_model = apps.get_model('auth', 'User')
+    if index_exists(schema_editor, user_model):
+        schema_editor.remove_index(user_model, INDEX)
+
+
+class Migration(migrations.Migration):
+    """
+    Adds an index on auth_user.email for the duplicate check in
+    RegistrationSerializer.validate_email. The User model belongs to
+    django.contrib.auth, whose migration state this app cannot change, so
+    the index is created through the schema editor, which writes the
+    statement for the database in use.
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_index, remove_email_index),
+    ]
@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import user_cache
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drops the cached user when it is saved or deleted, e.g. deactivated
+    or given a new password in the admin.
+    """
+    user_cache.invalidate(instance.pk)
@@ -1,3 +1,225 @@
-from django.test import TestCase
+import io
+import json
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import user_cache
+from .authentication import CookieJWTAuthentication
+from .blacklist_filter import blacklist_filter
+from .tokens import RefreshToken
+from .views import AsyncLoginView, AsyncRegistrationView
+
+
+class AsyncAuthViewsTests(TestCase):
+    """
+    Tests for the native async registration and login views.
+    """
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    def post(self, path, data):
+        return self.factory.post(path, data=data, content_type='application/json')
+
+    async def test_registration_stores_hashed_password(self):
+        data = {
+            'username': 'newcomer',
+            'email': 'newcomer@example.com',
+            'password': 'secret-password',
+            'confirmed_password': 'secret-password',
+        }
+
+        response = await AsyncRegistrationView.as_view()(self.post('/api/register/', data))
+
+        self.assertEqual(response.status_code, 201)
+        user = await User.objects.aget(username='newcomer')
+        self.assertTrue(await user.acheck_password('secret-password'))
+
+    async def test_registration_rejects_duplicate_email(self):
+        await User.objects.acreate_user("tester", "tester@example.com", "secret-password")
+        data = {
+            'username': 'newcomer',
+            'email': 'tester@example.com',
+            'password': 'secret-password',
+            'confirmed_password': 'secret-password',
+        }
+
+        response = await AsyncRegistrationView.as_view()(self.post('/api/register/', data))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', json.loads(response.content))
+
+    async def test_login_sets_token_cookies(self):
+        await User.objects.acreate_user("tester", "tester@example.com", "secret-password")
+
+        response = await AsyncLoginView.as_view()(
+            self.post('/api/login/', {'username': 'tester', 'password': 'secret-password'})
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.cookies)
+        self.assertIn('refresh_token', response.cookies)
+
+    async def test_login_rejects_wrong_password(self):
+        await User.objects.acreate_user("tester", "tester@example.com", "secret-password")
+
+        response = await AsyncLoginView.as_view()(
+            self.post('/api/login/', {'username': 'tester', 'password': 'wrong-password'})
+        )
+
+        self.assertEqual(response.status_code, 401)
+        self.assertNotIn('access_token', response.cookies)
+
+
+class EmailIndexMigrationTests(TestCase):
+    """
+    Tests for the auth_user.email index added by this app's migration.
+    """
+
+    def test_email_is_indexed(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, User._meta.db_table)
+
+        self.assertEqual(constraints['auth_user_email_idx']['columns'], ['email'])
+        self.assertTrue(constraints['auth_user_email_idx']['index'])
+
+
+class CachedUserAuthenticationTests(TestCase):
+    """
+    Tests for the user cache of CookieJWTAuthentication.
+    """
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.client = APIClient()
+        self.client.cookies['access_token'] = str(AccessToken.for_user(self.user))
+        self.url = reverse('get-quizzes')
+
+    def test_user_is_looked_up_once(self):
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+
+    @mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True)
+    def test_password_change_revokes_cached_token(self):
+        self.client.cookies['access_token'] = str(AccessToken.for_user(self.user))
+        self.client.get(self.url)
+        self.user.set_password("new-password")
+        self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_tokens_issued_before_the_check_is_enabled_are_accepted(self):
+        self.client.cookies['access_token'] = str(RefreshToken.for_user(self.user).access_token)
+
+        with mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+            self.user.set_password("new-password")
+            self.user.save()
+            self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deactivation_takes_effect_immediately(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    async def test_async_miss_is_counted_once(self):
+        request = AsyncRequestFactory().get(self.url)
+        request.COOKIES['access_token'] = self.client.cookies['access_token'].value
+        before = user_cache.stats()
+
+        for _ in range(2):
+            user, _token = await CookieJWTAuthentication().aauthenticate(request)
+
+        after = user_cache.stats()
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+
+    @override_settings(AUTH_STATELESS_READS=True)
+    def test_stateless_reads_skip_the_user_lookup(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+
+
+class RefreshTokenBlacklistTests(TestCase):
+    """
+    Tests for the blacklist filter used by the token refresh and the token pruning command.
+    """
+
+    def setUp(self):
+        blacklist_filter.reset()
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client = APIClient()
+        self.client.cookies['refresh_token'] = str(self.refresh)
+        self.url = reverse('token_refresh')
+
+    def test_refresh_skips_blacklist_query_for_unknown_tokens(self):
+        self.assertEqual(self.client.post(self.url).status_code, 200)
+        del self.client.cookies['access_token']
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_logged_out_token_is_rejected(self):
+        self.client.post(self.url)
+        self.client.force_authenticate(self.user)
+        self.client.post(reverse('logout'))
+        self.client.cookies['refresh_token'] = str(self.refresh)
+
+        self.assertEqual(self.client.post(self.url).status_code, 401)
+
+    @override_settings(BLACKLIST_FILTER_SYNC_SECONDS=0)
+    def test_tokens_blacklisted_elsewhere_are_picked_up(self):
+        self.client.post(self.url)
+        BlacklistedToken.objects.create(token=OutstandingToken.objects.get(jti=self.refresh['jti']))
+
+        self.assertEqual(self.client.post(self.url).status_code, 401)
+
+    @override_settings(BLACKLIST_FILTER_CAPACITY=2, BLACKLIST_FILTER_SYNC_SECONDS=60)
+    def test_filter_is_not_rebuilt_on_every_refresh_when_over_capacity(self):
+        for _ in range(5):
+            RefreshToken.for_user(self.user).blacklist()
+
+        self.assertEqual(self.client.post(self.url).status_code, 200)
+        del self.client.cookies['access_token']
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_prune_deletes_only_expired_tokens(self):
+        expired = [RefreshToken.for_user(self.user) for _ in range(3)]
+        expired[0].blacklist()
+        expired[1].blacklist()
+        OutstandingToken.objects.filter(jti__in=[token['jti'] for token in expired]).update(
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+        out = io.StringIO()
+
+        call_command('prune_expired_tokens', batch_size=2, pause=0, stdout=out)
+
+        self.assertIn("Deleted 3 expired tokens and 2 blacklist entries.", out.getvalue())
+        self.assertFalse(BlacklistedToken.objects.exists())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), [self.refresh['jti']])
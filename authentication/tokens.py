@@ -0,0 +1,33 @@
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .blacklist_filter import blacklist_filter
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Refresh token whose blacklist check asks the in-process blacklist filter
+    first and only queries the database if the filter reports a possible match.
+
+    Tokens always carry the password hash claim, even while CHECK_REVOKE_TOKEN
+    is off, so turning the check on later does not reject them.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[api_settings.REVOKE_TOKEN_CLAIM] = get_md5_hash_password(user.password)
+        return token
+
+    def check_blacklist(self):
+        if settings.BLACKLIST_FILTER_ENABLED:
+            if not blacklist_filter.might_be_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+                return
+        super().check_blacklist()
+
+    def blacklist(self):
+        result = super().blacklist()
+        blacklist_filter.add(self.payload[api_settings.JTI_CLAIM])
+        return result
@@ -1,9 +1,28 @@
+from django.conf import settings
 from django.urls import path
-from .views import RegistrationView, login_view, LogoutView, CookieTokenRefreshView
+from .views import (
+    AsyncCookieTokenRefreshView,
+    AsyncLoginView,
+    AsyncLogoutView,
+    AsyncRegistrationView,
+    CookieTokenRefreshView,
+    LogoutView,
+    RegistrationView,
+    login_view,
+)
 
-urlpatterns = [
-    path('register/', RegistrationView.as_view(), name='registration'),
-    path('login/', login_view, name='login'),
-    path('refresh/', CookieTokenRefreshView.as_view(), name='token_refresh'),
-    path('logout/', LogoutView.as_view(), name='logout'),
-]
\ No newline at end of file
+# Native async views for deployments behind an ASGI server
+if settings.ASYNC_VIEWS_ENABLED:
+    urlpatterns = [
+        path('register/', AsyncRegistrationView.as_view(), name='registration'),
+        path('login/', AsyncLoginView.as_view(), name='login'),
+        path('refresh/', AsyncCookieTokenRefreshView.as_view(), name='token_refresh'),
+        path('logout/', AsyncLogoutView.as_view(), name='logout'),
+    ]
+else:
+    urlpatterns = [
+        path('register/', RegistrationView.as_view(), name='registration'),
+        path('login/', login_view, name='login'),
+        path('refresh/', CookieTokenRefreshView.as_view(), name='token_refresh'),
+        path('logout/', LogoutView.as_view(), name='logout'),
+    ]
\ No newline at end of file
@@ -0,0 +1,93 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+_lock = threading.Lock()
+_entries = OrderedDict()
+_counters = {"hits": 0, "misses": 0}
+
+
+def key_for(validated_token):
+    """
+    Returns the cache key of the token's user: the user id and the token
+    version (the password hash claim), so tokens issued before a password
+    change never share an entry with newer ones.
+    """
+    return (
+        validated_token.get(api_settings.USER_ID_CLAIM),
+        validated_token.get(api_settings.REVOKE_TOKEN_CLAIM, ""),
+    )
+
+
+def lookup(key):
+    """
+    Returns a copy of the cached user for `key`, or None if it is missing or expired.
+    """
+    if key[0] is None:
+        return None
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del _entries[key]
+            _counters["misses"] += 1
+            return None
+        _entries.move_to_end(key)
+        _counters["hits"] += 1
+        user = entry[1]
+    # Requests get their own instance; the cached one is never handed out
+    return copy.copy(user)
+
+
+def store(key, user):
+    ttl = settings.AUTH_USER_CACHE_SECONDS
+    if ttl <= 0 or key[0] is None:
+        return
+    with _lock:
+        _entries[key] = (time.monotonic() + ttl, copy.copy(user))
+        _entries.move_to_end(key)
+        while len(_entries) > settings.AUTH_USER_CACHE_MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def invalidate(user_id):
+    """
+    Drops every cached entry of the user in this process.
+    """
+    with _lock:
+        for key in [key for key in _entries if str(key[0]) == str(user_id)]:
+            del _entries[key]
+
+
+def clear():
+    with _lock:
+        _entries.clear()
+
+
+def stats():
+    with _lock:
+        return {"entries": len(_entries), **_counters}
+
+
+def token_user(validated_token):
+    """
+    Builds an unsaved user with only the primary key from the token's
+    claims, for AUTH_STATELESS_READS. Enough for filtering by owner;
+    every other field has its default value.
+    """
+    user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        raise InvalidToken("Token contained no recognizable user identification")
+
+    user_model = get_user_model()
+    user = user_model(**{api_settings.USER_ID_FIELD: user_id})
+    user._state.adding = False
+    user._state.db = DEFAULT_DB_ALIAS
+    return user
@@ -1,6 +1,8 @@
 import json
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import status
@@ -8,9 +10,11 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import TokenError
-from rest_framework_simplejwt.tokens import RefreshToken
 
+from . import hashing, user_cache
+from .authentication import AsyncAPIView
 from .serializers import RegistrationSerializer
+from .tokens import RefreshToken
 
 class RegistrationView(APIView):
     """
@@ -30,6 +34,43 @@ class RegistrationView(APIView):
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+def login_response(user, refresh):
+    """
+    Builds the successful login response and sets the tokens as HTTP-only cookies.
+    """
+    access_token = str(refresh.access_token)
+
+    # Construct the JSON response structure
+    response_data = {
+        "detail": "Login successfully!",
+        "user": {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email
+        }
+    }
+
+    response = JsonResponse(response_data, status=200)
+
+    # Set tokens as HttpOnly cookies
+    response.set_cookie(
+        key='access_token',
+        value=access_token,
+        httponly=True,
+        samesite='Lax',
+        secure=False  # Set to True in production
+    )
+
+    response.set_cookie(
+        key='refresh_token',
+        value=str(refresh),
+        httponly=True,
+        samesite='Lax',
+        secure=False
+    )
+
+    return response
+
 @csrf_exempt
 def login_view(request):
     """
@@ -50,38 +91,7 @@ def login_view(request):
             if user is not None:
                 # Generate real JWT tokens using SimpleJWT
                 refresh = RefreshToken.for_user(user)
-                access_token = str(refresh.access_token)
-
-                # Construct the JSON response structure
-                response_data = {
-                    "detail": "Login successfully!",
-                    "user": {
-                        "id": user.id,
-                        "username": user.username,
-                        "email": user.email
-                    }
-                }
-
-                response = JsonResponse(response_data, status=200)
-
-                # Set tokens as HttpOnly cookies
-                response.set_cookie(
-                    key='access_token',
-                    value=access_token,
-                    httponly=True,
-                    samesite='Lax',
-                    secure=False  # Set to True in production
-                )
-                
-                response.set_cookie(
-                    key='refresh_token',
-                    value=str(refresh),
-                    httponly=True,
-                    samesite='Lax',
-                    secure=False
-                )
-
-                return response
+                return login_response(user, refresh)
             
             else:
                 # 401 Error message matching the documentation
@@ -117,6 +127,8 @@ class LogoutView(APIView):
             # Ignore errors (e.g. token already invalid), perform logout anyway
             pass
 
+        user_cache.invalidate(request.user.pk)
+
         response = Response(
             {"detail": "Log-Out successfully! All Tokens will be deleted. Refresh token is now invalid."},
             status=status.HTTP_200_OK
@@ -171,4 +183,114 @@ class CookieTokenRefreshView(APIView):
             return Response(
                 {"detail": "Refresh Token ungültig oder fehlt."},
                 status=status.HTTP_401_UNAUTHORIZED
-            )
\ No newline at end of file
+            )
+
+class AsyncRegistrationView(AsyncAPIView):
+    """
+    Native async variant of RegistrationView.
+    The password is hashed in the bounded hashing pool.
+    """
+    authentication_required = False
+
+    async def post(self, request):
+        try:
+            data = self.parse_json(request)
+        except ValueError:
+            return JsonResponse({"detail": "Invalid JSON"}, status=400)
+
+        serializer = RegistrationSerializer(data=data)
+        if not await sync_to_async(serializer.is_valid)():
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        account = User(
+            email=serializer.validated_data['email'],
+            username=serializer.validated_data['username']
+        )
+        account.password = await hashing.make_password(serializer.validated_data['password'])
+        await account.asave()
+        return JsonResponse(
+            {"detail": "User created successfully!"},
+            status=status.HTTP_201_CREATED
+        )
+
+class AsyncLoginView(AsyncAPIView):
+    """
+    Native async variant of login_view.
+    The password is verified in the bounded hashing pool.
+    """
+    authentication_required = False
+
+    async def post(self, request):
+        try:
+            data = self.parse_json(request)
+        except ValueError:
+            return JsonResponse({"detail": "Invalid JSON"}, status=400)
+
+        user = await hashing.authenticate_user(request, data.get("username"), data.get("password"))
+        if user is None:
+            return JsonResponse({"detail": "Ungültige Anmeldedaten."}, status=401)
+
+        refresh = await sync_to_async(RefreshToken.for_user)(user)
+        return login_response(user, refresh)
+
+class AsyncLogoutView(AsyncAPIView):
+    """
+    Native async variant of LogoutView.
+    """
+
+    async def post(self, request):
+        refresh_token = request.COOKIES.get('refresh_token')
+        if not refresh_token:
+            try:
+                refresh_token = self.parse_json(request).get('refresh')
+            except ValueError:
+                refresh_token = None
+
+        if refresh_token:
+            try:
+                token = await sync_to_async(RefreshToken)(refresh_token)
+                await sync_to_async(token.blacklist)()
+            except Exception:
+                # Ignore errors (e.g. token already invalid), perform logout anyway
+                pass
+
+        user_cache.invalidate(request.user.pk)
+
+        response = JsonResponse(
+            {"detail": "Log-Out successfully! All Tokens will be deleted. Refresh token is now invalid."},
+            status=status.HTTP_200_OK
+        )
+        response.delete_cookie('access_token')
+        response.delete_cookie('refresh_token')
+        return response
+
+class AsyncCookieTokenRefreshView(AsyncAPIView):
+    """
+    Native async variant of CookieTokenRefreshView.
+    """
+    authentication_required = False
+
+    async def post(self, request):
+        refresh_token = request.COOKIES.get('refresh_token')
+        invalid = JsonResponse(
+            {"detail": "Refresh Token ungültig oder fehlt."},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+        if not refresh_token:
+            return invalid
+
+        try:
+            refresh = await sync_to_async(RefreshToken)(refresh_token)
+        except TokenError:
+            return invalid
+
+        access_token = str(refresh.access_token)
+        response = JsonResponse({"detail": "Token refreshed", "access": access_token}, status=status.HTTP_200_OK)
+        response.set_cookie(
+            key='access_token',
+            value=access_token,
+            httponly=True,
+            samesite='Lax',
+            secure=False  # Set to True in production
+        )
+        return response
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Quiz, Question
+from .models import Attempt, GenerationBatch, GenerationJob, Quiz, Question, TranscriptCacheEntry
 
 class QuestionInline(admin.TabularInline):
     """
@@ -26,5 +26,43 @@ class QuestionAdmin(admin.ModelAdmin):
     list_display = ('question_text', 'quiz', 'answer', 'created_at')
     list_filter = ('quiz',)
 
+class GenerationJobAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the GenerationJob model.
+    Displays the video URL, owner, current status, and lease information.
+    """
+    list_display = ('video_url', 'user', 'batch', 'status', 'transcript_source', 'attempts', 'lease_owner', 'created_at')
+    list_filter = ('status', 'transcript_source')
+    readonly_fields = ('lease_owner', 'lease_expires_at', 'attempts')
+
+class GenerationBatchAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the GenerationBatch model.
+    Displays the playlist title or source URL, owner, and creation timestamp.
+    """
+    list_display = ('__str__', 'user', 'source_url', 'created_at')
+
+class TranscriptCacheEntryAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the TranscriptCacheEntry model.
+    Shows the size and hit count of each cached transcript.
+    """
+    list_display = ('video_id', 'model_name', 'size_bytes', 'hit_count', 'last_used_at')
+    search_fields = ('video_id',)
+    readonly_fields = ('settings_key', 'size_bytes', 'hit_count', 'created_at', 'last_used_at')
+
+class AttemptAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the Attempt model.
+    Displays the quiz, the user who answered it, the score and the submission time.
+    """
+    list_display = ('quiz', 'user', 'score', 'question_count', 'created_at')
+    list_filter = ('quiz',)
+    readonly_fields = ('score', 'question_count', 'created_at')
+
 admin.site.register(Quiz, QuizAdmin)
-admin.site.register(Question, QuestionAdmin)
\ No newline at end of file
+admin.site.register(Question, QuestionAdmin)
+admin.site.register(GenerationJob, GenerationJobAdmin)
+admin.site.register(GenerationBatch, GenerationBatchAdmin)
+admin.site.register(TranscriptCacheEntry, TranscriptCacheEntryAdmin)
+admin.site.register(Attempt, AttemptAdmin)
\ No newline at end of file
@@ -1,6 +1,53 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class QuizManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'quiz_management'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if settings.WHISPER_PRELOAD and runs_server_or_workers(sys.argv):
+            from .whisper_registry import registry
+            registry.preload([settings.WHISPER_MODEL])
+
+
+def management_command(argv):
+    """
+    Returns the name of the management command the process runs, or None
+    if it runs none (WSGI/ASGI servers load the project without one).
+    """
+    program = argv[0] if argv else ""
+    is_command = (
+        os.path.basename(program) in ("manage.py", "django-admin")
+        or program.endswith(os.path.join("django", "__main__.py"))
+    )
+    if not is_command:
+        return None
+    return argv[1] if len(argv) > 1 else ""
+
+
+def serves_requests(argv):
+    """
+    Returns True for web server processes, including runserver.
+    """
+    command = management_command(argv)
+    if command is None:
+        return True
+    if command == "runserver":
+        # The autoreloader's parent process only watches for file changes
+        return os.environ.get("RUN_MAIN") == "true" or "--noreload" in argv
+    return False
+
+
+def runs_server_or_workers(argv):
+    """
+    Returns False if the process runs a management command other than the
+    development server or the generation workers, e.g. migrate or test.
+    """
+    return serves_requests(argv) or management_command(argv) == "run_generation_workers"
@@ -0,0 +1,136 @@
+import subprocess
+import tempfile
+
+import numpy as np
+
+# Whisper expects 16 kHz mono float32 PCM
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2
+
+
+def resolve_audio_stream(url):
+    """
+    Resolves the direct URL and HTTP headers of the best audio stream
+    of a YouTube video without downloading it. Also returns the video's
+    duration in seconds, or None if it is unknown.
+    """
+    import yt_dlp
+
+    ydl_opts = {
+        "format": "bestaudio/best",
+        "quiet": True,
+        "noplaylist": True,
+    }
+
+    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        info = ydl.extract_info(url, download=False)
+
+    stream_url = info.get("url")
+    if not stream_url:
+        raise FileNotFoundError("No audio stream found for this video.")
+
+    return stream_url, info.get("http_headers", {}), info.get("duration")
+
+
+def stream_pcm_segments(stream_url, headers, segment_seconds):
+    """
+    Decodes an audio stream with FFmpeg while it downloads and yields
+    consecutive float32 segments of `segment_seconds` (the last one may be shorter).
+    """
+    command = ["ffmpeg", "-nostdin", "-loglevel", "error"]
+    if headers:
+        header_lines = "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        command += ["-headers", header_lines]
+    command += [
+        "-i", stream_url,
+        "-f", "s16le",
+        "-ac", "1",
+        "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+
+    segment_bytes = int(segment_seconds * SAMPLE_RATE) * BYTES_PER_SAMPLE
+    # stderr goes to a file: a pipe nobody reads while stdout is consumed
+    # would block FFmpeg once it fills up with warnings
+    stderr = tempfile.TemporaryFile()
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr)
+
+    try:
+        while True:
+            chunk = _read_exactly(process.stdout, segment_bytes)
+            if chunk:
+                yield pcm_to_float(chunk)
+            if len(chunk) < segment_bytes:
+                break
+
+        process.wait()
+        if process.returncode != 0:
+            stderr.seek(0)
+            error = stderr.read()[-4000:].decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"FFmpeg failed to decode the audio stream: {error}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        stderr.close()
+
+
+def decode_audio_file(path):
+    """
+    Decodes an audio file in any format FFmpeg reads (opus, m4a, ...) straight
+    into 16 kHz mono float32 samples, the input Whisper's transcribe() takes.
+    """
+    command = [
+        "ffmpeg", "-nostdin", "-loglevel", "error",
+        "-i", str(path),
+        "-f", "s16le",
+        "-ac", "1",
+        "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+    result = subprocess.run(command, capture_output=True)
+    if result.returncode != 0:
+        error = result.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"FFmpeg failed to decode {path}: {error}")
+    return pcm_to_float(result.stdout)
+
+
+def pcm_to_float(data):
+    """
+    Converts signed 16-bit little-endian PCM bytes to float32 samples in [-1, 1].
+    """
+    return np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+
+
+def find_quietest_point(samples, start, end, frame_seconds=0.02):
+    """
+    Returns the sample index of the quietest frame between `start` and `end`.
+    Used to cut long audio at silence instead of in the middle of a word.
+    """
+    frame = max(1, int(frame_seconds * SAMPLE_RATE))
+    start = max(0, start)
+    end = min(len(samples), end)
+    frame_count = (end - start) // frame
+    if frame_count <= 0:
+        return min(start, len(samples))
+
+    window = samples[start:start + frame_count * frame].reshape(frame_count, frame)
+    energy = np.sqrt(np.mean(window ** 2, axis=1))
+    return start + int(np.argmin(energy)) * frame + frame // 2
+
+
+def _read_exactly(stream, size):
+    """
+    Reads `size` bytes from a pipe, or fewer if the stream ends first.
+    """
+    parts = []
+    remaining = size
+    while remaining:
+        part = stream.read(remaining)
+        if not part:
+            break
+        parts.append(part)
+        remaining -= len(part)
+    return b"".join(parts)
+
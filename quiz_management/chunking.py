@@ -0,0 +1,99 @@
+import logging
+import re
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough characters-per-token ratio used when the tokenizer is unavailable
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def get_encoding():
+    """
+    Returns the tiktoken encoding used to measure prompts, or None if it
+    cannot be loaded (tiktoken downloads encodings on first use).
+    """
+    global _encoding
+    with _encoding_lock:
+        if _encoding is None:
+            try:
+                import tiktoken
+
+                _encoding = tiktoken.get_encoding(settings.GEMINI_TOKENIZER_ENCODING)
+            except Exception:
+                logger.warning("Tokenizer unavailable, estimating tokens from characters.")
+                _encoding = False
+        return _encoding or None
+
+
+def count_tokens(text):
+    encoding = get_encoding()
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN + 1
+    return len(encoding.encode(text))
+
+
+def split_into_windows(text, max_tokens, overlap_tokens):
+    """
+    Splits `text` into windows of at most `max_tokens` tokens, where each
+    window repeats the last `overlap_tokens` tokens of the previous one.
+    Window ends are moved back to the last sentence end when possible.
+    The overlap is capped at half a window so the split always advances.
+    """
+    overlap_tokens = min(overlap_tokens, max_tokens // 2)
+    encoding = get_encoding()
+    if encoding is None:
+        return _split_by_characters(text, max_tokens * CHARS_PER_TOKEN, overlap_tokens * CHARS_PER_TOKEN)
+
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return [text] if text.strip() else []
+
+    windows = []
+    start = 0
+    while start < len(tokens):
+        end = min(start + max_tokens, len(tokens))
+        window = encoding.decode(tokens[start:end])
+        if end < len(tokens):
+            window = _trim_to_sentence_end(window)
+            end = start + len(encoding.encode(window))
+        windows.append(window)
+        if end >= len(tokens):
+            break
+        start = max(end - overlap_tokens, start + 1)
+    return windows
+
+
+def _split_by_characters(text, max_chars, overlap_chars):
+    if len(text) <= max_chars:
+        return [text] if text.strip() else []
+
+    windows = []
+    start = 0
+    while start < len(text):
+        end = min(start + max_chars, len(text))
+        window = text[start:end]
+        if end < len(text):
+            window = _trim_to_sentence_end(window)
+            end = start + len(window)
+        windows.append(window)
+        if end >= len(text):
+            break
+        start = max(end - overlap_chars, start + 1)
+    return windows
+
+
+def _trim_to_sentence_end(window):
+    """
+    Cuts the window after its last sentence end, unless that would drop
+    more than a quarter of it.
+    """
+    matches = list(re.finditer(r"[.!?]\s", window))
+    if matches and matches[-1].end() > len(window) * 3 // 4:
+        return window[:matches[-1].end()]
+    return window
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import time
+
+from django.conf import settings
+from django.urls import reverse
+
+from .models import GenerationJob
+
+# Milliseconds an EventSource waits before reconnecting
+RECONNECT_MILLISECONDS = 2000
+
+FINISHED_STATUSES = [GenerationJob.STATUS_DONE, GenerationJob.STATUS_FAILED]
+
+
+def format_event(event, data):
+    """
+    Formats one Server-Sent Event with a JSON payload.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def job_events(request, job_id):
+    """
+    Yields Server-Sent Events for a generation job until it finishes.
+
+    The job row is looked up every GENERATION_EVENTS_POLL_SECONDS and a
+    `progress` event is sent whenever its status or progress changed.
+    While nothing changes (e.g. during a long transcription), the interval
+    doubles up to GENERATION_EVENTS_MAX_POLL_SECONDS. The stream ends with
+    a `done` or `failed` event, or after GENERATION_EVENTS_MAX_SECONDS, in
+    which case the client reconnects.
+    """
+    yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+
+    started = time.monotonic()
+    last_sent = started
+    seen = None
+    interval = settings.GENERATION_EVENTS_POLL_SECONDS
+
+    while time.monotonic() - started < settings.GENERATION_EVENTS_MAX_SECONDS:
+        job = await GenerationJob.objects.filter(pk=job_id).values(
+            'status', 'progress', 'quiz_id', 'error'
+        ).afirst()
+        if job is None:
+            return
+
+        state = (job['status'], job['progress'])
+        if state != seen:
+            seen = state
+            last_sent = time.monotonic()
+            interval = settings.GENERATION_EVENTS_POLL_SECONDS
+            yield _job_event(request, job_id, job)
+            if job['status'] in FINISHED_STATUSES:
+                return
+        else:
+            interval = min(interval * 2, settings.GENERATION_EVENTS_MAX_POLL_SECONDS)
+            if time.monotonic() - last_sent >= settings.GENERATION_EVENTS_HEARTBEAT_SECONDS:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+
+        await asyncio.sleep(interval)
+
+
+def _job_event(request, job_id, job):
+    data = {
+        'id': job_id,
+        'status': job['status'],
+        'progress': job['progress'],
+    }
+
+    if job['status'] == GenerationJob.STATUS_DONE:
+        data['quiz'] = job['quiz_id']
+        data['quiz_url'] = None
+        if job['quiz_id'] is not None:
+            data['quiz_url'] = request.build_absolute_uri(reverse('quiz-detail', args=[job['quiz_id']]))
+        return format_event('done', data)
+
+    if job['status'] == GenerationJob.STATUS_FAILED:
+        data['error'] = job['error']
+        return format_event('failed', data)
+
+    return format_event('progress', data)
@@ -0,0 +1,161 @@
+import json
+import os
+import threading
+import time
+
+import httpx
+from django.conf import settings
+from django.utils.module_loading import import_string
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows `rate` requests per second on average
+    with bursts of up to `capacity` requests. A rate of 0 disables limiting.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Blocks until a token is available and takes it.
+        """
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class GenaiBackend:
+    """
+    Sends prompts to the Gemini API through one shared `genai.Client`,
+    so connections are reused across requests.
+    """
+
+    def __init__(self):
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            raise Exception("GEMINI_API_KEY not found.")
+
+        # Imported here so processes that never call Gemini do not load the SDK
+        from google import genai
+
+        self.client = genai.Client(api_key=api_key)
+
+    def generate(self, model, prompt):
+        response = self.client.models.generate_content(
+            model=model,
+            contents=prompt
+        )
+        return response.text
+
+
+class FakeBackend:
+    """
+    Offline stand-in for the Gemini API used for load tests and benchmarks.
+    Answers every prompt with canned quiz JSON after GEMINI_FAKE_LATENCY_SECONDS.
+    """
+
+    def __init__(self):
+        self.latency = settings.GEMINI_FAKE_LATENCY_SECONDS
+
+    def generate(self, model, prompt):
+        time.sleep(self.latency)
+        return json.dumps({
+            "title": "Test-Quiz",
+            "description": "Automatisch erzeugtes Test-Quiz.",
+            "summary": "Zusammenfassung des Abschnitts.",
+            "questions": [
+                {
+                    "question_title": f"Testfrage {number}?",
+                    "options": ["A", "B", "C", "D"],
+                    "answer": "A",
+                }
+                for number in range(1, settings.QUIZ_QUESTION_COUNT + 1)
+            ],
+        })
+
+
+def is_transient_error(exception):
+    """
+    Returns True for failures worth retrying: rate limits, server errors,
+    timeouts and connection problems.
+    """
+    from google.genai import errors as genai_errors
+
+    if isinstance(exception, genai_errors.APIError):
+        return exception.code == 429 or exception.code >= 500
+    return isinstance(exception, (httpx.TimeoutException, httpx.TransportError))
+
+
+class GeminiClient:
+    """
+    Process-wide entry point for Gemini requests.
+
+    Limits the number of requests in flight with a semaphore and the
+    request rate with a token bucket, and retries transient failures with
+    exponential backoff. The backend is configured by GEMINI_BACKEND.
+    """
+
+    def __init__(self, backend, max_concurrent, rate, burst, max_attempts):
+        self.backend = backend
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._bucket = TokenBucket(rate, burst)
+        self._max_attempts = max_attempts
+
+    def generate(self, prompt, model=None):
+        """
+        Sends `prompt` and returns the response text.
+        """
+        retrying = Retrying(
+            stop=stop_after_attempt(self._max_attempts),
+            wait=wait_exponential_jitter(
+                initial=settings.GEMINI_RETRY_INITIAL_SECONDS,
+                max=settings.GEMINI_RETRY_MAX_SECONDS,
+            ),
+            retry=retry_if_exception(is_transient_error),
+            reraise=True,
+        )
+        return retrying(self._generate_once, prompt, model or settings.GEMINI_MODEL)
+
+    def _generate_once(self, prompt, model):
+        self._bucket.acquire()
+        with self._semaphore:
+            return self.backend.generate(model, prompt)
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """
+    Returns the process-wide Gemini client, creating it on first use.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            backend_class = import_string(settings.GEMINI_BACKEND)
+            _client = GeminiClient(
+                backend=backend_class(),
+                max_concurrent=settings.GEMINI_MAX_CONCURRENT_REQUESTS,
+                rate=settings.GEMINI_REQUESTS_PER_SECOND,
+                burst=settings.GEMINI_REQUEST_BURST,
+                max_attempts=settings.GEMINI_MAX_ATTEMPTS,
+            )
+        return _client
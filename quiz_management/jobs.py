@@ -0,0 +1,273 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from . import metrics
+from .models import GenerationBatch, GenerationJob
+from .services import QuizGenerationService, QuizPersistenceService
+
+logger = logging.getLogger(__name__)
+
+
+class LeaseLostError(Exception):
+    """
+    Raised when a worker no longer holds the lease on the job it is running.
+    """
+
+
+def enqueue_job(user, url):
+    """
+    Stores a new generation job and wakes the embedded workers, if enabled.
+    """
+    job = GenerationJob.objects.create(user=user, video_url=url)
+    _wake_workers()
+    return job
+
+
+def enqueue_batch(user, urls, source_url="", title=""):
+    """
+    Stores a batch with one generation job per URL and wakes the embedded workers.
+    """
+    with transaction.atomic():
+        batch = GenerationBatch.objects.create(user=user, source_url=source_url, title=title)
+        GenerationJob.objects.bulk_create([
+            GenerationJob(user=user, batch=batch, video_url=url)
+            for url in urls
+        ])
+    _wake_workers()
+    return batch
+
+
+def start_embedded_workers():
+    """
+    Starts the embedded worker pool of a web process, if enabled, so jobs
+    that were queued or abandoned before the process started are picked up.
+    Called by the WSGI and ASGI applications (runserver loads the former).
+    """
+    if settings.GENERATION_EMBEDDED_WORKERS:
+        get_worker_pool().start()
+
+
+def _wake_workers():
+    if settings.GENERATION_EMBEDDED_WORKERS:
+        pool = get_worker_pool()
+        pool.start()
+        transaction.on_commit(pool.wake)
+
+
+def claim_next_job(worker_id):
+    """
+    Leases the oldest runnable job to `worker_id` and returns it, or None.
+
+    A job is runnable while it is unfinished and not leased, or when the
+    lease of the worker that was running it has expired. Jobs of a batch
+    are skipped while GENERATION_BATCH_CONCURRENCY of its jobs are leased.
+    Claiming is a conditional UPDATE, so only one worker can win a given job.
+    """
+    now = timezone.now()
+    claimable = (
+        Q(status__in=[GenerationJob.STATUS_QUEUED, *GenerationJob.RUNNING_STATUSES])
+        & (Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now))
+    )
+    leased_in_batch = Subquery(
+        GenerationJob.objects.filter(batch=OuterRef('batch'), lease_expires_at__gte=now)
+        .order_by()
+        .values('batch')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    runnable = (
+        GenerationJob.objects.alias(leased_in_batch=Coalesce(leased_in_batch, 0))
+        .filter(claimable)
+        .filter(Q(batch__isnull=True) | Q(leased_in_batch__lt=settings.GENERATION_BATCH_CONCURRENCY))
+    )
+    candidates = list(
+        runnable.order_by('created_at')
+        .values_list('pk', flat=True)[:10]
+    )
+
+    for pk in candidates:
+        claimed = runnable.filter(pk=pk).update(
+            lease_owner=worker_id,
+            lease_expires_at=_lease_deadline(),
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+        if not claimed:
+            continue
+
+        job = GenerationJob.objects.get(pk=pk)
+        if job.attempts > settings.GENERATION_JOB_MAX_ATTEMPTS:
+            _update_job(
+                job,
+                worker_id,
+                status=GenerationJob.STATUS_FAILED,
+                error="Job exceeded the maximum number of attempts.",
+                finished_at=timezone.now(),
+                lease_owner="",
+                lease_expires_at=None,
+            )
+            continue
+        return job
+
+    return None
+
+
+def run_job(job, worker_id):
+    """
+    Runs the generation for a leased job and stores the resulting quiz.
+    Each stage change and progress update renews the lease.
+    """
+    def on_stage(stage, progress):
+        _update_job(job, worker_id, status=stage, progress=progress, lease_expires_at=_lease_deadline())
+
+    try:
+        generated_data = QuizGenerationService.generate_quiz_from_url(
+            job.video_url, on_stage=on_stage
+        )
+
+        with metrics.span("persist"), transaction.atomic():
+            quiz = QuizPersistenceService.create_quiz(job.user, job.video_url, generated_data)
+
+            _update_job(
+                job,
+                worker_id,
+                status=GenerationJob.STATUS_DONE,
+                progress=100,
+                quiz=quiz,
+                transcript_source=generated_data.get('transcript_source', ''),
+                finished_at=timezone.now(),
+                lease_owner="",
+                lease_expires_at=None,
+            )
+
+    except LeaseLostError:
+        logger.warning("Lost lease on generation job %s, abandoning it.", job.pk)
+    except Exception as e:
+        logger.exception("Generation job %s failed while %s.", job.pk, job.status)
+        metrics.GENERATION_FAILURES.inc(stage=job.status)
+        try:
+            _update_job(
+                job,
+                worker_id,
+                status=GenerationJob.STATUS_FAILED,
+                error=str(e),
+                finished_at=timezone.now(),
+                lease_owner="",
+                lease_expires_at=None,
+            )
+        except LeaseLostError:
+            pass
+
+
+def _lease_deadline():
+    return timezone.now() + timedelta(seconds=settings.GENERATION_JOB_LEASE_SECONDS)
+
+
+def _update_job(job, worker_id, **fields):
+    """
+    Updates the job only if `worker_id` still holds its lease.
+    """
+    fields['updated_at'] = timezone.now()
+    updated = GenerationJob.objects.filter(pk=job.pk, lease_owner=worker_id).update(**fields)
+    if not updated:
+        raise LeaseLostError(f"Worker {worker_id} no longer holds job {job.pk}.")
+    for name, value in fields.items():
+        setattr(job, name, value)
+
+
+class GenerationWorkerPool:
+    """
+    Pool of background threads that claim and run generation jobs.
+
+    The pool is used embedded in web processes and by the
+    `run_generation_workers` management command on dedicated worker nodes.
+    """
+
+    def __init__(self, size, poll_interval):
+        self.size = size
+        self.poll_interval = poll_interval
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+
+    def start(self):
+        """
+        Starts the worker threads once per process. Safe to call repeatedly.
+        """
+        with self._lock:
+            if self._pid == os.getpid() and self._threads:
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._threads = []
+            for index in range(self.size):
+                worker_id = f"{socket.gethostname()}:{self._pid}:{index}:{uuid.uuid4().hex[:8]}"
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(worker_id,),
+                    name=f"generation-worker-{index}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def wake(self):
+        self._wakeup.set()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def _work(self, worker_id):
+        while not self._stopping.is_set():
+            job = None
+            try:
+                close_old_connections()
+                job = claim_next_job(worker_id)
+                if job is not None:
+                    run_job(job, worker_id)
+            except Exception:
+                logger.exception("Generation worker %s crashed while polling.", worker_id)
+            finally:
+                close_old_connections()
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """
+    Returns the process-wide worker pool, creating it on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = GenerationWorkerPool(
+                size=settings.GENERATION_WORKERS,
+                poll_interval=settings.GENERATION_WORKER_POLL_SECONDS,
+            )
+        return _pool
@@ -0,0 +1,101 @@
+import json
+import resource
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz_management import audio
+
+
+class Command(BaseCommand):
+    """
+    Compares the CPU time needed to turn a downloaded audio file into
+    Whisper's input: the old path encodes an mp3 and decodes it again,
+    the new path decodes the native stream once. Whisper itself is the
+    same in both paths and is not run.
+
+    Without --input, an opus file with the given duration is synthesized
+    with FFmpeg, matching what YouTube usually serves.
+    """
+    help = "Benchmarks CPU time of mp3 re-encoding versus direct PCM decoding."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--input', help="Audio file to decode (e.g. a downloaded .webm or .m4a).")
+        parser.add_argument('--duration', type=int, default=600, help="Seconds of synthesized audio.")
+        parser.add_argument('--repeat', type=int, default=3, help="Runs per path; the fastest is reported.")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir)
+            source = options['input'] or self._synthesize(temp_path / "source.webm", options['duration'])
+            if not Path(source).exists():
+                raise CommandError(f"File not found: {source}")
+
+            results = {
+                'mp3_reencode': self._measure(lambda: self._mp3_path(source, temp_path), options['repeat']),
+                'direct_pcm': self._measure(lambda: audio.decode_audio_file(source), options['repeat']),
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:13} cpu {result['cpu_seconds']:7.2f} s  wall {result['wall_seconds']:7.2f} s  "
+                f"samples {result['samples']}"
+            )
+        saved = 1 - results['direct_pcm']['cpu_seconds'] / max(results['mp3_reencode']['cpu_seconds'], 1e-9)
+        self.stdout.write(f"CPU time saved: {saved:.0%}")
+
+    def _mp3_path(self, source, temp_path):
+        """
+        The previous pipeline: FFmpegExtractAudio to 128 kbps mp3, then
+        Whisper's own FFmpeg decode of that mp3.
+        """
+        mp3_file = temp_path / "audio.mp3"
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-loglevel", "error", "-y", "-i", str(source),
+             "-vn", "-codec:a", "libmp3lame", "-b:a", "128k", str(mp3_file)],
+            check=True,
+        )
+        try:
+            return audio.decode_audio_file(mp3_file)
+        finally:
+            mp3_file.unlink()
+
+    def _measure(self, run, repeat):
+        best = None
+        for _ in range(repeat):
+            before = self._cpu_seconds()
+            started = time.perf_counter()
+            samples = run()
+            result = {
+                'cpu_seconds': self._cpu_seconds() - before,
+                'wall_seconds': time.perf_counter() - started,
+                'samples': len(samples),
+            }
+            if best is None or result['cpu_seconds'] < best['cpu_seconds']:
+                best = result
+        return best
+
+    def _cpu_seconds(self):
+        """
+        CPU time of this process plus its finished FFmpeg children.
+        """
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+    def _synthesize(self, path, duration):
+        subprocess.run(
+            ["ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+             "-f", "lavfi", "-i", f"anoisesrc=duration={duration}:color=pink:amplitude=0.3",
+             "-ac", "2", "-ar", "48000", "-codec:a", "libopus", "-b:a", "128k", str(path)],
+            check=True,
+        )
+        return str(path)
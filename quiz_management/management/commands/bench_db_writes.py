@@ -0,0 +1,124 @@
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SCHEMA = """
+CREATE TABLE quiz (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, created_at REAL);
+CREATE TABLE question (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    quiz_id INTEGER REFERENCES quiz (id),
+    question_text TEXT,
+    options TEXT,
+    answer TEXT
+);
+CREATE INDEX question_quiz_id ON question (quiz_id);
+"""
+
+
+class Command(BaseCommand):
+    """
+    Measures SQLite write throughput with concurrent writers, once with
+    SQLite's defaults and once with SQLITE_PRAGMAS, on temporary databases.
+    Each transaction stores one quiz with its questions, like a finished generation job.
+    """
+    help = "Benchmarks concurrent quiz writes with default and tuned SQLite settings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8, help="Concurrent writer threads.")
+        parser.add_argument('--seconds', type=float, default=5.0, help="Duration of each run.")
+        parser.add_argument('--questions', type=int, default=10, help="Questions per quiz.")
+        parser.add_argument('--json', action='store_true', help="Print the results as JSON.")
+
+    def handle(self, *args, **options):
+        profiles = {
+            'default': {},
+            'tuned': dict(settings.SQLITE_PRAGMAS),
+        }
+
+        results = {}
+        for name, pragmas in profiles.items():
+            results[name] = self._run(pragmas, options['writers'], options['seconds'], options['questions'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:8} {result['transactions_per_second']:10.1f} quizzes/s  "
+                f"p95 {result['p95_ms']:8.1f} ms  busy errors {result['busy_errors']}"
+            )
+        speedup = results['tuned']['transactions_per_second'] / max(results['default']['transactions_per_second'], 1e-9)
+        self.stdout.write(f"Speedup: {speedup:.1f}x")
+
+    def _run(self, pragmas, writers, seconds, questions):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "bench.sqlite3"
+            setup = self._connect(path, pragmas)
+            setup.executescript(SCHEMA)
+            setup.close()
+
+            latencies = []
+            busy_errors = [0]
+            lock = threading.Lock()
+            deadline = time.perf_counter() + seconds
+
+            def write():
+                connection = self._connect(path, pragmas)
+                options_json = json.dumps(["A", "B", "C", "D"])
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        connection.execute("BEGIN IMMEDIATE")
+                        cursor = connection.execute(
+                            "INSERT INTO quiz (title, created_at) VALUES (?, ?)", ("Quiz", time.time())
+                        )
+                        connection.executemany(
+                            "INSERT INTO question (quiz_id, question_text, options, answer) VALUES (?, ?, ?, ?)",
+                            [(cursor.lastrowid, f"Frage {i}?", options_json, "A") for i in range(questions)],
+                        )
+                        connection.execute("COMMIT")
+                    except sqlite3.OperationalError:
+                        if connection.in_transaction:
+                            connection.execute("ROLLBACK")
+                        with lock:
+                            busy_errors[0] += 1
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+                connection.close()
+
+            threads = [threading.Thread(target=write) for _ in range(writers)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)] if latencies else 0.0
+        return {
+            'pragmas': pragmas,
+            'transactions': len(latencies),
+            'transactions_per_second': len(latencies) / elapsed,
+            'p95_ms': p95 * 1000,
+            'busy_errors': busy_errors[0],
+        }
+
+    def _connect(self, path, pragmas):
+        connection = sqlite3.connect(
+            path,
+            timeout=settings.DATABASES['default'].get('OPTIONS', {}).get('timeout', 20),
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        for name, value in pragmas.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
@@ -0,0 +1,396 @@
+import argparse
+import json
+import logging
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from quiz_management import audio, gemini_client
+from quiz_management.services import QuizGenerationService, QuizPersistenceService
+from quiz_management.whisper_registry import registry as whisper_registry
+
+# Words per second of speech in the stub transcripts (about 150 words per minute)
+WORDS_PER_SECOND = 2.5
+
+SENTENCE = (
+    "In diesem Abschnitt erklärt die Sprecherin das Thema Schritt für Schritt "
+    "und fasst die wichtigsten Punkte am Ende noch einmal zusammen."
+)
+
+
+def synthesize_speech(seconds, seed=0):
+    """
+    Returns `seconds` of 16 kHz float32 audio that looks like speech to the
+    pipeline: bursts of modulated noise separated by short pauses.
+    """
+    rng = np.random.default_rng(seed)
+    samples = np.zeros(int(seconds * audio.SAMPLE_RATE), dtype=np.float32)
+    position = 0
+    while position < len(samples):
+        burst = int(rng.uniform(1.5, 6.0) * audio.SAMPLE_RATE)
+        pause = int(rng.uniform(0.2, 0.8) * audio.SAMPLE_RATE)
+        end = min(position + burst, len(samples))
+        envelope = 0.5 + 0.5 * np.sin(np.linspace(0, 8 * np.pi, end - position, dtype=np.float32))
+        samples[position:end] = 0.3 * envelope * rng.standard_normal(end - position).astype(np.float32)
+        position = end + pause
+    return samples
+
+
+class StubWhisperModel:
+    """
+    Stand-in for a Whisper model: takes `realtime_factor` seconds per second
+    of audio and returns a transcript of matching length. It sleeps instead
+    of computing, like inference running outside the GIL, so the measured
+    CPU time is the pipeline's own overhead.
+    """
+
+    def __init__(self, realtime_factor):
+        self.realtime_factor = realtime_factor
+
+    def transcribe(self, samples, **options):
+        seconds = len(samples) / audio.SAMPLE_RATE
+        time.sleep(seconds * self.realtime_factor)
+
+        words = SENTENCE.split()
+        count = int(seconds * WORDS_PER_SECOND)
+        return {"text": " ".join(words[i % len(words)] for i in range(count))}
+
+
+class TimedModel:
+    """
+    Wraps a Whisper model so its transcribe() calls are timed as the
+    `transcribe` stage.
+    """
+
+    def __init__(self, model, timer):
+        self.transcribe = timer.wrap('transcribe', model.transcribe)
+
+
+class StageTimer:
+    """
+    Collects wall and CPU time of the pipeline stages, per thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = []
+
+    def wrap(self, stage, func):
+        def timed(*args, **kwargs):
+            wall, cpu = time.perf_counter(), time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.samples.append((stage, time.perf_counter() - wall, time.thread_time() - cpu))
+        return timed
+
+    def summary(self):
+        stages = {}
+        for stage, wall, cpu in self.samples:
+            entry = stages.setdefault(stage, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0})
+            entry['calls'] += 1
+            entry['wall_seconds'] += wall
+            entry['cpu_seconds'] += cpu
+        for entry in stages.values():
+            entry['mean_wall_seconds'] = entry['wall_seconds'] / entry['calls']
+            entry['mean_cpu_seconds'] = entry['cpu_seconds'] / entry['calls']
+        return stages
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks QuizGenerationService end to end without network access.
+
+    yt-dlp and FFmpeg are replaced by synthesized audio fixtures, Gemini by
+    FakeBackend with a configurable latency, and (unless --real-whisper)
+    Whisper by a stub with a fixed realtime factor. Every audio length is
+    run at each concurrency level, each scenario in a new process with its
+    own throwaway test database, so its peak RSS is not carried over from
+    earlier scenarios. Download and transcription are timed as separate
+    stages; `transcript` is both together (they overlap in the pipeline).
+    Results can be written as JSON and compared with an earlier run.
+    """
+    help = "Benchmarks the quiz generation pipeline offline."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lengths', default='60,300,900', help="Comma-separated audio lengths in seconds.")
+        parser.add_argument('--concurrency', default='1,4', help="Comma-separated numbers of concurrent requests.")
+        parser.add_argument('--requests', type=int, default=4, help="Generations per scenario.")
+        parser.add_argument('--path', choices=['pipeline', 'file'], default='pipeline',
+                            help="Transcription path: streamed segments or one decoded file.")
+        parser.add_argument('--gemini-latency', type=float, default=1.0, help="Seconds per fake Gemini request.")
+        parser.add_argument('--whisper-rtf', type=float, default=0.05,
+                            help="Seconds per audio second of the stub Whisper model.")
+        parser.add_argument('--download-speed', type=float, default=0,
+                            help="Audio seconds downloaded per second (0 downloads instantly).")
+        parser.add_argument('--real-whisper', action='store_true',
+                            help=f"Use the real Whisper model ({settings.WHISPER_MODEL}); its weights must be available.")
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+        parser.add_argument('--compare', help="JSON file of an earlier run to compare with.")
+        # Set for the process that runs a single scenario; prints its results as JSON
+        parser.add_argument('--scenario-process', action='store_true', help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        lengths = self._int_list(options['lengths'])
+        levels = self._int_list(options['concurrency'])
+
+        if options['scenario_process']:
+            self.stdout.write(json.dumps(self._run_scenarios(lengths, levels, options)))
+            return
+
+        scenarios = []
+        for seconds in lengths:
+            for concurrency in levels:
+                scenario = self._run_in_new_process(seconds, concurrency, options)
+                scenarios.append(scenario)
+                self._print_scenario(scenario)
+
+        results = {
+            'meta': {
+                'commit': self._git_commit(),
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'path': options['path'],
+                'whisper': settings.WHISPER_MODEL if options['real_whisper'] else f"stub rtf={options['whisper_rtf']}",
+                'gemini_latency_seconds': options['gemini_latency'],
+                'download_speed': options['download_speed'],
+                'requests_per_scenario': options['requests'],
+            },
+            'scenarios': scenarios,
+        }
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['compare']:
+            self._compare(options['compare'], scenarios)
+
+    def _run_in_new_process(self, seconds, concurrency, options):
+        """
+        Runs one scenario in a new interpreter and returns its results.
+        """
+        command = [
+            sys.executable, str(settings.BASE_DIR / "manage.py"), "bench_generation", "--scenario-process",
+            "--lengths", str(seconds),
+            "--concurrency", str(concurrency),
+            "--requests", str(options['requests']),
+            "--path", options['path'],
+            "--gemini-latency", str(options['gemini_latency']),
+            "--whisper-rtf", str(options['whisper_rtf']),
+            "--download-speed", str(options['download_speed']),
+            "--verbosity", str(options['verbosity']),
+        ]
+        if options['real_whisper']:
+            command.append("--real-whisper")
+
+        result = subprocess.run(command, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        if options['verbosity'] >= 2 and result.stderr:
+            self.stderr.write(result.stderr)
+        if result.returncode != 0:
+            raise CommandError(f"Scenario {seconds}s x{concurrency} failed:\n{result.stderr[-2000:]}")
+        return json.loads(result.stdout.strip().splitlines()[-1])[0]
+
+    def _run_scenarios(self, lengths, levels, options):
+        """
+        Runs the scenarios in this process against a throwaway test database.
+        """
+        fixtures = {seconds: synthesize_speech(seconds, seed=seconds) for seconds in lengths}
+        self.video_lengths = {}
+
+        overrides = {
+            'GEMINI_BACKEND': 'quiz_management.gemini_client.FakeBackend',
+            'GEMINI_FAKE_LATENCY_SECONDS': options['gemini_latency'],
+            'TRANSCRIPT_CACHE_ENABLED': False,
+            'CAPTIONS_ENABLED': False,
+            'TRANSCRIBE_PARALLEL_ENABLED': False,
+            'TRANSCRIBE_PIPELINE_ENABLED': options['path'] == 'pipeline',
+        }
+
+        old_name = connection.settings_dict['NAME']
+        temp_dir = tempfile.TemporaryDirectory()
+        if connection.vendor == 'sqlite':
+            # A file instead of the shared in-memory test database, which
+            # fails with "table is locked" under concurrent writers
+            connection.settings_dict['TEST']['NAME'] = str(Path(temp_dir.name) / "bench.sqlite3")
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(**overrides), ExitStack() as stack:
+                gemini_client._client = None
+                stack.callback(setattr, gemini_client, '_client', None)
+                timer = StageTimer()
+                if options['verbosity'] < 2:
+                    logger = logging.getLogger('quiz_management')
+                    stack.callback(logger.setLevel, logger.level)
+                    logger.setLevel(logging.WARNING)
+                self._install_stubs(stack, fixtures, timer, options)
+                if options['real_whisper']:
+                    # Loaded up front, so the first scenario does not time the load
+                    whisper_registry.get(settings.WHISPER_MODEL)
+                user = User.objects.create(username="benchmark")
+
+                return [
+                    self._run(user, seconds, concurrency, options['requests'], timer)
+                    for seconds in lengths
+                    for concurrency in levels
+                ]
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            temp_dir.cleanup()
+
+    def _install_stubs(self, stack, fixtures, timer, options):
+        """
+        Replaces the network and FFmpeg calls with the audio fixtures and
+        wraps the pipeline stages with the timer.
+        """
+        def fixture_for(url):
+            return fixtures[self.video_lengths[url.rsplit('=', 1)[-1]]]
+
+        def download(samples):
+            if options['download_speed'] > 0:
+                time.sleep(len(samples) / audio.SAMPLE_RATE / options['download_speed'])
+            return samples
+
+        def resolve_audio_stream(url):
+            return url, {}, len(fixture_for(url)) / audio.SAMPLE_RATE
+
+        def stream_pcm_segments(stream_url, headers, segment_seconds):
+            samples = fixture_for(stream_url)
+            step = int(segment_seconds * audio.SAMPLE_RATE)
+            next_segment = timer.wrap('download', lambda start: download(samples[start:start + step]))
+            for start in range(0, len(samples), step):
+                yield next_segment(start)
+
+        def download_audio(url, filename_base, progress=None):
+            download(fixture_for(url))
+            return url
+
+        stub_model = StubWhisperModel(options['whisper_rtf'])
+        load_model = whisper_registry.get
+
+        def get_model(name):
+            model = load_model(name) if options['real_whisper'] else stub_model
+            return TimedModel(model, timer)
+
+        patches = [
+            mock.patch.object(audio, 'resolve_audio_stream', timer.wrap('download', resolve_audio_stream)),
+            mock.patch.object(audio, 'stream_pcm_segments', stream_pcm_segments),
+            mock.patch.object(audio, 'decode_audio_file', fixture_for),
+            mock.patch.object(
+                QuizGenerationService, '_download_audio', staticmethod(timer.wrap('download', download_audio))
+            ),
+            mock.patch.object(whisper_registry, 'get', get_model),
+            mock.patch.object(
+                QuizGenerationService, '_get_transcript',
+                staticmethod(timer.wrap('transcript', QuizGenerationService._get_transcript)),
+            ),
+            mock.patch.object(
+                QuizGenerationService, '_generate_with_gemini',
+                staticmethod(timer.wrap('generate', QuizGenerationService._generate_with_gemini)),
+            ),
+            mock.patch.object(
+                QuizPersistenceService, 'create_quiz',
+                staticmethod(timer.wrap('persist', QuizPersistenceService.create_quiz)),
+            ),
+        ]
+        for patch in patches:
+            stack.enter_context(patch)
+
+    def _run(self, user, seconds, concurrency, requests, timer):
+        timer.samples.clear()
+        # A new video id per request, so no request is coalesced with another one
+        urls = []
+        for _ in range(requests):
+            video_id = f"bench{len(self.video_lengths):06d}"
+            self.video_lengths[video_id] = seconds
+            urls.append(f"https://www.youtube.com/watch?v={video_id}")
+
+        def generate(url):
+            quiz_data = QuizGenerationService.generate_quiz_from_url(url)
+            QuizPersistenceService.create_quiz(user, url, quiz_data)
+
+        cpu_before = self._process_cpu_seconds()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(generate, urls))
+        elapsed = time.perf_counter() - started
+
+        return {
+            'audio_seconds': seconds,
+            'concurrency': concurrency,
+            'requests': requests,
+            'wall_seconds': elapsed,
+            'cpu_seconds': self._process_cpu_seconds() - cpu_before,
+            'videos_per_minute': requests / elapsed * 60,
+            'audio_seconds_per_second': requests * seconds / elapsed,
+            # The scenario runs in its own process, so this is the scenario's peak
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            'stages': timer.summary(),
+        }
+
+    def _print_scenario(self, scenario):
+        stages = "  ".join(
+            f"{name} {entry['mean_wall_seconds']:.2f}s/{entry['mean_cpu_seconds']:.2f}s cpu"
+            for name, entry in scenario['stages'].items()
+        )
+        self.stdout.write(
+            f"{scenario['audio_seconds']:5d}s audio  x{scenario['concurrency']:<3d} "
+            f"{scenario['videos_per_minute']:7.1f} videos/min  "
+            f"cpu {scenario['cpu_seconds']:6.1f}s  rss {scenario['peak_rss_mb']:7.1f} MB  {stages}"
+        )
+
+    def _compare(self, path, scenarios):
+        with open(path, encoding='utf-8') as f:
+            baseline = json.load(f)
+        previous = {
+            (scenario['audio_seconds'], scenario['concurrency']): scenario
+            for scenario in baseline['scenarios']
+        }
+
+        self.stdout.write(f"Compared with {baseline['meta'].get('commit') or path}:")
+        for scenario in scenarios:
+            before = previous.get((scenario['audio_seconds'], scenario['concurrency']))
+            if before is None:
+                continue
+            throughput = scenario['videos_per_minute'] / before['videos_per_minute'] - 1
+            cpu = scenario['cpu_seconds'] / max(before['cpu_seconds'], 1e-9) - 1
+            self.stdout.write(
+                f"{scenario['audio_seconds']:5d}s audio  x{scenario['concurrency']:<3d} "
+                f"throughput {throughput:+.1%}  cpu {cpu:+.1%}"
+            )
+
+    def _int_list(self, value):
+        try:
+            return [int(part) for part in value.split(',') if part.strip()]
+        except ValueError:
+            raise CommandError(f"Expected comma-separated integers, got {value!r}.")
+
+    def _process_cpu_seconds(self):
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime + usage.ru_stime
+
+    def _git_commit(self):
+        try:
+            result = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=settings.BASE_DIR, capture_output=True, text=True,
+            )
+        except OSError:
+            return None
+        return result.stdout.strip() or None
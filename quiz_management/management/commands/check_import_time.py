@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Generation backends that only a running generation job may import
+WORKER_ONLY_MODULES = ["torch", "whisper", "yt_dlp", "google.genai", "youtube_transcript_api", "tiktoken"]
+
+# What a web worker imports before serving its first request
+WEB_WORKER_IMPORTS = "from Quizly.wsgi import application; import Quizly.asgi; import Quizly.urls"
+
+
+class Command(BaseCommand):
+    """
+    Starts a fresh interpreter with `-X importtime`, imports what a web
+    worker imports and fails if that takes longer than --budget-ms or pulls
+    in one of the generation backends (torch, Whisper, yt-dlp, Gemini SDK).
+    """
+    help = "Checks the import time of a web worker against a budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=int, default=2000, help="Maximum total import time (0 disables).")
+        parser.add_argument('--top', type=int, default=10, help="Number of slowest imports to list.")
+
+    def handle(self, *args, **options):
+        imports = measure_imports(WEB_WORKER_IMPORTS)
+        total_ms = sum(self_us for self_us, _ in imports.values()) / 1000
+
+        slowest = sorted(imports.items(), key=lambda item: item[1][1], reverse=True)[:options['top']]
+        for name, (_, cumulative_us) in slowest:
+            self.stdout.write(f"{cumulative_us / 1000:8.1f} ms  {name}")
+        self.stdout.write(f"Total import time: {total_ms:.1f} ms")
+
+        loaded = [name for name in WORKER_ONLY_MODULES if name in imports]
+        if loaded:
+            raise CommandError(f"Web worker imports generation backends: {', '.join(loaded)}")
+        if options['budget_ms'] and total_ms > options['budget_ms']:
+            raise CommandError(f"Import time {total_ms:.0f} ms exceeds the budget of {options['budget_ms']} ms.")
+
+
+def measure_imports(code):
+    """
+    Runs `code` in a new interpreter with -X importtime and returns
+    {module: (self_us, cumulative_us)} for every module it imported.
+    """
+    env = {
+        **os.environ,
+        'DJANGO_SETTINGS_MODULE': 'Quizly.settings',
+        'WHISPER_PRELOAD': 'False',
+        'GENERATION_EMBEDDED_WORKERS': 'False',
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=settings.BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise CommandError(f"Import failed:\n{result.stderr[-2000:]}")
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        imports[name.strip()] = (int(self_us), int(cumulative_us))
+    return imports
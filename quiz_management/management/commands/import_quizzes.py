@@ -0,0 +1,50 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from quiz_management.services import QuizPersistenceService
+
+
+class Command(BaseCommand):
+    """
+    Imports quizzes from a JSON file for a given user.
+
+    The file contains one quiz object or a list of them, each in the
+    generated quiz format plus a "video_url":
+    {"video_url": "...", "title": "...", "description": "...", "questions": [...]}
+    """
+    help = "Imports quizzes from a JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to the JSON file.")
+        parser.add_argument('--username', required=True, help="Owner of the imported quizzes.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+
+        try:
+            with open(options['path'], encoding='utf-8') as file:
+                payload = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+
+        if isinstance(payload, dict):
+            payload = [payload]
+
+        items = []
+        for index, quiz_data in enumerate(payload):
+            video_url = quiz_data.get('video_url')
+            if not video_url:
+                raise CommandError(f"Quiz {index + 1} has no video_url.")
+            items.append((video_url, quiz_data))
+
+        try:
+            quizzes = QuizPersistenceService.create_quizzes(user, items)
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(quizzes)} quizzes."))
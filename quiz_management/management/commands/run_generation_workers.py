@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from quiz_management.jobs import GenerationWorkerPool
+
+
+class Command(BaseCommand):
+    """
+    Runs a pool of quiz generation workers in the foreground.
+    Intended for dedicated worker nodes; several instances may share one queue.
+    """
+    help = "Claims and runs queued quiz generation jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.GENERATION_WORKERS,
+            help="Number of worker threads.",
+        )
+
+    def handle(self, *args, **options):
+        pool = GenerationWorkerPool(
+            size=options['workers'],
+            poll_interval=settings.GENERATION_WORKER_POLL_SECONDS,
+        )
+        pool.start()
+        self.stdout.write(f"Started {options['workers']} generation workers.")
+
+        try:
+            pool.join()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping generation workers...")
+            pool.stop()
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from quiz_management import transcript_cache
+
+
+class Command(BaseCommand):
+    """
+    Prints the size and hit statistics of the transcript cache.
+    """
+    help = "Shows transcript cache size and hit counts."
+
+    def handle(self, *args, **options):
+        stats = transcript_cache.stats()
+        self.stdout.write(f"Entries:       {stats['entries']}")
+        self.stdout.write(f"Bytes stored:  {stats['bytes']} / {stats['max_bytes']}")
+        self.stdout.write(f"Lifetime hits: {stats['lifetime_hits']}")
+        self.stdout.write(f"Hit ratio:     {stats['lifetime_hit_ratio']:.1%}")
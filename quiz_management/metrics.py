@@ -0,0 +1,329 @@
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+STAGE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, math.inf)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, math.inf)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, math.inf)
+
+_registry_lock = threading.Lock()
+_metrics = []
+_collectors = []
+
+# Timing of the request handled in the current context (None outside requests)
+_request_timing = contextvars.ContextVar("quizly_request_timing", default=None)
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed buckets and one series per label set,
+    rendered in the Prometheus text format.
+    """
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def samples(self):
+        with self._lock:
+            snapshot = {key: (list(series[0]), series[1], series[2]) for key, series in self._series.items()}
+
+        for key, (counts, total, count) in sorted(snapshot.items()):
+            labels = dict(zip(self.labelnames, key))
+            for bound, bucket_count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", {**labels, "le": _format_bound(bound)}, bucket_count
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            snapshot = dict(self._values)
+        for key, value in sorted(snapshot.items()):
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+
+def register(metric):
+    with _registry_lock:
+        _metrics.append(metric)
+    return metric
+
+
+def register_collector(collect):
+    """
+    Registers a function that is called on every scrape and returns
+    (name, kind, documentation, [(labels, value), ...]) tuples for
+    values that are read from elsewhere, like cache counters.
+    """
+    with _registry_lock:
+        _collectors.append(collect)
+    return collect
+
+
+STAGE_SECONDS = register(Histogram(
+    "quizly_generation_stage_seconds",
+    "Duration of the stages of quiz generation.",
+    ["stage"],
+    STAGE_BUCKETS,
+))
+GENERATION_FAILURES = register(Counter(
+    "quizly_generation_failures_total",
+    "Generation jobs that failed, by the stage they were in.",
+    ["stage"],
+))
+REQUEST_SECONDS = register(Histogram(
+    "quizly_http_request_duration_seconds",
+    "Duration of API requests until the response is returned.",
+    ["view", "method", "status"],
+    REQUEST_BUCKETS,
+))
+REQUEST_QUERIES = register(Histogram(
+    "quizly_http_request_db_queries",
+    "Number of database queries per API request.",
+    ["view"],
+    QUERY_COUNT_BUCKETS,
+))
+REQUEST_QUERY_SECONDS = register(Histogram(
+    "quizly_http_request_db_seconds",
+    "Total database time per API request.",
+    ["view"],
+    REQUEST_BUCKETS,
+))
+
+
+_state_lock = threading.Lock()
+_state_cache = {"read_at": 0.0, "value": None}
+
+
+def _database_state():
+    """
+    Returns the job counts per status and the transcript cache stats.
+    Both need aggregate queries, so they are reused for
+    METRICS_STATE_CACHE_SECONDS instead of being read on every scrape.
+    """
+    from django.conf import settings
+    from django.db.models import Count
+
+    from . import transcript_cache
+    from .models import GenerationJob
+
+    with _state_lock:
+        age = time.monotonic() - _state_cache["read_at"]
+        if _state_cache["value"] is not None and age < settings.METRICS_STATE_CACHE_SECONDS:
+            return _state_cache["value"]
+
+        jobs = dict(
+            GenerationJob.objects
+            .exclude(status__in=[GenerationJob.STATUS_DONE, GenerationJob.STATUS_FAILED])
+            .values_list("status")
+            .annotate(count=Count("id"))
+        )
+        value = (jobs, transcript_cache.stats())
+        _state_cache["value"] = value
+        _state_cache["read_at"] = time.monotonic()
+        return value
+
+
+@register_collector
+def collect_generation_state():
+    """
+    Reports the job queue, the Whisper model registry and the transcript cache.
+    """
+    from .models import GenerationJob
+    from .whisper_registry import registry
+
+    jobs, cache = _database_state()
+    whisper = registry.stats()
+
+    return [
+        ("quizly_generation_jobs", "gauge", "Generation jobs that are queued or running, by status.",
+         [({"status": status}, jobs.get(status, 0))
+          for status in [GenerationJob.STATUS_QUEUED, *GenerationJob.RUNNING_STATUSES]]),
+        ("quizly_whisper_models_loaded", "gauge", "Whisper models resident in this process.",
+         [({}, len(whisper["loaded"]))]),
+        ("quizly_whisper_registry_hits_total", "counter", "Whisper model lookups served from memory.",
+         [({}, whisper["hits"])]),
+        ("quizly_whisper_registry_misses_total", "counter", "Whisper model lookups that loaded a model.",
+         [({}, whisper["misses"])]),
+        ("quizly_whisper_registry_evictions_total", "counter", "Whisper models evicted to make room.",
+         [({}, whisper["evictions"])]),
+        ("quizly_transcript_cache_hits_total", "counter", "Transcript cache hits in this process.",
+         [({}, cache["hits"])]),
+        ("quizly_transcript_cache_misses_total", "counter", "Transcript cache misses in this process.",
+         [({}, cache["misses"])]),
+        ("quizly_transcript_cache_bytes", "gauge", "Total size of the cached transcripts.",
+         [({}, cache["bytes"])]),
+        ("quizly_transcript_cache_entries", "gauge", "Number of cached transcripts.",
+         [({}, cache["entries"])]),
+    ]
+
+
+class RequestTiming:
+    """
+    Collects the database queries and stage spans of one request for the
+    Server-Timing header. Shared with the threads that sync_to_async()
+    runs ORM calls in, so updates are locked.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.spans = {}
+        self._lock = threading.Lock()
+
+    def add_query(self, seconds):
+        with self._lock:
+            self.queries += 1
+            self.query_seconds += seconds
+
+    def add_span(self, stage, seconds):
+        with self._lock:
+            self.spans[stage] = self.spans.get(stage, 0.0) + seconds
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        """
+        Returns the value of the Server-Timing header (durations in ms).
+        """
+        with self._lock:
+            entries = [f'db;dur={self.query_seconds * 1000:.1f};desc="{self.queries} queries"']
+            entries += [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in self.spans.items()]
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+
+def start_request():
+    """
+    Starts collecting timings for the current request.
+    Returns the timing and a token for finish_request().
+    """
+    timing = RequestTiming()
+    return timing, _request_timing.set(timing)
+
+
+def finish_request(timing, token, view, method, status_code):
+    _request_timing.reset(token)
+    REQUEST_SECONDS.observe(timing.elapsed(), view=view, method=method, status=status_code)
+    REQUEST_QUERIES.observe(timing.queries, view=view)
+    REQUEST_QUERY_SECONDS.observe(timing.query_seconds, view=view)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper that counts the queries of the current request.
+    Installed on every connection by the connection_created signal.
+    """
+    timing = _request_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.add_query(time.perf_counter() - started)
+
+
+def observe_stage(stage, seconds):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    timing = _request_timing.get()
+    if timing is not None:
+        timing.add_span(stage, seconds)
+
+
+@contextmanager
+def span(stage):
+    """
+    Times the enclosed block as a generation stage. Inside a request, the
+    stage also shows up in the response's Server-Timing header.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+def render():
+    """
+    Returns all metrics in the Prometheus text exposition format.
+    Values are per process; every worker process has to be scraped.
+    """
+    with _registry_lock:
+        metrics = list(_metrics)
+        collectors = list(_collectors)
+
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(_format_sample(name, labels, value))
+
+    for collect in collectors:
+        for name, kind, documentation, samples in collect():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(_format_sample(name, labels, value))
+
+    return "\n".join(lines) + "\n"
+
+
+def _format_sample(name, labels, value):
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+        return f"{name}{{{rendered}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+def _format_bound(bound):
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,66 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import metrics
+
+
+class MetricsMiddleware:
+    """
+    Records the duration and database queries of every request per view
+    and reports them in a Server-Timing header, so slow endpoints can be
+    profiled from the browser's developer tools.
+
+    Works for sync and async views; queries that async views run through
+    sync_to_async() are counted as well.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timing, token = metrics.start_request()
+        response = None
+        try:
+            response = self.get_response(request)
+        finally:
+            self._finish(request, response, timing, token)
+        return self._add_header(response, timing)
+
+    async def __acall__(self, request):
+        timing, token = metrics.start_request()
+        response = None
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._finish(request, response, timing, token)
+        return self._add_header(response, timing)
+
+    def _add_header(self, response, timing):
+        if settings.SERVER_TIMING_ENABLED:
+            response['Server-Timing'] = timing.server_timing()
+        return response
+
+    def _finish(self, request, response, timing, token):
+        # Exceptions that escape the view become a 500 further up the stack
+        status_code = response.status_code if response is not None else 500
+        metrics.finish_request(timing, token, self._view_name(request), request.method, status_code)
+
+    def _view_name(self, request):
+        """
+        Returns the URL name of the resolved view, which keeps the number of
+        label values bounded (unlike the path, which contains ids).
+        """
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return "unmatched"
+        return match.view_name or match.route or "unnamed"
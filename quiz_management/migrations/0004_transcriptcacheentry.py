@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management', '0003_generationjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_id', models.CharField(max_length=11)),
+                ('model_name', models.CharField(max_length=50)),
+                ('settings_key', models.CharField(max_length=64)),
+                ('transcript', models.TextField()),
+                ('size_bytes', models.PositiveIntegerField()),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['last_used_at'], name='quiz_manage_last_us_a929ca_idx')],
+                'constraints': [models.UniqueConstraint(fields=('video_id', 'model_name', 'settings_key'), name='unique_transcript_cache_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management', '0005_generationflight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationjob',
+            name='transcript_source',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+    ]
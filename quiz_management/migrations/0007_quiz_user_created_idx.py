@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management', '0006_generationjob_transcript_source'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='quiz_user_created_idx'),
+        ),
+    ]
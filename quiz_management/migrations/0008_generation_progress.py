@@ -0,0 +1,23 @@
+# Generated by Django 6.0.1 on 2026-10-17 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_management', '0007_quiz_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='generationflight',
+            name='progress',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='generationjob',
+            name='progress',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -17,6 +17,12 @@ class Quiz(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Quiz lists: filtered by user, newest first, keyset-paginated on (created_at, id)
+            models.Index(fields=["user", "-created_at", "-id"], name="quiz_user_created_idx"),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -42,4 +48,232 @@ class Question(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.question_text
\ No newline at end of file
+        return self.question_text
+
+class GenerationBatch(models.Model):
+    """
+    Groups the generation jobs created together from a list of URLs or a playlist.
+    Workers run at most GENERATION_BATCH_CONCURRENCY jobs of a batch at a time.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="generation_batches"
+    )
+    source_url = models.URLField(blank=True)
+    title = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.title or f"Batch {self.pk}"
+
+
+class GenerationJob(models.Model):
+    """
+    Represents a queued or running quiz generation for a YouTube URL.
+
+    Jobs are claimed by workers through a time-limited lease so several
+    worker processes can drain the same queue without running a job twice.
+    `progress` is the completion of the current stage in percent.
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_DOWNLOADING = "downloading"
+    STATUS_TRANSCRIBING = "transcribing"
+    STATUS_GENERATING = "generating"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_DOWNLOADING, "Downloading"),
+        (STATUS_TRANSCRIBING, "Transcribing"),
+        (STATUS_GENERATING, "Generating"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+    RUNNING_STATUSES = [STATUS_DOWNLOADING, STATUS_TRANSCRIBING, STATUS_GENERATING]
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="generation_jobs"
+    )
+    batch = models.ForeignKey(
+        GenerationBatch,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="jobs"
+    )
+    video_url = models.URLField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    progress = models.PositiveSmallIntegerField(default=0)
+    quiz = models.ForeignKey(
+        Quiz,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="generation_jobs"
+    )
+    transcript_source = models.CharField(max_length=20, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    lease_owner = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.video_url} ({self.status})"
+
+
+class TranscriptCacheEntry(models.Model):
+    """
+    Stores the transcript of a YouTube video so repeated submissions
+    can skip downloading and transcribing the audio.
+
+    Entries are keyed by video id, Whisper model and a hash of the
+    transcription settings, and evicted least-recently-used first.
+    """
+    video_id = models.CharField(max_length=11)
+    model_name = models.CharField(max_length=50)
+    settings_key = models.CharField(max_length=64)
+    transcript = models.TextField()
+    size_bytes = models.PositiveIntegerField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video_id", "model_name", "settings_key"],
+                name="unique_transcript_cache_key",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["last_used_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.video_id} ({self.model_name})"
+
+
+class GenerationFlight(models.Model):
+    """
+    Marks a quiz generation that is currently running for a given key.
+
+    The unique key acts as a cross-process lock: the worker that inserts
+    the row does the work, others wait for its stored result or error.
+    """
+    key = models.CharField(max_length=100, unique=True)
+    owner = models.CharField(max_length=100)
+    stage = models.CharField(max_length=20, blank=True)
+    progress = models.PositiveSmallIntegerField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.key
+
+
+class Attempt(models.Model):
+    """
+    A graded submission of answers to a quiz.
+    `score` is the number of correctly answered questions out of `question_count`.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="quiz_attempts"
+    )
+    quiz = models.ForeignKey(
+        Quiz,
+        on_delete=models.CASCADE,
+        related_name="attempts"
+    )
+    score = models.PositiveIntegerField()
+    question_count = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["quiz", "user", "-created_at"], name="attempt_quiz_user_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.quiz} ({self.score}/{self.question_count})"
+
+
+class AttemptAnswer(models.Model):
+    """
+    The answer given to one question of an attempt. Unanswered questions
+    are stored with an empty `selected` and count as wrong.
+    """
+    attempt = models.ForeignKey(
+        Attempt,
+        on_delete=models.CASCADE,
+        related_name="answers"
+    )
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        related_name="attempt_answers"
+    )
+    selected = models.CharField(max_length=255, blank=True)
+    is_correct = models.BooleanField()
+
+    def __str__(self):
+        return self.selected
+
+
+class QuizStats(models.Model):
+    """
+    Running totals over all attempts of a quiz, updated with every
+    submitted attempt so statistics never have to scan the attempts.
+    `score_distribution` maps a score to the number of attempts with it.
+    """
+    quiz = models.OneToOneField(
+        Quiz,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats"
+    )
+    attempt_count = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveIntegerField(default=0)
+    score_distribution = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for {self.quiz}"
+
+
+class QuestionStats(models.Model):
+    """
+    Running answer counts of a question over all attempts of its quiz.
+    """
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats"
+    )
+    quiz = models.ForeignKey(
+        Quiz,
+        on_delete=models.CASCADE,
+        related_name="question_stats"
+    )
+    answer_count = models.PositiveIntegerField(default=0)
+    correct_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Stats for {self.question}"
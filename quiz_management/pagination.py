@@ -0,0 +1,92 @@
+import base64
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over (created_at, id), newest first.
+
+    Each page is a single indexed range query instead of an OFFSET scan.
+    The response body stays a plain list; the next page is announced in
+    a `Link: <...>; rel="next"` header.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._page_queryset(queryset, request)
+        return self._finish_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request):
+        """
+        Async variant of paginate_queryset() for async views.
+        """
+        queryset = self._page_queryset(queryset, request)
+        return self._finish_page([obj async for obj in queryset])
+
+    def get_paginated_response(self, data):
+        return Response(data, headers=self.get_headers())
+
+    def get_headers(self):
+        headers = {}
+        next_link = self.get_next_link()
+        if next_link:
+            headers['Link'] = f'<{next_link}>; rel="next"'
+        return headers
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def _page_queryset(self, queryset, request):
+        """
+        Returns the query for the requested page plus one row, which tells
+        whether a next page exists.
+        """
+        self.request = request
+        self.page_size = self._get_page_size(request)
+        cursor = self._decode_cursor(request.GET.get(self.cursor_query_param))
+
+        queryset = queryset.order_by('-created_at', '-id')
+        if cursor is not None:
+            created_at, pk = cursor
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+        return queryset[:self.page_size + 1]
+
+    def _finish_page(self, page):
+        self.has_next = len(page) > self.page_size
+        page = page[:self.page_size]
+        self.next_cursor = self._encode_cursor(page[-1]) if self.has_next else None
+        return page
+
+    def _get_page_size(self, request):
+        try:
+            page_size = int(request.GET.get(self.page_size_query_param, settings.QUIZ_PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: "Must be an integer."})
+        return max(1, min(page_size, settings.QUIZ_MAX_PAGE_SIZE))
+
+    def _encode_cursor(self, obj):
+        raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    def _decode_cursor(self, cursor):
+        if not cursor:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            created_at, pk = raw.split('|')
+            return datetime.fromisoformat(created_at), int(pk)
+        except (ValueError, UnicodeError):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
@@ -0,0 +1,155 @@
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from django.conf import settings
+
+from . import audio
+
+# Model loaded once in each worker process by _init_worker
+_worker_model = None
+
+
+def _init_worker(model_name, threads):
+    """
+    Runs once in every pool process: limits torch to its thread budget
+    and loads the Whisper model the process will keep using.
+    """
+    global _worker_model
+    import torch
+    import whisper
+
+    torch.set_num_threads(threads)
+    _worker_model = whisper.load_model(model_name)
+
+
+def _transcribe_chunk(samples, options):
+    result = _worker_model.transcribe(samples, **options)
+    return result["text"].strip()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Returns the process-wide transcription pool, creating it on first use.
+    Worker processes are spawned (not forked) so they start without the
+    parent's torch threads and Django state.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.TRANSCRIBE_PARALLEL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(settings.WHISPER_MODEL, settings.TRANSCRIBE_THREADS_PER_WORKER),
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def transcribe_segments(segments, options, on_progress=None):
+    """
+    Transcribes a stream of PCM segments in parallel.
+
+    Incoming audio is buffered and cut into chunks of about
+    TRANSCRIBE_CHUNK_SECONDS at the quietest point near each boundary.
+    Every chunk is submitted to the pool as soon as it is complete and
+    extends a little into the next one; the overlapping words are
+    removed again when the chunk texts are merged in order.
+    If given, `on_progress` is called from this thread with the seconds
+    of audio whose chunks have been transcribed so far.
+    """
+    chunk = int(settings.TRANSCRIBE_CHUNK_SECONDS * audio.SAMPLE_RATE)
+    search = int(settings.TRANSCRIBE_SILENCE_SEARCH_SECONDS * audio.SAMPLE_RATE)
+    overlap = int(settings.TRANSCRIBE_CHUNK_OVERLAP_SECONDS * audio.SAMPLE_RATE)
+
+    pool = get_pool()
+    futures = []
+    chunk_seconds = []
+    buffer = np.empty(0, dtype=np.float32)
+
+    def report_progress():
+        if on_progress is not None:
+            on_progress(sum(seconds for future, seconds in zip(futures, chunk_seconds) if future.done()))
+
+    try:
+        for segment in segments:
+            buffer = np.concatenate([buffer, segment])
+            while len(buffer) >= chunk + search + overlap:
+                cut = audio.find_quietest_point(buffer, chunk - search, chunk + search)
+                futures.append(pool.submit(_transcribe_chunk, buffer[:cut + overlap], options))
+                chunk_seconds.append(cut / audio.SAMPLE_RATE)
+                buffer = buffer[cut:]
+            report_progress()
+
+        if len(buffer) >= audio.SAMPLE_RATE // 10:
+            futures.append(pool.submit(_transcribe_chunk, buffer, options))
+            chunk_seconds.append(len(buffer) / audio.SAMPLE_RATE)
+
+        texts = []
+        for future in futures:
+            texts.append(future.result())
+            report_progress()
+    except BrokenProcessPool:
+        _reset_pool()
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+    return merge_transcripts(texts)
+
+
+def merge_transcripts(texts, max_overlap_words=30):
+    """
+    Joins chunk transcripts in order, dropping words at the start of a
+    chunk that repeat the end of the previous one. The last word of the
+    previous chunk may be a fragment of a word cut at the chunk edge, so
+    it is allowed to differ and is replaced by the complete one.
+    """
+    words = []
+    for text in texts:
+        new_words = text.split()
+        trailing, size = _find_overlap(words, new_words, max_overlap_words)
+        if trailing:
+            del words[-trailing:]
+        words.extend(new_words[size:])
+    return " ".join(words)
+
+
+def _find_overlap(left, right, limit):
+    """
+    Returns (trailing, size): `size` words ending `left` (ignoring its last
+    `trailing` words) equal the first `size` words of `right`, compared
+    without case and punctuation. Single-word matches are ignored as they
+    are too likely to be coincidental. Returns (0, 0) if there is no overlap.
+    """
+    left_norm = [_normalize(w) for w in left[-(limit + 1):]]
+    right_norm = [_normalize(w) for w in right[:limit]]
+
+    for size in range(min(limit, len(right_norm)), 1, -1):
+        for trailing in (0, 1):
+            end = len(left_norm) - trailing
+            if end - size < 0:
+                continue
+            if left_norm[end - size:end] == right_norm[:size]:
+                return trailing, size
+    return 0, 0
+
+
+def _normalize(word):
+    return re.sub(r"[^\w]", "", word.lower())
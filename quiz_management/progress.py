@@ -0,0 +1,60 @@
+import threading
+import time
+
+from django.conf import settings
+
+
+class ProgressReporter:
+    """
+    Forwards stage changes and progress updates of a generation to
+    `report_stage(stage, progress)`.
+
+    Stage changes are always forwarded. Progress within a stage is only
+    forwarded when it advanced and GENERATION_PROGRESS_INTERVAL_SECONDS
+    have passed since the last update (or when the stage completes), so
+    chatty sources like yt-dlp hooks do not turn into a database write each.
+    """
+
+    def __init__(self, report_stage):
+        self._report_stage = report_stage
+        self._lock = threading.Lock()
+        self._stage = None
+        self._progress = 0
+        self._reported_at = 0.0
+
+    def __call__(self, stage, progress=None):
+        if progress is None:
+            self.stage(stage)
+        else:
+            self.update(stage, progress)
+
+    def stage(self, stage):
+        with self._lock:
+            self._stage = stage
+            self._progress = 0
+            self._reported_at = time.monotonic()
+        self._report_stage(stage, 0)
+
+    def update(self, stage, progress):
+        """
+        Reports `progress` (0-100) within `stage`, entering the stage first if needed.
+        """
+        progress = max(0, min(100, int(progress)))
+        with self._lock:
+            if stage != self._stage:
+                self._stage = stage
+            elif progress <= self._progress:
+                return
+            elif progress < 100 and time.monotonic() - self._reported_at < settings.GENERATION_PROGRESS_INTERVAL_SECONDS:
+                return
+            self._progress = progress
+            self._reported_at = time.monotonic()
+        self._report_stage(stage, progress)
+
+    def fraction(self, stage, done, total):
+        """
+        Reports `done` out of `total` as progress within `stage`.
+        Does nothing if the total is unknown.
+        """
+        if total:
+            self.update(stage, 100 * done / total)
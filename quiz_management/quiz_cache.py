@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _key(pk):
+    return f"quiz-detail:{pk}"
+
+
+def _version(updated_at):
+    return str(int(updated_at.timestamp() * 1_000_000))
+
+
+def make_etag(pk, updated_at):
+    """
+    Returns the strong ETag of a quiz detail response.
+    Changes whenever the quiz (or, through the signals, one of its questions) changes.
+    """
+    return f'"quiz-{pk}-{_version(updated_at)}"'
+
+
+def get_detail(pk, updated_at):
+    """
+    Returns the cached serialized quiz, or None if it is missing or stale.
+    """
+    entry = cache.get(_key(pk))
+    if entry is None or entry["version"] != _version(updated_at):
+        return None
+    return entry["data"]
+
+
+async def aget_detail(pk, updated_at):
+    entry = await cache.aget(_key(pk))
+    if entry is None or entry["version"] != _version(updated_at):
+        return None
+    return entry["data"]
+
+
+def set_detail(pk, updated_at, data):
+    cache.set(
+        _key(pk),
+        {"version": _version(updated_at), "data": data},
+        settings.QUIZ_DETAIL_CACHE_SECONDS,
+    )
+
+
+async def aset_detail(pk, updated_at, data):
+    await cache.aset(
+        _key(pk),
+        {"version": _version(updated_at), "data": data},
+        settings.QUIZ_DETAIL_CACHE_SECONDS,
+    )
+
+
+def invalidate(pk):
+    cache.delete(_key(pk))
@@ -1,5 +1,7 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Quiz, Question
+from .models import Attempt, AttemptAnswer, GenerationBatch, GenerationJob, Quiz, Question
 
 
 class QuestionSerializer(serializers.ModelSerializer):
@@ -35,9 +37,202 @@ class QuizResponseSerializer(serializers.ModelSerializer):
         ]
 
 
+class QuizSummarySerializer(serializers.ModelSerializer):
+    """
+    Lightweight serializer for quiz lists.
+    Returns the number of questions instead of the questions themselves.
+    """
+    question_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Quiz
+        fields = [
+            'id',
+            'title',
+            'description',
+            'created_at',
+            'updated_at',
+            'video_url',
+            'question_count'
+        ]
+
+
+class GeneratedQuestionSerializer(serializers.Serializer):
+    """
+    Validates a single question of a generated or imported quiz payload.
+    """
+    question_title = serializers.CharField(max_length=500)
+    options = serializers.ListField(
+        child=serializers.CharField(allow_blank=False),
+        allow_empty=False
+    )
+    answer = serializers.CharField(max_length=255)
+
+    def validate(self, data):
+        if data['answer'] not in data['options']:
+            raise serializers.ValidationError({'answer': "The answer must be one of the options."})
+        return data
+
+
+class GeneratedQuizSerializer(serializers.Serializer):
+    """
+    Validates a generated or imported quiz payload before it is stored.
+    Uses the same structure as the JSON returned by Gemini.
+    """
+    title = serializers.CharField(max_length=255, default='Generated Quiz')
+    description = serializers.CharField(allow_blank=True, default='')
+    questions = GeneratedQuestionSerializer(many=True, allow_empty=False)
+
+
 class CreateQuizRequestSerializer(serializers.Serializer):
     """
     Serializer for validating the quiz creation request.
     Requires a valid YouTube URL.
     """
-    url = serializers.URLField()
\ No newline at end of file
+    url = serializers.URLField()
+
+
+class CreateQuizBatchRequestSerializer(serializers.Serializer):
+    """
+    Serializer for validating a batch creation request.
+    Requires either a list of video URLs or a playlist URL.
+    """
+    urls = serializers.ListField(child=serializers.URLField(), required=False, allow_empty=False)
+    playlist_url = serializers.URLField(required=False)
+
+    def validate_urls(self, value):
+        if len(value) > settings.GENERATION_BATCH_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"A batch may contain at most {settings.GENERATION_BATCH_MAX_ITEMS} URLs."
+            )
+        return value
+
+    def validate(self, data):
+        if ('urls' in data) == ('playlist_url' in data):
+            raise serializers.ValidationError("Provide either 'urls' or 'playlist_url'.")
+        return data
+
+
+class GenerationJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for reporting the state of a quiz generation job.
+    Links to the job itself and, once finished, to the generated quiz.
+    """
+    status_url = serializers.SerializerMethodField()
+    quiz_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = GenerationJob
+        fields = [
+            'id',
+            'status',
+            'progress',
+            'video_url',
+            'quiz',
+            'quiz_url',
+            'status_url',
+            'transcript_source',
+            'error',
+            'created_at',
+            'updated_at',
+            'finished_at'
+        ]
+
+    def get_status_url(self, obj):
+        return self._absolute_url(reverse('job-detail', args=[obj.pk]))
+
+    def get_quiz_url(self, obj):
+        if obj.quiz_id is None:
+            return None
+        return self._absolute_url(reverse('quiz-detail', args=[obj.quiz_id]))
+
+    def _absolute_url(self, path):
+        request = self.context.get('request')
+        return request.build_absolute_uri(path) if request else path
+
+
+class GenerationBatchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for reporting the state of a generation batch.
+    Includes the status of every job and the number of jobs per status.
+    """
+    status_url = serializers.SerializerMethodField()
+    counts = serializers.SerializerMethodField()
+    finished = serializers.SerializerMethodField()
+    jobs = serializers.SerializerMethodField()
+
+    class Meta:
+        model = GenerationBatch
+        fields = [
+            'id',
+            'title',
+            'source_url',
+            'status_url',
+            'finished',
+            'counts',
+            'jobs',
+            'created_at'
+        ]
+
+    def get_status_url(self, obj):
+        request = self.context.get('request')
+        path = reverse('batch-detail', args=[obj.pk])
+        return request.build_absolute_uri(path) if request else path
+
+    def get_counts(self, obj):
+        counts = {status: 0 for status, _ in GenerationJob.STATUS_CHOICES}
+        for job in obj.jobs.all():
+            counts[job.status] += 1
+        return counts
+
+    def get_finished(self, obj):
+        finished = (GenerationJob.STATUS_DONE, GenerationJob.STATUS_FAILED)
+        return all(job.status in finished for job in obj.jobs.all())
+
+    def get_jobs(self, obj):
+        jobs = sorted(obj.jobs.all(), key=lambda job: job.pk)
+        return GenerationJobSerializer(jobs, many=True, context=self.context).data
+
+
+class SubmittedAnswerSerializer(serializers.Serializer):
+    """
+    Validates one answer of a submitted attempt.
+    """
+    question = serializers.IntegerField()
+    answer = serializers.CharField(max_length=255, allow_blank=True)
+
+
+class AttemptSubmissionSerializer(serializers.Serializer):
+    """
+    Validates an attempt submission: a list of answers with at most one
+    answer per question. Questions without an answer count as wrong.
+    """
+    answers = serializers.ListField(child=SubmittedAnswerSerializer(), allow_empty=True)
+
+    def validate_answers(self, value):
+        question_ids = [item['question'] for item in value]
+        if len(question_ids) != len(set(question_ids)):
+            raise serializers.ValidationError("Each question may only be answered once.")
+        return value
+
+
+class AttemptAnswerSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a graded answer, including the correct answer.
+    """
+    correct_answer = serializers.CharField(source='question.answer', read_only=True)
+
+    class Meta:
+        model = AttemptAnswer
+        fields = ['question', 'selected', 'is_correct', 'correct_answer']
+
+
+class AttemptSerializer(serializers.ModelSerializer):
+    """
+    Serializer for reporting a graded attempt with all of its answers.
+    """
+    answers = AttemptAnswerSerializer(source='graded_answers', many=True, read_only=True)
+
+    class Meta:
+        model = Attempt
+        fields = ['id', 'quiz', 'score', 'question_count', 'created_at', 'answers']
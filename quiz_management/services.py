@@ -1,14 +1,36 @@
 import json
-import os
+import logging
+import queue
+import re
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-import whisper
-import yt_dlp
+import requests
 from django.conf import settings
-from google import genai
+from django.db import transaction
+from django.db.models import F
 
+from . import audio, chunking, gemini_client, metrics, parallel_transcription, singleflight, transcript_cache
+from .models import Attempt, AttemptAnswer, QuestionStats, Quiz, QuizStats, Question
+from .progress import ProgressReporter
+from .serializers import GeneratedQuizSerializer
 from .utils import extract_youtube_video_id, find_file_by_prefix, clean_ai_json_response
+from .whisper_registry import registry as whisper_registry
+
+logger = logging.getLogger(__name__)
+
+# Options passed to Whisper's transcribe(); part of the transcript cache key
+TRANSCRIBE_OPTIONS = {"fp16": False}
+
+# Transcript sources, recorded on the generation job
+SOURCE_CAPTIONS = "captions"
+SOURCE_WHISPER = "whisper"
+
+# Model name under which caption transcripts are stored in the transcript cache
+CAPTIONS_CACHE_MODEL = "captions"
 
 class QuizGenerationService:
     """
@@ -17,39 +39,281 @@ class QuizGenerationService:
     """
 
     @staticmethod
-    def generate_quiz_from_url(url):
+    def generate_quiz_from_url(url, on_stage=None):
         """
         Orchestrates the quiz generation process.
+        If given, `on_stage(stage, progress)` is called with the name of each
+        stage as it starts ("downloading", "transcribing", "generating") and
+        with the completion of the current stage in percent as it advances.
         """
+        report_stage = on_stage or (lambda stage, progress: None)
+
         video_id = extract_youtube_video_id(url)
         if not video_id:
             raise ValueError("Invalid YouTube URL")
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            temp_filename_base = temp_path / f"audio_{video_id}"
-            
-            audio_path = QuizGenerationService._download_audio(url, temp_filename_base)
-            transcript = QuizGenerationService._transcribe_audio(audio_path)
-            quiz_data = QuizGenerationService._generate_with_gemini(transcript, url)
-            
-            return quiz_data
+        # Concurrent requests for the same video share one generation
+        return singleflight.run(
+            f"quiz:{video_id}",
+            lambda report: QuizGenerationService._generate(url, video_id, ProgressReporter(report)),
+            report_stage,
+        )
+
+    @staticmethod
+    def _generate(url, video_id, progress):
+        transcript, source = QuizGenerationService._get_transcript(url, video_id, progress)
+        progress.stage("generating")
+        with metrics.span("generate"):
+            quiz_data = QuizGenerationService._generate_with_gemini(transcript, url, progress)
+        quiz_data["transcript_source"] = source
+
+        return quiz_data
+
+    @staticmethod
+    def _get_transcript(url, video_id, progress):
+        """
+        Returns the transcript and its source ("captions" or "whisper").
+        Cached transcripts are used first, then the video's captions. The audio
+        is only downloaded and transcribed if no usable captions exist.
+        """
+        caption_options = {"languages": settings.CAPTION_LANGUAGES}
+        model_name = settings.WHISPER_MODEL
+        whisper_options = QuizGenerationService._transcription_settings()
+
+        if settings.CAPTIONS_ENABLED:
+            transcript = transcript_cache.get_transcript(video_id, CAPTIONS_CACHE_MODEL, caption_options)
+            if transcript is not None:
+                return transcript, SOURCE_CAPTIONS
+
+        transcript = transcript_cache.get_transcript(video_id, model_name, whisper_options)
+        if transcript is not None:
+            return transcript, SOURCE_WHISPER
+
+        progress.stage("downloading")
+
+        if settings.CAPTIONS_ENABLED:
+            with metrics.span("captions"):
+                transcript = QuizGenerationService._fetch_captions(video_id)
+            if transcript is not None:
+                transcript_cache.store_transcript(video_id, CAPTIONS_CACHE_MODEL, caption_options, transcript)
+                return transcript, SOURCE_CAPTIONS
+
+        if settings.TRANSCRIBE_PARALLEL_ENABLED:
+            transcript = QuizGenerationService._transcribe_parallel(url, progress)
+        elif settings.TRANSCRIBE_PIPELINE_ENABLED:
+            transcript = QuizGenerationService._transcribe_stream(url, progress)
+        else:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_path = Path(temp_dir)
+                temp_filename_base = temp_path / f"audio_{video_id}"
+                
+                with metrics.span("download"):
+                    audio_path = QuizGenerationService._download_audio(url, temp_filename_base, progress)
+                progress.stage("transcribing")
+                with metrics.span("decode"):
+                    samples = audio.decode_audio_file(audio_path)
+                with metrics.span("transcribe"):
+                    transcript = QuizGenerationService._transcribe_audio(samples)
+
+        transcript_cache.store_transcript(video_id, model_name, whisper_options, transcript)
+        return transcript, SOURCE_WHISPER
+
+    @staticmethod
+    def expand_playlist(url, max_items):
+        """
+        Lists the videos of a YouTube playlist with yt-dlp's flat extraction,
+        which reads only the playlist pages and downloads nothing.
+        Returns the playlist title and up to `max_items` video URLs.
+        """
+        import yt_dlp
+
+        ydl_opts = {
+            "extract_flat": "in_playlist",
+            "quiet": True,
+            "playlistend": max_items,
+        }
+
+        with metrics.span("expand_playlist"), yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+
+        if info.get("_type") != "playlist":
+            raise ValueError("URL is not a playlist.")
+
+        urls = []
+        for entry in info.get("entries") or []:
+            video_id = (entry or {}).get("id")
+            if video_id and len(urls) < max_items:
+                urls.append(f"https://www.youtube.com/watch?v={video_id}")
+        return info.get("title") or "", urls
+
+    @staticmethod
+    def _transcription_settings():
+        """
+        Returns the settings that influence the Whisper transcript.
+        Used as part of the transcript cache key.
+        """
+        options = dict(TRANSCRIBE_OPTIONS)
+        if settings.TRANSCRIBE_PARALLEL_ENABLED:
+            options["chunk_seconds"] = settings.TRANSCRIBE_CHUNK_SECONDS
+        elif settings.TRANSCRIBE_PIPELINE_ENABLED:
+            options["segment_seconds"] = settings.TRANSCRIBE_SEGMENT_SECONDS
+        return options
+
+    @staticmethod
+    def _transcribe_stream(url, progress):
+        """
+        Decodes the audio stream into fixed-length segments while it downloads
+        and transcribes each segment as soon as it is ready.
+        """
+        with metrics.span("resolve_stream"):
+            stream_url, headers, duration = audio.resolve_audio_stream(url)
+        segments = audio.stream_pcm_segments(stream_url, headers, settings.TRANSCRIBE_SEGMENT_SECONDS)
+        return QuizGenerationService._transcribe_segments(segments, progress, duration)
+
+    @staticmethod
+    def _transcribe_parallel(url, progress):
+        """
+        Decodes the audio stream and transcribes silence-separated chunks
+        of it concurrently in the transcription process pool.
+        """
+        with metrics.span("resolve_stream"):
+            stream_url, headers, duration = audio.resolve_audio_stream(url)
+        segments = audio.stream_pcm_segments(stream_url, headers, settings.TRANSCRIBE_SEGMENT_SECONDS)
+        progress.stage("transcribing")
+        try:
+            with metrics.span("transcribe"):
+                return parallel_transcription.transcribe_segments(
+                    segments,
+                    TRANSCRIBE_OPTIONS,
+                    on_progress=lambda seconds: progress.fraction("transcribing", seconds, duration),
+                )
+        finally:
+            segments.close()
 
     @staticmethod
-    def _download_audio(url, filename_base):
+    def _transcribe_segments(segments, progress, duration=None):
         """
-        Downloads audio via yt-dlp and locates the resulting file using utils.
+        Transcribes segments from `segments` in order while a background thread
+        keeps pulling the next ones. Each segment is conditioned on the end of
+        the previous text to keep the stitched transcript coherent.
+        Progress is measured against `duration` (seconds), if known.
+        """
+        ready = queue.Queue(maxsize=settings.TRANSCRIBE_PIPELINE_DEPTH)
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for segment in segments:
+                    if not put(segment):
+                        return
+                put(done)
+            except Exception as e:
+                put(e)
+            finally:
+                segments.close()
+
+        producer = threading.Thread(target=produce, name="audio-decoder", daemon=True)
+        producer.start()
+
+        model = whisper_registry.get(settings.WHISPER_MODEL)
+        model_lock = whisper_registry.lock_for(settings.WHISPER_MODEL)
+        texts = []
+        transcribed_seconds = 0.0
+        try:
+            progress.stage("transcribing")
+            while True:
+                segment = ready.get()
+                if segment is done:
+                    break
+                if isinstance(segment, Exception):
+                    raise segment
+                if len(segment) < audio.SAMPLE_RATE // 10:
+                    continue
+
+                previous = texts[-1][-200:] if texts else None
+                with metrics.span("transcribe_segment"), model_lock:
+                    result = model.transcribe(segment, initial_prompt=previous, **TRANSCRIBE_OPTIONS)
+                text = result["text"].strip()
+                if text:
+                    texts.append(text)
+                transcribed_seconds += len(segment) / audio.SAMPLE_RATE
+                progress.fraction("transcribing", transcribed_seconds, duration)
+        finally:
+            # Lets the decoder thread stop and kill FFmpeg if transcription failed
+            stop.set()
+
+        return " ".join(texts)
+
+    @staticmethod
+    def _fetch_captions(video_id):
+        """
+        Fetches the video's captions via youtube-transcript-api.
+        Prefers manually created captions in the configured languages, then
+        auto-generated ones, then any available language.
+        Returns the caption text or None if no usable captions exist.
+        """
+        from youtube_transcript_api import NoTranscriptFound, YouTubeTranscriptApi, YouTubeTranscriptApiException
+
+        languages = settings.CAPTION_LANGUAGES
+
+        try:
+            transcript_list = YouTubeTranscriptApi().list(video_id)
+            transcript = None
+            for finder in (
+                transcript_list.find_manually_created_transcript,
+                transcript_list.find_generated_transcript,
+            ):
+                try:
+                    transcript = finder(languages)
+                    break
+                except NoTranscriptFound:
+                    continue
+            if transcript is None:
+                transcript = next(iter(transcript_list), None)
+            if transcript is None:
+                return None
+
+            fetched = transcript.fetch()
+        except (YouTubeTranscriptApiException, requests.RequestException):
+            return None
+
+        text = " ".join(
+            snippet.text.strip() for snippet in fetched if snippet.text.strip()
+        )
+        if len(text) < settings.CAPTION_MIN_CHARS:
+            return None
+        return text
+
+    @staticmethod
+    def _download_audio(url, filename_base, progress=None):
         """
+        Downloads the native audio stream (opus/m4a) via yt-dlp and locates the
+        resulting file using utils. The audio is not re-encoded; it is decoded
+        once to PCM for Whisper by audio.decode_audio_file().
+        """
+        import yt_dlp
+
+        def on_download(status):
+            if progress is not None and status.get("status") == "downloading":
+                total = status.get("total_bytes") or status.get("total_bytes_estimate")
+                progress.fraction("downloading", status.get("downloaded_bytes", 0), total)
+
         ydl_opts = {
             "format": "bestaudio/best",
             "outtmpl": f"{filename_base}.%(ext)s",
             "quiet": True,
             "noplaylist": True,
-            "postprocessors": [{
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "128",
-            }],
+            "progress_hooks": [on_download],
         }
 
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
@@ -58,7 +322,7 @@ class QuizGenerationService:
         directory = filename_base.parent
         prefix = filename_base.name
         
-        audio_file = find_file_by_prefix(directory, prefix, ".mp3")
+        audio_file = find_file_by_prefix(directory, prefix, extension="")
         
         if not audio_file:
             raise FileNotFoundError("Audio download failed or file not found.")
@@ -66,30 +330,133 @@ class QuizGenerationService:
         return audio_file
 
     @staticmethod
-    def _transcribe_audio(filepath):
-        if not os.path.exists(filepath):
-            raise FileNotFoundError(f"File not found: {filepath}")
-            
-        model = whisper.load_model("base")
-        result = model.transcribe(filepath, fp16=False)
+    def _transcribe_audio(samples):
+        """
+        Transcribes 16 kHz mono float32 samples with the shared Whisper model.
+        """
+        model = whisper_registry.get(settings.WHISPER_MODEL)
+        with whisper_registry.lock_for(settings.WHISPER_MODEL):
+            result = model.transcribe(samples, **TRANSCRIBE_OPTIONS)
         return result["text"]
 
     @staticmethod
-    def _generate_with_gemini(transcript_text, video_url):
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key:
-            raise Exception("GEMINI_API_KEY not found.")
+    def _generate_with_gemini(transcript_text, video_url, progress=None):
+        """
+        Generates the quiz from the full transcript.
+
+        Short transcripts are sent in a single prompt. Longer ones are split
+        into overlapping token windows; questions are generated for every
+        window concurrently (map) and then merged, deduplicated and
+        given a common title and description (reduce). Progress counts
+        the finished requests, including the final one.
+        """
+        client = gemini_client.get_client()
+        question_count = settings.QUIZ_QUESTION_COUNT
+        windows = chunking.split_into_windows(
+            transcript_text,
+            settings.GEMINI_CHUNK_TOKENS,
+            settings.GEMINI_CHUNK_OVERLAP_TOKENS,
+        )
+
+        if len(windows) <= 1:
+            prompt = QuizGenerationService._quiz_prompt(transcript_text, video_url, question_count)
+            return QuizGenerationService._ask_gemini(client, prompt, "quiz")
+
+        per_window = -(-question_count // len(windows)) + 1
+
+        def generate_for_window(index, window):
+            prompt = QuizGenerationService._chunk_prompt(
+                window, video_url, per_window, index + 1, len(windows)
+            )
+            return QuizGenerationService._ask_gemini(client, prompt, f"chunk {index + 1}/{len(windows)}")
+
+        with ThreadPoolExecutor(max_workers=settings.GEMINI_MAX_PARALLEL_REQUESTS) as executor:
+            futures = [executor.submit(generate_for_window, index, window) for index, window in enumerate(windows)]
+            # Progress is reported from this thread, which owns the database connection
+            for finished, future in enumerate(as_completed(futures), start=1):
+                future.result()
+                if progress is not None:
+                    progress.fraction("generating", finished, len(windows) + 1)
+            partials = [future.result() for future in futures]
+
+        questions = QuizGenerationService._merge_questions(
+            [partial.get("questions", []) for partial in partials], question_count
+        )
+        summaries = [partial.get("summary", "") for partial in partials]
+        overview = QuizGenerationService._ask_gemini(
+            client, QuizGenerationService._overview_prompt(summaries, video_url), "overview"
+        )
+        if progress is not None:
+            progress.update("generating", 100)
+
+        return {
+            "title": overview.get("title", "Generated Quiz"),
+            "description": overview.get("description", ""),
+            "questions": questions,
+        }
+
+    @staticmethod
+    def _ask_gemini(client, prompt, label):
+        """
+        Sends one prompt to Gemini and parses the JSON answer.
+        Logs the prompt size and latency of every call.
+        """
+        started = time.perf_counter()
+        response_text = client.generate(prompt)
+        elapsed = time.perf_counter() - started
+        metrics.observe_stage("gemini_request", elapsed)
+        logger.info(
+            "Gemini %s: %d prompt tokens, %.2fs",
+            label,
+            chunking.count_tokens(prompt),
+            elapsed,
+        )
         
-        client = genai.Client(api_key=api_key)
-        short_transcript = transcript_text[:25000]
+        return json.loads(clean_ai_json_response(response_text))
 
-        prompt = f"""
+    @staticmethod
+    def _merge_questions(question_lists, limit):
+        """
+        Merges the questions generated per window into one list.
+        Duplicates (same wording, ignoring case and punctuation) are dropped,
+        and windows are picked round-robin (evenly spaced when there are more
+        windows than remaining questions) so the quiz covers the whole video.
+        """
+        seen = set()
+        unique_lists = []
+        for questions in question_lists:
+            unique = []
+            for question in questions:
+                key = re.sub(r"[^\w]+", " ", question.get("question_title", "").lower()).strip()
+                if key and key not in seen:
+                    seen.add(key)
+                    unique.append(question)
+            unique_lists.append(unique)
+
+        merged = []
+        position = 0
+        while len(merged) < limit:
+            candidates = [q[position] for q in unique_lists if position < len(q)]
+            if not candidates:
+                break
+            remaining = limit - len(merged)
+            if len(candidates) > remaining:
+                # Spread the last picks evenly instead of favouring the first windows
+                step = len(candidates) / remaining
+                candidates = [candidates[int(i * step)] for i in range(remaining)]
+            merged.extend(candidates)
+            position += 1
+        return merged
+
+    @staticmethod
+    def _quiz_prompt(transcript_text, video_url, question_count):
+        return f"""
         You are a quiz generator. Analyze the following TRANSCRIPT of a video (URL: {video_url}).
         
         TRANSCRIPT:
-        "{short_transcript}"
+        "{transcript_text}"
         
-        Create a quiz in GERMAN (Deutsch) based strictly on this text.
+        Create a quiz in GERMAN (Deutsch) with {question_count} questions based strictly on this text.
         Structure:
         {{
             "title": "Deutscher Titel",
@@ -105,9 +472,216 @@ class QuizGenerationService:
         IMPORTANT: Respond ONLY with raw JSON (no markdown). All text must be German.
         """
 
-        response = client.models.generate_content(
-            model='gemini-flash-latest',
-            contents=prompt
-        )
+    @staticmethod
+    def _chunk_prompt(transcript_text, video_url, question_count, part, parts):
+        return f"""
+        You are a quiz generator. Analyze the following part {part} of {parts} of the TRANSCRIPT of a video (URL: {video_url}).
+        
+        TRANSCRIPT PART:
+        "{transcript_text}"
         
-        return json.loads(clean_ai_json_response(response.text))
\ No newline at end of file
+        Create {question_count} quiz questions in GERMAN (Deutsch) based strictly on this part,
+        and summarize the part in one or two German sentences.
+        Structure:
+        {{
+            "summary": "Kurze Zusammenfassung",
+            "questions": [
+                {{
+                    "question_title": "Frage?",
+                    "options": ["A", "B", "C", "D"],
+                    "answer": "A"
+                }}
+            ]
+        }}
+        IMPORTANT: Respond ONLY with raw JSON (no markdown). All text must be German.
+        """
+
+    @staticmethod
+    def _overview_prompt(summaries, video_url):
+        joined = "\n".join(f"- {summary}" for summary in summaries if summary)
+        return f"""
+        You are a quiz generator. These are summaries of consecutive parts of a video (URL: {video_url}):
+        
+        {joined}
+        
+        Write a title and a short description in GERMAN (Deutsch) for a quiz about the whole video.
+        Structure:
+        {{
+            "title": "Deutscher Titel",
+            "description": "Kurze Beschreibung"
+        }}
+        IMPORTANT: Respond ONLY with raw JSON (no markdown). All text must be German.
+        """
+
+
+
+class QuizPersistenceService:
+    """
+    Service class to store generated or imported quizzes.
+    Validates the payload first, then writes the quiz and all of its
+    questions in a single transaction.
+    """
+
+    @staticmethod
+    def create_quiz(user, video_url, quiz_data):
+        """
+        Creates a Quiz with its Questions from a quiz payload
+        ({"title", "description", "questions": [...]}).
+        Raises ValueError if the payload is invalid; nothing is written then.
+        """
+        data = QuizPersistenceService.validate(quiz_data)
+
+        with transaction.atomic():
+            return QuizPersistenceService._create(user, video_url, data)
+
+    @staticmethod
+    def create_quizzes(user, items):
+        """
+        Creates several quizzes from (video_url, quiz_data) pairs.
+        All payloads are validated before the first write, and either all
+        quizzes are stored or none.
+        """
+        validated = [
+            (video_url, QuizPersistenceService.validate(quiz_data))
+            for video_url, quiz_data in items
+        ]
+
+        with transaction.atomic():
+            return [
+                QuizPersistenceService._create(user, video_url, data)
+                for video_url, data in validated
+            ]
+
+    @staticmethod
+    def validate(quiz_data):
+        serializer = GeneratedQuizSerializer(data=quiz_data)
+        if not serializer.is_valid():
+            raise ValueError(f"Invalid quiz data: {serializer.errors}")
+        return serializer.validated_data
+
+    @staticmethod
+    def _create(user, video_url, data):
+        quiz = Quiz.objects.create(
+            user=user,
+            title=data['title'],
+            description=data['description'],
+            video_url=video_url
+        )
+        Question.objects.bulk_create([
+            Question(
+                quiz=quiz,
+                question_text=q_data['question_title'],
+                options=q_data['options'],
+                answer=q_data['answer']
+            )
+            for q_data in data['questions']
+        ])
+        return quiz
+
+
+class QuizAttemptService:
+    """
+    Service class to grade submitted answers and keep the quiz statistics.
+    Every attempt updates running totals per quiz and per question in the
+    same transaction, so reading statistics costs the same however many
+    attempts exist.
+    """
+
+    @staticmethod
+    def submit(user, quiz, answers):
+        """
+        Grades `answers` ({question_id: selected option}) against the quiz,
+        stores the attempt with one answer row per question and updates the
+        statistics. Unanswered questions count as wrong. The answer rows are
+        also attached to the returned attempt as `graded_answers`.
+        Raises ValueError if an answer refers to a question of another quiz.
+        """
+        questions = list(quiz.questions.only('id', 'quiz', 'answer').order_by('id'))
+        unknown = set(answers) - {question.id for question in questions}
+        if unknown:
+            raise ValueError(f"Unknown questions: {sorted(unknown)}")
+
+        graded = [
+            AttemptAnswer(
+                question=question,
+                selected=answers.get(question.id, ""),
+                is_correct=answers.get(question.id) == question.answer,
+            )
+            for question in questions
+        ]
+        score = sum(answer.is_correct for answer in graded)
+
+        with transaction.atomic():
+            attempt = Attempt.objects.create(
+                user=user,
+                quiz=quiz,
+                score=score,
+                question_count=len(questions)
+            )
+            for answer in graded:
+                answer.attempt = attempt
+            AttemptAnswer.objects.bulk_create(graded)
+            QuizAttemptService._record(quiz, score, graded)
+
+        attempt.graded_answers = graded
+        return attempt
+
+    @staticmethod
+    def statistics(quiz):
+        """
+        Returns the attempt count, average score, score distribution and
+        the correct rate of every question, read from the running totals.
+        """
+        stats = QuizStats.objects.filter(quiz=quiz).first() or QuizStats(quiz=quiz)
+        question_stats = {
+            row.question_id: row for row in QuestionStats.objects.filter(quiz=quiz)
+        }
+
+        questions = []
+        for question_id, question_text in quiz.questions.order_by('id').values_list('id', 'question_text'):
+            row = question_stats.get(question_id)
+            answered = row.answer_count if row else 0
+            correct = row.correct_count if row else 0
+            questions.append({
+                "question": question_id,
+                "question_title": question_text,
+                "answer_count": answered,
+                "correct_count": correct,
+                "correct_rate": correct / answered if answered else None,
+            })
+
+        return {
+            "attempt_count": stats.attempt_count,
+            "average_score": stats.score_sum / stats.attempt_count if stats.attempt_count else None,
+            "score_distribution": {
+                int(score): count for score, count in sorted(stats.score_distribution.items(), key=lambda item: int(item[0]))
+            },
+            "questions": questions,
+        }
+
+    @staticmethod
+    def _record(quiz, score, graded):
+        """
+        Adds one attempt to the running totals. Question counters are
+        incremented in the database; the quiz row is locked while its
+        score distribution is updated.
+        """
+        QuestionStats.objects.bulk_create(
+            [QuestionStats(question_id=answer.question.id, quiz=quiz) for answer in graded],
+            ignore_conflicts=True
+        )
+        correct_ids = [answer.question.id for answer in graded if answer.is_correct]
+        wrong_ids = [answer.question.id for answer in graded if not answer.is_correct]
+        QuestionStats.objects.filter(question_id__in=correct_ids).update(
+            answer_count=F('answer_count') + 1,
+            correct_count=F('correct_count') + 1,
+        )
+        QuestionStats.objects.filter(question_id__in=wrong_ids).update(answer_count=F('answer_count') + 1)
+
+        QuizStats.objects.bulk_create([QuizStats(quiz=quiz)], ignore_conflicts=True)
+        stats = QuizStats.objects.select_for_update().get(quiz=quiz)
+        distribution = stats.score_distribution
+        distribution[str(score)] = distribution.get(str(score), 0) + 1
+        stats.attempt_count += 1
+        stats.score_sum += score
+        stats.save()
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import metrics, quiz_cache
+from .models import Quiz, Question
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_quiz_cache(sender, instance, **kwargs):
+    """
+    Drops the cached detail response when a quiz is saved or deleted,
+    including edits made in the admin.
+    """
+    quiz_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def touch_quiz_on_question_change(sender, instance, **kwargs):
+    """
+    Bumps the parent quiz's `updated_at` when one of its questions changes,
+    so its ETag changes and the cached detail response is dropped.
+    """
+    # Cascades from a deleted quiz; invalidate_quiz_cache already handles it
+    if isinstance(kwargs.get('origin'), Quiz):
+        return
+    Quiz.objects.filter(pk=instance.quiz_id).update(updated_at=timezone.now())
+    quiz_cache.invalidate(instance.quiz_id)
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """
+    Applies SQLITE_PRAGMAS (WAL journaling, synchronous=NORMAL, busy timeout,
+    memory-mapped I/O) to every new SQLite connection.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(connection_created)
+def install_query_metrics(sender, connection, **kwargs):
+    """
+    Counts and times the queries of every request for MetricsMiddleware.
+    """
+    if settings.METRICS_ENABLED and metrics.record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(metrics.record_query)
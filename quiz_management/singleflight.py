@@ -0,0 +1,202 @@
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import GenerationFlight
+
+
+class CoalescedGenerationError(Exception):
+    """
+    Raised to callers that waited on a generation which failed.
+    """
+
+
+class _LocalFlight:
+    """
+    Shares the outcome and current stage of a generation between
+    threads of the same process.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self.stage = None
+        self.progress = 0
+        self.done = False
+        self.result = None
+        self.error = None
+
+    def report(self, stage, progress):
+        with self._cond:
+            self.stage = stage
+            self.progress = progress
+            self._cond.notify_all()
+
+    def finish(self, result=None, error=None):
+        with self._cond:
+            self.result = result
+            self.error = error
+            self.done = True
+            self._cond.notify_all()
+
+    def wait(self, report_stage):
+        seen = (None, 0)
+        while True:
+            with self._cond:
+                if (self.stage, self.progress) == seen and not self.done:
+                    self._cond.wait()
+                current, done = (self.stage, self.progress), self.done
+
+            if current != seen:
+                seen = current
+                report_stage(*current)
+            if done:
+                break
+
+        if self.error is not None:
+            raise CoalescedGenerationError(str(self.error)) from self.error
+        return self.result
+
+
+_local_lock = threading.Lock()
+_local_flights = {}
+
+
+def run(key, fn, report_stage):
+    """
+    Runs `fn(report_stage)` once for all concurrent callers with the same key.
+
+    Threads of one process share a local flight; across processes the
+    GenerationFlight row decides which caller does the work. Waiting
+    callers receive the leader's stages and progress through their own
+    `report_stage(stage, progress)` and return its result.
+
+    An exception from a caller's own `report_stage` (e.g. a lost job lease)
+    only fails that caller: the generation keeps running for the others,
+    and the exception is raised to the caller once it has finished.
+    """
+    with _local_lock:
+        flight = _local_flights.get(key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _LocalFlight()
+            _local_flights[key] = flight
+
+    if not is_leader:
+        return flight.wait(report_stage)
+
+    reporter_errors = []
+
+    def report(stage, progress):
+        flight.report(stage, progress)
+        if reporter_errors:
+            return
+        try:
+            report_stage(stage, progress)
+        except Exception as e:
+            reporter_errors.append(e)
+
+    try:
+        result = _run_across_processes(key, fn, report)
+    except Exception as e:
+        flight.finish(error=e)
+        raise
+    else:
+        flight.finish(result=result)
+    finally:
+        with _local_lock:
+            _local_flights.pop(key, None)
+
+    if reporter_errors:
+        raise reporter_errors[0]
+    return result
+
+
+def _run_across_processes(key, fn, report_stage):
+    owner = uuid.uuid4().hex
+
+    while not _try_acquire(key, owner):
+        outcome = _wait_for_leader(key, report_stage)
+        if outcome is not None:
+            return outcome["result"]
+
+    def leader_report(stage, progress):
+        GenerationFlight.objects.filter(key=key, owner=owner).update(
+            stage=stage,
+            progress=progress,
+            expires_at=_deadline(settings.SINGLE_FLIGHT_LEASE_SECONDS),
+        )
+        report_stage(stage, progress)
+
+    try:
+        result = fn(leader_report)
+    except Exception as e:
+        _finish(key, owner, error=str(e) or e.__class__.__name__)
+        raise
+
+    _finish(key, owner, result=result)
+    return result
+
+
+def _try_acquire(key, owner):
+    """
+    Inserts the flight row for `key`. Returns False if another caller holds it.
+    Expired rows (finished long ago or abandoned by a crashed leader) are removed first.
+    """
+    GenerationFlight.objects.filter(expires_at__lt=timezone.now()).delete()
+    try:
+        with transaction.atomic():
+            GenerationFlight.objects.create(
+                key=key,
+                owner=owner,
+                expires_at=_deadline(settings.SINGLE_FLIGHT_LEASE_SECONDS),
+            )
+        return True
+    except IntegrityError:
+        return False
+
+
+def _wait_for_leader(key, report_stage):
+    """
+    Polls the flight row until the leader finishes.
+
+    Returns {"result": ...} on success, raises CoalescedGenerationError if
+    the leader failed, and returns None if the row vanished or expired so
+    the caller should try to become the leader itself.
+    """
+    seen = (None, 0)
+    while True:
+        flight = GenerationFlight.objects.filter(key=key).first()
+        if flight is None or flight.expires_at < timezone.now():
+            return None
+
+        if flight.stage and (flight.stage, flight.progress) != seen:
+            seen = (flight.stage, flight.progress)
+            report_stage(*seen)
+
+        if flight.finished_at is not None:
+            if flight.error:
+                raise CoalescedGenerationError(flight.error)
+            return {"result": flight.result}
+
+        time.sleep(settings.SINGLE_FLIGHT_POLL_SECONDS)
+
+
+def _finish(key, owner, result=None, error=""):
+    """
+    Publishes the leader's outcome for waiting callers for a short while.
+    """
+    GenerationFlight.objects.filter(key=key, owner=owner).update(
+        result=result,
+        error=error,
+        finished_at=timezone.now(),
+        expires_at=_deadline(settings.SINGLE_FLIGHT_RESULT_SECONDS),
+    )
+
+
+def _deadline(seconds):
+    return timezone.now() + timedelta(seconds=seconds)
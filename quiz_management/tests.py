@@ -1,3 +1,1423 @@
-from django.test import TestCase
+import io
+import json
+import os
+import re
+import stat
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import audio, chunking, events, gemini_client, jobs, metrics, parallel_transcription, quiz_cache, singleflight, transcript_cache
+from .apps import QuizManagementConfig
+from .jobs import LeaseLostError, _update_job, claim_next_job, run_job, start_embedded_workers
+from .management.commands.check_import_time import WEB_WORKER_IMPORTS, WORKER_ONLY_MODULES, measure_imports
+from .models import (
+    AttemptAnswer,
+    GenerationBatch,
+    GenerationFlight,
+    GenerationJob,
+    Question,
+    Quiz,
+    TranscriptCacheEntry,
+)
+from .progress import ProgressReporter
+from .services import QuizGenerationService, QuizPersistenceService
+from .views import AsyncGetQuizzesView, AsyncQuizDetailView
+from .whisper_registry import WhisperModelRegistry
+
+
+def create_quizzes(user, count, questions_per_quiz=3):
+    """
+    Creates `count` quizzes with questions for `user`.
+    """
+    quizzes = Quiz.objects.bulk_create([
+        Quiz(user=user, title=f"Quiz {i}", video_url="https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        for i in range(count)
+    ])
+    Question.objects.bulk_create([
+        Question(quiz=quiz, question_text=f"Frage {j}?", options=["A", "B", "C", "D"], answer="A")
+        for quiz in quizzes
+        for j in range(questions_per_quiz)
+    ])
+    return quizzes
+
+
+class GetQuizzesViewTests(TestCase):
+    """
+    Tests for the paginated quiz list.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('get-quizzes')
+
+    def test_query_count_does_not_grow_with_library_size(self):
+        create_quizzes(self.user, 2)
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+
+        create_quizzes(self.user, 50)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'page_size': 50})
+
+        self.assertEqual(len(response.data), 50)
+
+    def test_cursor_walks_all_quizzes_once(self):
+        create_quizzes(self.user, 7)
+        seen = []
+        url = self.url + '?page_size=3'
+
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(quiz['id'] for quiz in response.data)
+            link = response.headers.get('Link')
+            url = link[1:link.index('>')] if link else None
+
+        expected = list(Quiz.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_only_own_quizzes_are_listed(self):
+        other = User.objects.create_user("other", "other@example.com", "secret-password")
+        create_quizzes(other, 3)
+        create_quizzes(self.user, 1)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(len(response.data), 1)
+
+    def test_summary_view_returns_counts_in_one_query(self):
+        create_quizzes(self.user, 5, questions_per_quiz=4)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'view': 'summary'})
+
+        self.assertEqual(len(response.data), 5)
+        self.assertEqual(response.data[0]['question_count'], 4)
+        self.assertNotIn('questions', response.data[0])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class QuizDetailViewTests(TestCase):
+    """
+    Tests for the cached quiz detail endpoint and its ETags.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.quiz = create_quizzes(self.user, 1)[0]
+        self.url = reverse('quiz-detail', args=[self.quiz.pk])
+
+    def test_cached_response_needs_a_single_query(self):
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(len(second.data['questions']), 3)
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get(self.url).headers['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_patch_invalidates_cached_response(self):
+        etag = self.client.get(self.url).headers['ETag']
+
+        self.client.patch(self.url, {'title': 'Neuer Titel'}, format='json')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'Neuer Titel')
+
+    def test_question_change_invalidates_cached_response(self):
+        etag = self.client.get(self.url).headers['ETag']
+
+        question = self.quiz.questions.first()
+        question.question_text = "Geänderte Frage?"
+        question.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Geänderte Frage?", [q['question_title'] for q in response.data['questions']])
+
+    def test_deleting_a_quiz_does_not_touch_it_per_question(self):
+        quiz = create_quizzes(self.user, 1, questions_per_quiz=10)[0]
+        quiz_id = quiz.pk
+
+        # Independent of the number of questions
+        with self.assertNumQueries(9), mock.patch.object(quiz_cache, 'invalidate') as invalidate:
+            quiz.delete()
+
+        invalidate.assert_called_once_with(quiz_id)
+
+    def test_other_users_quiz_is_not_served_from_cache(self):
+        self.client.get(self.url)
+        other = User.objects.create_user("other", "other@example.com", "secret-password")
+        self.client.force_authenticate(other)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
+
+class JobEventsViewTests(TestCase):
+    """
+    Tests for the Server-Sent Events stream of a generation job.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.quiz = create_quizzes(self.user, 1)[0]
+        self.job = GenerationJob.objects.create(
+            user=self.user,
+            video_url=self.quiz.video_url,
+            status=GenerationJob.STATUS_DONE,
+            progress=100,
+            quiz=self.quiz,
+        )
+        self.url = reverse('job-events', args=[self.job.pk])
+
+    def authenticate(self, user):
+        self.async_client.cookies['access_token'] = str(AccessToken.for_user(user))
+
+    async def test_finished_job_streams_done_event(self):
+        self.authenticate(self.user)
+
+        response = await self.async_client.get(self.url)
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertIn("event: done\n", body)
+        self.assertIn(f'"quiz": {self.quiz.pk}', body)
+
+    @override_settings(GENERATION_EVENTS_POLL_SECONDS=0.5, GENERATION_EVENTS_MAX_POLL_SECONDS=4)
+    async def test_polling_backs_off_while_the_job_is_unchanged(self):
+        job = await GenerationJob.objects.acreate(
+            user=self.user, video_url=self.quiz.video_url, status=GenerationJob.STATUS_TRANSCRIBING
+        )
+        jobs_query = GenerationJob.objects.filter(pk=job.pk)
+        sleeps = []
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 4:
+                await jobs_query.aupdate(progress=50)
+            elif len(sleeps) == 6:
+                await jobs_query.aupdate(status=GenerationJob.STATUS_DONE, progress=100, quiz=self.quiz)
+
+        request = AsyncRequestFactory().get(self.url)
+        with mock.patch.object(events.asyncio, 'sleep', sleep):
+            body = "".join([event async for event in events.job_events(request, job.pk)])
+
+        self.assertEqual(sleeps, [0.5, 1, 2, 4, 0.5, 1])
+        self.assertEqual(body.count("event: progress\n"), 2)
+        self.assertIn("event: done\n", body)
+
+    async def test_unauthenticated_request_is_rejected(self):
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_other_users_job_is_not_streamed(self):
+        other = await User.objects.acreate_user("other", "other@example.com", "secret-password")
+        self.authenticate(other)
+
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 404)
+
+
+class AsyncQuizViewsTests(TestCase):
+    """
+    Tests for the native async variants of the quiz list and detail views.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.quizzes = create_quizzes(self.user, 3)
+        self.factory = AsyncRequestFactory()
+        self.token = str(AccessToken.for_user(self.user))
+
+    def request(self, method, path, **kwargs):
+        request = getattr(self.factory, method)(path, **kwargs)
+        request.COOKIES['access_token'] = self.token
+        return request
+
+    async def test_list_matches_sync_view(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        expected = await sync_to_async(client.get)(reverse('get-quizzes'), {'page_size': 2})
+
+        response = await AsyncGetQuizzesView.as_view()(self.request('get', '/api/quizzes/?page_size=2'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), json.loads(expected.content))
+        self.assertIn('rel="next"', response.headers['Link'])
+
+    async def test_detail_etag_and_patch(self):
+        pk = self.quizzes[0].pk
+        view = AsyncQuizDetailView.as_view()
+
+        first = await view(self.request('get', f'/api/quizzes/{pk}/'), pk=pk)
+        cached = await view(
+            self.request('get', f'/api/quizzes/{pk}/', headers={'If-None-Match': first.headers['ETag']}), pk=pk
+        )
+        patched = await view(
+            self.request('patch', f'/api/quizzes/{pk}/', data={'title': 'Neuer Titel'}, content_type='application/json'),
+            pk=pk,
+        )
+
+        self.assertEqual(len(json.loads(first.content)['questions']), 3)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(json.loads(patched.content)['title'], 'Neuer Titel')
+        self.assertNotEqual(patched.headers['ETag'], first.headers['ETag'])
+
+    async def test_unauthenticated_request_is_rejected(self):
+        request = self.factory.get('/api/quizzes/')
+
+        response = await AsyncGetQuizzesView.as_view()(request)
+
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(GENERATION_EMBEDDED_WORKERS=False, GENERATION_BATCH_CONCURRENCY=2)
+class GenerationBatchTests(TestCase):
+    """
+    Tests for batch quiz creation and the per-batch concurrency limit.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('create-quiz-batch')
+
+    def test_invalid_urls_are_rejected_without_failing_the_batch(self):
+        urls = [
+            "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+            "https://example.com/about",
+            "https://youtu.be/dQw4w9WgXcQ",
+            "https://www.youtube.com/watch?v=9bZkp7q5f0w",
+        ]
+
+        response = self.client.post(self.url, {'urls': urls}, format='json')
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(len(response.data['jobs']), 2)
+        self.assertEqual(response.data['counts']['queued'], 2)
+        self.assertEqual([item['error'] for item in response.data['rejected']], ["Invalid YouTube URL", "Duplicate video"])
+
+        status_response = self.client.get(response.headers['Location'])
+        self.assertEqual(status_response.data['id'], response.data['id'])
+        self.assertFalse(status_response.data['finished'])
+
+    def test_playlist_is_expanded(self):
+        videos = [f"https://www.youtube.com/watch?v=video{i:06d}" for i in range(3)]
+        with mock.patch(
+            'quiz_management.services.QuizGenerationService.expand_playlist',
+            return_value=("Kurs", videos),
+        ):
+            response = self.client.post(
+                self.url, {'playlist_url': "https://www.youtube.com/playlist?list=PL123"}, format='json'
+            )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['title'], "Kurs")
+        self.assertEqual([job['video_url'] for job in response.data['jobs']], videos)
+
+    def test_workers_respect_batch_concurrency(self):
+        urls = [f"https://www.youtube.com/watch?v=video{i:06d}" for i in range(4)]
+        self.client.post(self.url, {'urls': urls}, format='json')
+        single = GenerationJob.objects.create(user=self.user, video_url=urls[0])
+
+        claimed = [claim_next_job(f"worker-{i}") for i in range(4)]
+
+        batch = GenerationBatch.objects.get()
+        self.assertEqual([job.batch_id for job in claimed[:2]], [batch.pk, batch.pk])
+        self.assertEqual(claimed[2].pk, single.pk)
+        self.assertIsNone(claimed[3])
+
+
+def in_thread(target, *args):
+    """
+    Starts `target(*args)` in a thread that closes its database connection when done.
+    """
+    def run():
+        try:
+            target(*args)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+@override_settings(SINGLE_FLIGHT_POLL_SECONDS=0.01)
+class SingleFlightTests(TransactionTestCase):
+    """
+    Tests for coalescing concurrent generations of the same video.
+    """
+
+    def run_coalesced(self, leader_report, follower_report, fail=False):
+        """
+        Runs a leader and a follower on the same key. The leader's generation
+        blocks until the follower has received its first stage.
+        Returns the number of generations and the outcome of both callers.
+        """
+        started, release = threading.Event(), threading.Event()
+        calls, outcomes = [], {}
+
+        def generate(report_stage):
+            calls.append(1)
+            report_stage("transcribing", 10)
+            started.set()
+            release.wait(5)
+            report_stage("generating", 90)
+            if fail:
+                raise RuntimeError("Gemini is down")
+            return {"title": "Quiz"}
+
+        def call(name, report_stage):
+            try:
+                outcomes[name] = singleflight.run("video:abc", generate, report_stage)
+            except Exception as e:
+                outcomes[name] = e
+
+        def follow(stage, progress):
+            release.set()
+            follower_report(stage, progress)
+
+        leader = in_thread(call, "leader", leader_report)
+        self.assertTrue(started.wait(5))
+        follower = in_thread(call, "follower", follow)
+        leader.join(5)
+        follower.join(5)
+        return len(calls), outcomes
+
+    def test_concurrent_callers_share_one_generation(self):
+        follower_stages = []
+
+        calls, outcomes = self.run_coalesced(lambda *stage: None, lambda *stage: follower_stages.append(stage))
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(outcomes, {"leader": {"title": "Quiz"}, "follower": {"title": "Quiz"}})
+        self.assertEqual(follower_stages[-1], ("generating", 90))
+
+    def test_failure_is_raised_to_followers(self):
+        calls, outcomes = self.run_coalesced(lambda *stage: None, lambda *stage: None, fail=True)
+
+        self.assertEqual(calls, 1)
+        self.assertIsInstance(outcomes["leader"], RuntimeError)
+        self.assertIsInstance(outcomes["follower"], singleflight.CoalescedGenerationError)
+        self.assertIn("Gemini is down", str(outcomes["follower"]))
+
+    def test_failing_leader_reporter_does_not_fail_followers(self):
+        def lose_lease(stage, progress):
+            raise LeaseLostError("Lease taken over.")
+
+        calls, outcomes = self.run_coalesced(lose_lease, lambda *stage: None)
+
+        self.assertEqual(calls, 1)
+        self.assertIsInstance(outcomes["leader"], LeaseLostError)
+        self.assertEqual(outcomes["follower"], {"title": "Quiz"})
+
+    def test_expired_flight_is_taken_over(self):
+        GenerationFlight.objects.create(
+            key="video:abc",
+            owner="crashed-worker",
+            stage="transcribing",
+            expires_at=timezone.now() + timedelta(seconds=0.2),
+        )
+        stages = []
+
+        result = singleflight.run(
+            "video:abc",
+            lambda report_stage: {"title": "Quiz"},
+            lambda *stage: stages.append(stage),
+        )
+
+        self.assertEqual(result, {"title": "Quiz"})
+        self.assertEqual(stages, [("transcribing", 0)])
+        self.assertNotEqual(GenerationFlight.objects.get(key="video:abc").owner, "crashed-worker")
+
+
+@override_settings(GENERATION_EMBEDDED_WORKERS=False)
+class JobLeaseTests(TestCase):
+    """
+    Tests for leasing generation jobs to workers.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.job = GenerationJob.objects.create(user=self.user, video_url="https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+    def test_job_with_expired_lease_is_claimed_again(self):
+        claim_next_job("worker-1")
+        GenerationJob.objects.filter(pk=self.job.pk).update(
+            status=GenerationJob.STATUS_TRANSCRIBING,
+            lease_expires_at=timezone.now() - timedelta(seconds=1),
+        )
+
+        job = claim_next_job("worker-2")
+
+        self.assertEqual(job.pk, self.job.pk)
+        self.assertEqual(job.lease_owner, "worker-2")
+        self.assertEqual(job.attempts, 2)
+
+    def test_job_with_live_lease_is_not_claimed(self):
+        claim_next_job("worker-1")
+        GenerationJob.objects.filter(pk=self.job.pk).update(status=GenerationJob.STATUS_TRANSCRIBING)
+
+        self.assertIsNone(claim_next_job("worker-2"))
+        self.assertEqual(GenerationJob.objects.get(pk=self.job.pk).lease_owner, "worker-1")
+
+    def test_concurrent_claimers_never_get_the_same_job(self):
+        second = GenerationJob.objects.create(user=self.user, video_url="https://www.youtube.com/watch?v=9bZkp7q5f0w")
+        lease_deadline = jobs._lease_deadline
+        claimed = {}
+
+        def claim_in_between():
+            # Another worker claims the first candidate right before worker-1 updates it
+            if "worker-2" not in claimed:
+                claimed["worker-2"] = None
+                claimed["worker-2"] = claim_next_job("worker-2")
+            return lease_deadline()
+
+        with mock.patch.object(jobs, '_lease_deadline', side_effect=claim_in_between):
+            claimed["worker-1"] = claim_next_job("worker-1")
+
+        self.assertEqual(claimed["worker-2"].pk, self.job.pk)
+        self.assertEqual(claimed["worker-1"].pk, second.pk)
+        self.assertEqual(
+            dict(GenerationJob.objects.values_list('pk', 'lease_owner')),
+            {self.job.pk: "worker-2", second.pk: "worker-1"},
+        )
+
+    def test_update_after_takeover_raises_lease_lost(self):
+        job = claim_next_job("worker-1")
+        GenerationJob.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+        claim_next_job("worker-2")
+
+        with self.assertRaises(LeaseLostError):
+            _update_job(job, "worker-1", progress=50)
+        self.assertEqual(GenerationJob.objects.get(pk=job.pk).progress, 0)
+
+
+def quiz_payload(title="Quiz", answer="A"):
+    return {
+        "title": title,
+        "description": "",
+        "questions": [{"question_title": "Frage?", "options": ["A", "B", "C", "D"], "answer": answer}],
+    }
+
+
+class QuizPersistenceTests(TestCase):
+    """
+    Tests for validating and storing generated or imported quizzes.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+    def test_answer_must_be_one_of_the_options(self):
+        with self.assertRaisesMessage(ValueError, "The answer must be one of the options."):
+            QuizPersistenceService.create_quiz(self.user, self.url, quiz_payload(answer="E"))
+
+    def test_questions_are_required(self):
+        without_questions = {"title": "Quiz", "description": ""}
+        for payload in [without_questions, {**without_questions, "questions": []}]:
+            with self.assertRaises(ValueError):
+                QuizPersistenceService.create_quiz(self.user, self.url, payload)
+        self.assertFalse(Quiz.objects.exists())
+
+    def test_invalid_payload_stores_no_quiz_of_the_import(self):
+        items = [(self.url, quiz_payload("Erstes")), (self.url, quiz_payload("Zweites", answer="E"))]
+
+        with self.assertRaises(ValueError):
+            QuizPersistenceService.create_quizzes(self.user, items)
+
+        self.assertFalse(Quiz.objects.exists())
+
+    def test_failed_write_rolls_back_the_import(self):
+        items = [(self.url, quiz_payload("Erstes")), (self.url, quiz_payload("Zweites"))]
+
+        with mock.patch.object(Question.objects, 'bulk_create', side_effect=[[], RuntimeError("disk full")]):
+            with self.assertRaises(RuntimeError):
+                QuizPersistenceService.create_quizzes(self.user, items)
+
+        self.assertFalse(Quiz.objects.exists())
+
+    def import_file(self, payload):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as file:
+            json.dump(payload, file)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def test_import_command_stores_quizzes(self):
+        path = self.import_file([
+            {"video_url": self.url, **quiz_payload("Erstes")},
+            {"video_url": self.url, **quiz_payload("Zweites")},
+        ])
+        stdout = io.StringIO()
+
+        call_command('import_quizzes', path, username="tester", stdout=stdout)
+
+        self.assertIn("Imported 2 quizzes.", stdout.getvalue())
+        self.assertEqual(sorted(Quiz.objects.values_list('title', flat=True)), ["Erstes", "Zweites"])
+
+    def test_import_command_reports_invalid_quizzes(self):
+        path = self.import_file([
+            {"video_url": self.url, **quiz_payload("Erstes")},
+            {"video_url": self.url, **quiz_payload("Zweites", answer="E")},
+        ])
+
+        with self.assertRaisesMessage(CommandError, "The answer must be one of the options."):
+            call_command('import_quizzes', path, username="tester", stdout=io.StringIO())
+        self.assertFalse(Quiz.objects.exists())
+
+
+class WordEncoding:
+    """
+    Stand-in for a tiktoken encoding with one token per word.
+    """
+
+    def encode(self, text):
+        return re.findall(r"\S+\s*", text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+class TranscriptWindowTests(SimpleTestCase):
+    """
+    Tests for splitting long transcripts into overlapping windows and
+    merging the questions generated per window.
+    """
+    text = "".join(f"Das ist Satz Nummer {i}. " for i in range(200))
+
+    def split(self, max_tokens, overlap_tokens, encoding=WordEncoding()):
+        with mock.patch.object(chunking, 'get_encoding', return_value=encoding):
+            return chunking.split_into_windows(self.text, max_tokens, overlap_tokens)
+
+    def test_windows_respect_the_token_limit_and_overlap(self):
+        windows = self.split(max_tokens=100, overlap_tokens=10)
+        encoding = WordEncoding()
+
+        self.assertGreater(len(windows), 1)
+        self.assertTrue(all(len(encoding.encode(window)) <= 100 for window in windows))
+        self.assertTrue(self.text.startswith(windows[0]))
+        self.assertTrue(self.text.endswith(windows[-1]))
+        for previous, window in zip(windows, windows[1:]):
+            overlap = "".join(encoding.encode(previous)[-10:])
+            self.assertTrue(window.startswith(overlap))
+            # Windows end after a full sentence
+            self.assertTrue(previous.endswith(". "))
+
+    def test_overlap_is_capped_so_the_split_advances(self):
+        windows = self.split(max_tokens=20, overlap_tokens=100)
+
+        # Every window starts at least half a window after the previous one
+        self.assertLessEqual(len(windows), 1000 // 10)
+        self.assertTrue(self.text.endswith(windows[-1]))
+
+    def test_characters_are_used_without_tokenizer(self):
+        windows = self.split(max_tokens=100, overlap_tokens=10, encoding=None)
+
+        self.assertGreater(len(windows), 1)
+        self.assertTrue(all(len(window) <= 100 * chunking.CHARS_PER_TOKEN for window in windows))
+        self.assertTrue(self.text.endswith(windows[-1]))
+
+    def test_missing_tiktoken_falls_back_to_characters(self):
+        with mock.patch.dict(sys.modules, {'tiktoken': None}), mock.patch.object(chunking, '_encoding', None):
+            with self.assertLogs('quiz_management.chunking', 'WARNING'):
+                self.assertIsNone(chunking.get_encoding())
+            self.assertEqual(chunking.count_tokens("x" * 40), 40 // chunking.CHARS_PER_TOKEN + 1)
+
+    def test_duplicates_from_overlapping_windows_are_dropped(self):
+        def questions(*titles):
+            return [{"question_title": title, "options": ["A", "B"], "answer": "A"} for title in titles]
+
+        merged = QuizGenerationService._merge_questions(
+            [questions("Was ist X?", "Was ist Y?"), questions("was ist x", "Was ist Z?")], 10
+        )
+
+        self.assertEqual([q["question_title"] for q in merged], ["Was ist X?", "Was ist Z?", "Was ist Y?"])
+
+
+class FakeClock:
+    """
+    Replaces time.monotonic() and time.sleep() with a clock that only
+    advances when slept on.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FlakyBackend(gemini_client.FakeBackend):
+    """
+    FakeBackend that raises the given errors before answering.
+    """
+
+    def __init__(self, *errors):
+        super().__init__()
+        self.errors = list(errors)
+        self.calls = 0
+
+    def generate(self, model, prompt):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return super().generate(model, prompt)
+
+
+@override_settings(GEMINI_FAKE_LATENCY_SECONDS=0, GEMINI_RETRY_INITIAL_SECONDS=0, GEMINI_RETRY_MAX_SECONDS=0)
+class GeminiClientTests(SimpleTestCase):
+    """
+    Tests for the rate limiting, concurrency limit and retries of Gemini requests.
+    """
+
+    def gemini(self, backend, max_concurrent=8, rate=0, burst=1, max_attempts=3):
+        return gemini_client.GeminiClient(backend, max_concurrent, rate, burst, max_attempts)
+
+    def test_token_bucket_allows_bursts_then_limits_the_rate(self):
+        clock = FakeClock()
+        with mock.patch.object(gemini_client, 'time', clock):
+            bucket = gemini_client.TokenBucket(rate=2, capacity=3)
+            for _ in range(3):
+                bucket.acquire()
+            self.assertEqual(clock.now, 0)
+
+            bucket.acquire()
+            bucket.acquire()
+            self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_token_bucket_without_rate_never_waits(self):
+        clock = FakeClock()
+        with mock.patch.object(gemini_client, 'time', clock):
+            bucket = gemini_client.TokenBucket(rate=0, capacity=1)
+            for _ in range(10):
+                bucket.acquire()
+        self.assertEqual(clock.now, 0)
+
+    def test_transient_errors_are_retried(self):
+        from google.genai import errors as genai_errors
+
+        backend = FlakyBackend(
+            genai_errors.ClientError(429, {"error": {"message": "Rate limit"}}),
+            genai_errors.ServerError(503, {"error": {"message": "Unavailable"}}),
+        )
+
+        response = self.gemini(backend).generate("Prompt")
+
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(json.loads(response)["title"], "Test-Quiz")
+
+    def test_other_errors_are_not_retried(self):
+        from google.genai import errors as genai_errors
+
+        backend = FlakyBackend(genai_errors.ClientError(400, {"error": {"message": "Bad request"}}))
+
+        with self.assertRaises(genai_errors.ClientError):
+            self.gemini(backend).generate("Prompt")
+        self.assertEqual(backend.calls, 1)
+
+    def test_retries_stop_after_max_attempts(self):
+        backend = FlakyBackend(*[httpx.ConnectTimeout("Timeout")] * 5)
+
+        with self.assertRaises(httpx.ConnectTimeout):
+            self.gemini(backend, max_attempts=3).generate("Prompt")
+        self.assertEqual(backend.calls, 3)
+
+    def test_requests_in_flight_are_limited(self):
+        lock = threading.Lock()
+        # Every request waits for a second one, so two are always in flight together
+        pairs = threading.Barrier(2)
+        in_flight = [0, 0]
+
+        class CountingBackend(gemini_client.FakeBackend):
+            def generate(self, model, prompt):
+                with lock:
+                    in_flight[0] += 1
+                    in_flight[1] = max(in_flight)
+                try:
+                    pairs.wait(5)
+                    return super().generate(model, prompt)
+                finally:
+                    with lock:
+                        in_flight[0] -= 1
+
+        client = self.gemini(CountingBackend(), max_concurrent=2)
+        threads = [threading.Thread(target=client.generate, args=("Prompt",)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(in_flight, [0, 2])
+
+    @override_settings(QUIZ_QUESTION_COUNT=4)
+    def test_fake_backend_answers_with_a_valid_quiz(self):
+        quiz_data = json.loads(gemini_client.FakeBackend().generate("model", "Prompt"))
+
+        data = QuizPersistenceService.validate(quiz_data)
+
+        self.assertEqual(len(data["questions"]), 4)
+
+
+class TranscriptStitchingTests(SimpleTestCase):
+    """
+    Tests for joining the transcripts of overlapping audio chunks.
+    """
+
+    def test_repeated_words_are_dropped(self):
+        merged = parallel_transcription.merge_transcripts([
+            "Heute lernen wir etwas über Python.",
+            "über python Danach folgt Django.",
+        ])
+
+        self.assertEqual(merged, "Heute lernen wir etwas über Python. Danach folgt Django.")
+
+    def test_word_cut_at_the_chunk_edge_is_replaced(self):
+        merged = parallel_transcription.merge_transcripts([
+            "Heute lernen wir etwas über Pyt",
+            "etwas über Python und Django.",
+        ])
+
+        self.assertEqual(merged, "Heute lernen wir etwas über Python und Django.")
+
+    def test_chunks_without_overlap_are_joined(self):
+        merged = parallel_transcription.merge_transcripts(["Das ist gut", "gut gemacht, weiter so."])
+
+        # A single matching word is treated as a coincidence
+        self.assertEqual(merged, "Das ist gut gut gemacht, weiter so.")
+
+    def test_empty_chunks_are_skipped(self):
+        merged = parallel_transcription.merge_transcripts(["", "eins zwei drei", "  ", "zwei drei vier"])
+
+        self.assertEqual(merged, "eins zwei drei vier")
+        self.assertEqual(parallel_transcription.merge_transcripts(["", ""]), "")
+
+    def test_overlap_is_searched_within_the_limit(self):
+        left = "a b c d e f".split()
+        right = "a b c d e f g".split()
+
+        self.assertEqual(parallel_transcription._find_overlap(left, right, 6), (0, 6))
+        # The repeated part is longer than the limit allows to look back
+        self.assertEqual(parallel_transcription._find_overlap(left, right, 4), (0, 0))
+        self.assertEqual(parallel_transcription._find_overlap([], right, 4), (0, 0))
+
+
+@override_settings(TRANSCRIPT_CACHE_ENABLED=True, TRANSCRIPT_CACHE_MAX_BYTES=10)
+class TranscriptCacheTests(TestCase):
+    """
+    Tests for caching Whisper transcripts in the database.
+    """
+    options = {"language": "de"}
+
+    def setUp(self):
+        patcher = mock.patch.dict(transcript_cache._counters, {"hits": 0, "misses": 0})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_hits_and_misses_are_counted(self):
+        self.assertIsNone(transcript_cache.get_transcript("video1", "base", self.options))
+        transcript_cache.store_transcript("video1", "base", self.options, "Hallo")
+
+        self.assertEqual(transcript_cache.get_transcript("video1", "base", self.options), "Hallo")
+        self.assertIsNone(transcript_cache.get_transcript("video1", "small", self.options))
+        self.assertIsNone(transcript_cache.get_transcript("video1", "base", {"language": "en"}))
+
+        stats = transcript_cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 3))
+        self.assertEqual((stats["entries"], stats["bytes"], stats["lifetime_hits"]), (1, 5, 1))
+        self.assertEqual(stats["lifetime_hit_ratio"], 0.5)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        for video_id in ["old", "older"]:
+            transcript_cache.store_transcript(video_id, "base", self.options, "1234")
+        TranscriptCacheEntry.objects.filter(video_id="older").update(
+            last_used_at=timezone.now() - timedelta(hours=2)
+        )
+        TranscriptCacheEntry.objects.filter(video_id="old").update(last_used_at=timezone.now() - timedelta(hours=1))
+
+        # Reading "older" makes "old" the least recently used entry
+        transcript_cache.get_transcript("older", "base", self.options)
+        transcript_cache.store_transcript("new", "base", self.options, "1234")
+
+        self.assertEqual(
+            sorted(TranscriptCacheEntry.objects.values_list('video_id', flat=True)), ["new", "older"]
+        )
+
+    def test_transcripts_larger_than_the_cache_are_not_stored(self):
+        transcript_cache.store_transcript("video1", "base", self.options, "x" * 11)
+
+        self.assertFalse(TranscriptCacheEntry.objects.exists())
+
+    def test_stats_command(self):
+        transcript_cache.store_transcript("video1", "base", self.options, "Hallo")
+        transcript_cache.get_transcript("video1", "base", self.options)
+        stdout = io.StringIO()
+
+        call_command('transcript_cache_stats', stdout=stdout)
+
+        output = stdout.getvalue()
+        self.assertIn("Entries:       1", output)
+        self.assertIn("Bytes stored:  5 / 10", output)
+        self.assertIn("Lifetime hits: 1", output)
+        self.assertIn("Hit ratio:     50.0%", output)
+
+
+class OverlapDetectingModel:
+    """
+    Stub Whisper model that records whether two transcriptions overlapped
+    and returns the initial prompt it was given along with the segment.
+    """
+
+    def __init__(self, seconds=0.05):
+        self.seconds = seconds
+        self.prompts = []
+        self.active = 0
+        self.overlapped = False
+        self._lock = threading.Lock()
+
+    def transcribe(self, samples, initial_prompt=None, **options):
+        with self._lock:
+            self.active += 1
+            self.overlapped = self.overlapped or self.active > 1
+            self.prompts.append(initial_prompt)
+        try:
+            time.sleep(self.seconds)
+            return {"text": f" Teil {int(samples[0])}. "}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class WhisperRegistryTests(SimpleTestCase):
+    """
+    Tests for sharing loaded Whisper models within a process.
+    """
+
+    def registry(self, max_models):
+        loader = mock.Mock(side_effect=lambda name: f"model:{name}")
+        return WhisperModelRegistry(max_models=max_models, loader=loader), loader
+
+    def test_each_model_is_loaded_once(self):
+        registry, loader = self.registry(max_models=2)
+
+        self.assertEqual(registry.get("base"), "model:base")
+        self.assertEqual(registry.get("base"), "model:base")
+        self.assertEqual(registry.get("small"), "model:small")
+
+        self.assertEqual(loader.call_args_list, [mock.call("base"), mock.call("small")])
+        stats = registry.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 2, 0))
+
+    def test_least_recently_used_model_is_evicted(self):
+        registry, loader = self.registry(max_models=2)
+        registry.preload(["base", "small"])
+        registry.get("base")
+
+        registry.get("medium")
+
+        self.assertEqual(registry.loaded(), ["base", "medium"])
+        self.assertEqual(registry.stats()["evictions"], 1)
+        registry.get("small")
+        self.assertEqual(loader.call_count, 4)
+
+    def test_concurrent_callers_share_one_load(self):
+        registry, loader = self.registry(max_models=1)
+        threads = [threading.Thread(target=registry.get, args=("base",)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        loader.assert_called_once_with("base")
+        self.assertEqual(registry.stats()["hits"], 3)
+
+    def test_transcriptions_with_a_shared_model_do_not_overlap(self):
+        model = OverlapDetectingModel()
+        registry = WhisperModelRegistry(max_models=1, loader=lambda name: model)
+        samples = np.ones(audio.SAMPLE_RATE, dtype=np.float32)
+
+        def transcribe_stream():
+            segments = (samples for _ in range(3))
+            QuizGenerationService._transcribe_segments(segments, ProgressReporter(lambda *stage: None))
+
+        with mock.patch('quiz_management.services.whisper_registry', registry):
+            threads = [
+                threading.Thread(target=QuizGenerationService._transcribe_audio, args=(samples,)),
+                threading.Thread(target=QuizGenerationService._transcribe_audio, args=(samples,)),
+                threading.Thread(target=transcribe_stream),
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+
+        self.assertEqual(len(model.prompts), 5)
+        self.assertFalse(model.overlapped)
+
+    @override_settings(WHISPER_PRELOAD=True)
+    def test_startup_work_depends_on_the_command(self):
+        app_config = QuizManagementConfig.create('quiz_management')
+        # argv, preloads Whisper
+        cases = [
+            (["manage.py", "migrate"], False),
+            (["manage.py", "test"], False),
+            (["manage.py", "runserver"], False),
+            (["manage.py", "runserver", "--noreload"], True),
+            (["manage.py", "run_generation_workers"], True),
+            (["gunicorn", "Quizly.wsgi"], True),
+        ]
+        for argv, preloads in cases:
+            with (
+                self.subTest(argv=argv),
+                mock.patch('sys.argv', argv),
+                mock.patch.dict(os.environ, {'RUN_MAIN': ''}),
+                mock.patch('quiz_management.whisper_registry.registry.preload') as preload,
+            ):
+                app_config.ready()
+                self.assertEqual(preload.called, preloads)
+
+    def test_web_application_starts_the_embedded_workers_if_enabled(self):
+        for enabled in (True, False):
+            with (
+                self.subTest(enabled=enabled),
+                override_settings(GENERATION_EMBEDDED_WORKERS=enabled),
+                mock.patch('quiz_management.jobs.get_worker_pool') as get_worker_pool,
+            ):
+                start_embedded_workers()
+                self.assertEqual(get_worker_pool.return_value.start.called, enabled)
+
+
+@override_settings(
+    GENERATION_EMBEDDED_WORKERS=False,
+    CAPTIONS_ENABLED=True,
+    TRANSCRIBE_PIPELINE_ENABLED=True,
+    TRANSCRIBE_PARALLEL_ENABLED=False,
+    GEMINI_FAKE_LATENCY_SECONDS=0,
+    QUIZ_QUESTION_COUNT=3,
+)
+class TranscriptSourceTests(TestCase):
+    """
+    Tests for using the video's captions before transcribing its audio.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        gemini = gemini_client.GeminiClient(gemini_client.FakeBackend(), 1, 0, 1, 1)
+        for patcher in [
+            mock.patch.object(gemini_client, '_client', gemini),
+            mock.patch.object(chunking, 'get_encoding', return_value=None),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_generation(self, captions):
+        GenerationJob.objects.create(user=self.user, video_url=self.url)
+        job = claim_next_job("worker-1")
+        with (
+            mock.patch.object(QuizGenerationService, '_fetch_captions', return_value=captions) as fetch,
+            mock.patch.object(QuizGenerationService, '_transcribe_stream', return_value="Whisper-Text.") as whisper,
+            self.assertLogs('quiz_management.services', 'INFO'),
+        ):
+            run_job(job, "worker-1")
+        job.refresh_from_db()
+        return job, fetch, whisper
+
+    def test_captions_are_used_when_available(self):
+        job, fetch, whisper = self.run_generation("Untertitel-Text.")
+
+        self.assertEqual(job.status, GenerationJob.STATUS_DONE)
+        self.assertEqual(job.transcript_source, "captions")
+        fetch.assert_called_once_with("dQw4w9WgXcQ")
+        whisper.assert_not_called()
+
+    def test_whisper_is_used_without_captions(self):
+        job, fetch, whisper = self.run_generation(None)
+
+        self.assertEqual(job.status, GenerationJob.STATUS_DONE)
+        self.assertEqual(job.transcript_source, "whisper")
+        fetch.assert_called_once()
+        whisper.assert_called_once()
+
+    @override_settings(CAPTIONS_ENABLED=False)
+    def test_captions_are_skipped_if_disabled(self):
+        job, fetch, whisper = self.run_generation("Untertitel-Text.")
+
+        self.assertEqual(job.transcript_source, "whisper")
+        fetch.assert_not_called()
+        whisper.assert_called_once()
+
+
+FAKE_FFMPEG = """#!{python}
+import sys
+sys.stderr.write("warning: corrupt frame\\n" * 20000)
+sys.stderr.flush()
+sys.stdout.buffer.write(bytes({pcm_bytes}))
+sys.exit({exit_code})
+"""
+
+
+@unittest.skipIf(os.name == 'nt', "Uses an executable script as FFmpeg")
+class AudioStreamTests(SimpleTestCase):
+    """
+    Tests for decoding an audio stream with FFmpeg while it downloads.
+    """
+
+    def use_fake_ffmpeg(self, pcm_bytes, exit_code):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "ffmpeg")
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(FAKE_FFMPEG.format(python=sys.executable, pcm_bytes=pcm_bytes, exit_code=exit_code))
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+        patcher = mock.patch.dict(os.environ, {'PATH': directory.name + os.pathsep + os.environ.get('PATH', '')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_verbose_stderr_does_not_block_decoding(self):
+        # 1.5 seconds of audio after far more stderr output than a pipe buffers
+        self.use_fake_ffmpeg(pcm_bytes=audio.SAMPLE_RATE * 3, exit_code=0)
+
+        segments = list(audio.stream_pcm_segments("https://example.com/audio", {}, segment_seconds=1))
+
+        self.assertEqual([len(segment) for segment in segments], [audio.SAMPLE_RATE, audio.SAMPLE_RATE // 2])
+
+    def test_stderr_is_reported_when_ffmpeg_fails(self):
+        self.use_fake_ffmpeg(pcm_bytes=0, exit_code=1)
+
+        with self.assertRaisesMessage(RuntimeError, "warning: corrupt frame"):
+            list(audio.stream_pcm_segments("https://example.com/audio", {}, segment_seconds=1))
+
+
+class TranscriptionPipelineTests(SimpleTestCase):
+    """
+    Tests for transcribing decoded segments while the next ones are decoded.
+    """
+
+    def setUp(self):
+        self.model = OverlapDetectingModel(seconds=0)
+        registry = WhisperModelRegistry(max_models=1, loader=lambda name: self.model)
+        patcher = mock.patch('quiz_management.services.whisper_registry', registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.closed = threading.Event()
+
+    def segments(self, values, error=None, seconds=1):
+        """
+        Yields one segment per value, filled with the value, then raises `error`.
+        """
+        try:
+            for value in values:
+                yield np.full(int(seconds * audio.SAMPLE_RATE), value, dtype=np.float32)
+            if error is not None:
+                raise error
+        finally:
+            self.closed.set()
+
+    def transcribe(self, segments):
+        return QuizGenerationService._transcribe_segments(segments, ProgressReporter(lambda *stage: None), 3)
+
+    def assertDecoderStopped(self):
+        self.assertTrue(self.closed.wait(5))
+        for thread in threading.enumerate():
+            if thread.name == "audio-decoder":
+                thread.join(5)
+                self.assertFalse(thread.is_alive())
+
+    def test_segments_are_stitched_in_order(self):
+        transcript = self.transcribe(self.segments([1, 2, 3]))
+
+        self.assertEqual(transcript, "Teil 1. Teil 2. Teil 3.")
+
+    def test_previous_text_is_the_initial_prompt(self):
+        self.transcribe(self.segments([1, 2, 3]))
+
+        self.assertEqual(self.model.prompts, [None, "Teil 1.", "Teil 2."])
+
+    def test_very_short_segments_are_skipped(self):
+        def segments():
+            yield from self.segments([1])
+            yield np.full(audio.SAMPLE_RATE // 20, 2, dtype=np.float32)
+            yield from self.segments([3])
+
+        transcript = self.transcribe(segments())
+
+        self.assertEqual(transcript, "Teil 1. Teil 3.")
+
+    def test_decoder_error_is_raised_to_the_caller(self):
+        with self.assertRaisesMessage(RuntimeError, "FFmpeg failed"):
+            self.transcribe(self.segments([1, 2], error=RuntimeError("FFmpeg failed")))
+
+        self.assertDecoderStopped()
+
+    def test_transcription_error_stops_the_decoder(self):
+        self.model.transcribe = mock.Mock(side_effect=RuntimeError("Out of memory"))
+
+        with override_settings(TRANSCRIBE_PIPELINE_DEPTH=1), self.assertRaisesMessage(RuntimeError, "Out of memory"):
+            self.transcribe(self.segments(range(1, 100)))
+
+        self.assertDecoderStopped()
+
+
+class QuizAttemptTests(TestCase):
+    """
+    Tests for attempt submission and the running quiz statistics.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.quiz = create_quizzes(self.user, 1)[0]
+        self.question_ids = list(self.quiz.questions.order_by('id').values_list('id', flat=True))
+
+    def submit(self, answers):
+        data = {'answers': [{'question': pk, 'answer': answer} for pk, answer in answers.items()]}
+        return self.client.post(reverse('quiz-attempts', args=[self.quiz.pk]), data, format='json')
+
+    def test_attempt_is_graded_on_the_server(self):
+        first, second, third = self.question_ids
+        response = self.submit({first: "A", second: "B"})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['score'], 1)
+        self.assertEqual(response.data['question_count'], 3)
+        self.assertEqual(
+            [(a['question'], a['selected'], a['is_correct']) for a in response.data['answers']],
+            [(first, "A", True), (second, "B", False), (third, "", False)]
+        )
+        self.assertEqual(AttemptAnswer.objects.filter(attempt_id=response.data['id']).count(), 3)
+
+    def test_statistics_are_updated_incrementally(self):
+        first, second, third = self.question_ids
+        self.submit({first: "A", second: "A", third: "A"})
+        self.submit({first: "A", second: "B"})
+        self.submit({})
+
+        url = reverse('quiz-stats', args=[self.quiz.pk])
+        with self.assertNumQueries(4):
+            stats = self.client.get(url).data
+
+        self.assertEqual(stats['attempt_count'], 3)
+        self.assertAlmostEqual(stats['average_score'], 4 / 3)
+        self.assertEqual(stats['score_distribution'], {0: 1, 1: 1, 3: 1})
+        self.assertEqual([q['correct_count'] for q in stats['questions']], [2, 1, 1])
+        self.assertEqual([q['answer_count'] for q in stats['questions']], [3, 3, 3])
+
+        self.submit({first: "A"})
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+    def test_answers_to_other_questions_are_rejected(self):
+        other_quiz = create_quizzes(self.user, 1)[0]
+        response = self.submit({other_quiz.questions.first().pk: "A"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AttemptAnswer.objects.exists())
+
+    def test_other_users_quiz_is_not_found(self):
+        other = User.objects.create_user("other", "other@example.com", "secret-password")
+        self.client.force_authenticate(other)
+
+        self.assertEqual(self.submit({}).status_code, 404)
+        self.assertEqual(self.client.get(reverse('quiz-stats', args=[self.quiz.pk])).status_code, 404)
+
+
+class MetricsTests(TestCase):
+    """
+    Tests for the Server-Timing header and the Prometheus endpoint.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("tester", "tester@example.com", "secret-password")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing_reports_query_count(self):
+        create_quizzes(self.user, 3)
+        response = self.client.get(reverse('get-quizzes'))
+
+        self.assertRegex(response.headers['Server-Timing'], r'^db;dur=[\d.]+;desc="2 queries", total;dur=[\d.]+$')
+
+    @override_settings(DEBUG=True, METRICS_STATE_CACHE_SECONDS=0)
+    def test_views_and_stages_are_exported(self):
+        self.client.get(reverse('get-quizzes'))
+        with metrics.span("download"):
+            pass
+
+        body = self.client.get(reverse('metrics')).content.decode()
+
+        self.assertIn('quizly_http_request_duration_seconds_count{view="get-quizzes",method="GET",status="200"}', body)
+        self.assertRegex(body, r'quizly_http_request_db_queries_bucket\{view="get-quizzes",le="2\.0"\} [1-9]')
+        self.assertRegex(body, r'quizly_generation_stage_seconds_count\{stage="download"\} [1-9]')
+        self.assertIn('quizly_generation_jobs{status="queued"} 0', body)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_token_is_required_if_configured(self):
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, 401)
+        response = self.client.get(url, headers={'Authorization': 'Bearer scrape-secret'})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN="")
+    def test_endpoint_is_closed_without_token_outside_debug(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+    @override_settings(DEBUG=True, METRICS_STATE_CACHE_SECONDS=60)
+    def test_database_gauges_are_cached_between_scrapes(self):
+        url = reverse('metrics')
+        self.client.get(url)
+        GenerationJob.objects.create(user=self.user, video_url="https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+
+        with self.assertNumQueries(0):
+            body = self.client.get(url).content.decode()
+        self.assertIn('quizly_generation_jobs{status="queued"} 0', body)
+
+
+class ImportTimeTests(SimpleTestCase):
+    """
+    Keeps the generation backends out of web worker startup.
+    """
+
+    def test_web_worker_does_not_import_generation_backends(self):
+        imports = measure_imports(WEB_WORKER_IMPORTS)
+
+        self.assertIn("quiz_management.views", imports)
+        for name in WORKER_ONLY_MODULES:
+            self.assertNotIn(name, imports)
+
+
+# EXPLAIN output that indicates a full table scan (SQLite, PostgreSQL)
+FULL_SCAN_PATTERNS = [
+    re.compile(r"\bSCAN (?!CONSTANT ROW)(?!.*\bUSING (COVERING )?INDEX\b)"),
+    re.compile(r"\bSeq Scan\b"),
+]
+
+
+def explain(sql):
+    """
+    Returns the query plan of `sql` as text.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+        cursor.execute(f"EXPLAIN {sql}")
+        return "\n".join(str(row[0]) for row in cursor.fetchall())
+
+
+class QueryPlanTests(TestCase):
+    """
+    Runs EXPLAIN on every query issued by the hot API endpoints against
+    realistically seeded tables and fails if one of them scans a whole table.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create([
+            User(username=f"user{i}", email=f"user{i}@example.com")
+            for i in range(200)
+        ])
+        for user in users:
+            create_quizzes(user, 25)
+        cls.user = users[0]
+        cls.quiz = cls.user.quizzes.first()
+        cls.job = GenerationJob.objects.create(user=cls.user, video_url=cls.quiz.video_url)
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertNoFullTableScans(self, request):
+        with CaptureQueriesContext(connection) as context:
+            request()
+
+        selects = [q['sql'] for q in context.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertTrue(selects)
+        for sql in selects:
+            plan = explain(sql)
+            for pattern in FULL_SCAN_PATTERNS:
+                self.assertIsNone(pattern.search(plan), f"Full table scan:\n{sql}\n{plan}")
+
+    def test_quiz_list(self):
+        url = reverse('get-quizzes')
+        self.assertNoFullTableScans(lambda: self.client.get(url))
+
+    def test_quiz_list_next_page(self):
+        url = reverse('get-quizzes')
+        link = self.client.get(url, {'page_size': 5}).headers['Link']
+        next_url = link[1:link.index('>')]
+        self.assertNoFullTableScans(lambda: self.client.get(next_url))
+
+    def test_quiz_list_summary(self):
+        url = reverse('get-quizzes')
+        self.assertNoFullTableScans(lambda: self.client.get(url, {'view': 'summary'}))
+
+    def test_quiz_detail(self):
+        url = reverse('quiz-detail', args=[self.quiz.pk])
+        self.assertNoFullTableScans(lambda: self.client.get(url))
+
+    def test_job_detail(self):
+        url = reverse('job-detail', args=[self.job.pk])
+        self.assertNoFullTableScans(lambda: self.client.get(url))
+
+    def test_registration_email_check(self):
+        url = reverse('registration')
+        data = {
+            'username': 'newcomer',
+            'email': 'user5@example.com',
+            'password': 'secret-password',
+            'confirmed_password': 'secret-password',
+        }
+        self.assertNoFullTableScans(lambda: self.client.post(url, data, format='json'))
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import TranscriptCacheEntry
+
+_counter_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0}
+
+
+def settings_key(options):
+    """
+    Returns a stable hash of the transcription settings.
+    """
+    encoded = json.dumps(options, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def get_transcript(video_id, model_name, options):
+    """
+    Returns the cached transcript for the key, or None on a miss.
+    """
+    if not settings.TRANSCRIPT_CACHE_ENABLED:
+        return None
+
+    key = settings_key(options)
+    entry = (
+        TranscriptCacheEntry.objects
+        .filter(video_id=video_id, model_name=model_name, settings_key=key)
+        .only("pk", "transcript")
+        .first()
+    )
+
+    if entry is None:
+        _count("misses")
+        return None
+
+    _count("hits")
+    TranscriptCacheEntry.objects.filter(pk=entry.pk).update(
+        hit_count=F("hit_count") + 1,
+        last_used_at=timezone.now(),
+    )
+    return entry.transcript
+
+
+def store_transcript(video_id, model_name, options, transcript):
+    """
+    Stores a transcript and evicts old entries beyond the size limit.
+    """
+    if not settings.TRANSCRIPT_CACHE_ENABLED:
+        return
+
+    size_bytes = len(transcript.encode("utf-8"))
+    if size_bytes > settings.TRANSCRIPT_CACHE_MAX_BYTES:
+        return
+
+    try:
+        TranscriptCacheEntry.objects.update_or_create(
+            video_id=video_id,
+            model_name=model_name,
+            settings_key=settings_key(options),
+            defaults={
+                "transcript": transcript,
+                "size_bytes": size_bytes,
+                "last_used_at": timezone.now(),
+            },
+        )
+    except IntegrityError:
+        # Another worker stored the same transcript concurrently.
+        return
+
+    _evict(settings.TRANSCRIPT_CACHE_MAX_BYTES)
+
+
+def stats():
+    """
+    Returns cache size and hit counters for operators.
+
+    `hits`/`misses` are counted since this process started. The lifetime
+    ratio covers the entries currently stored: each entry was created by
+    exactly one miss and has served `hit_count` hits since.
+    """
+    totals = TranscriptCacheEntry.objects.aggregate(
+        bytes=Sum("size_bytes"),
+        lifetime_hits=Sum("hit_count"),
+    )
+    with _counter_lock:
+        hits = _counters["hits"]
+        misses = _counters["misses"]
+
+    entries = TranscriptCacheEntry.objects.count()
+    lifetime_hits = totals["lifetime_hits"] or 0
+    lookups = hits + misses
+    lifetime_lookups = lifetime_hits + entries
+    return {
+        "entries": entries,
+        "bytes": totals["bytes"] or 0,
+        "max_bytes": settings.TRANSCRIPT_CACHE_MAX_BYTES,
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / lookups if lookups else 0.0,
+        "lifetime_hits": lifetime_hits,
+        "lifetime_hit_ratio": lifetime_hits / lifetime_lookups if lifetime_lookups else 0.0,
+    }
+
+
+def _count(name):
+    with _counter_lock:
+        _counters[name] += 1
+
+
+def _evict(max_bytes):
+    """
+    Deletes least recently used entries until the cache fits into `max_bytes`.
+    """
+    total = TranscriptCacheEntry.objects.aggregate(total=Sum("size_bytes"))["total"] or 0
+    if total <= max_bytes:
+        return
+
+    stale_ids = []
+    for pk, size_bytes in (
+        TranscriptCacheEntry.objects
+        .order_by("last_used_at")
+        .values_list("pk", "size_bytes")
+        .iterator()
+    ):
+        if total <= max_bytes:
+            break
+        stale_ids.append(pk)
+        total -= size_bytes
+
+    TranscriptCacheEntry.objects.filter(pk__in=stale_ids).delete()
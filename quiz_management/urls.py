@@ -1,8 +1,33 @@
+from django.conf import settings
 from django.urls import path
-from .views import CreateQuizView, GetQuizzesView, QuizDetailView
+from .views import (
+    AsyncGetQuizzesView,
+    AsyncQuizDetailView,
+    BatchDetailView,
+    CreateQuizBatchView,
+    CreateQuizView,
+    GetQuizzesView,
+    JobDetailView,
+    JobEventsView,
+    QuizAttemptsView,
+    QuizDetailView,
+    QuizStatsView,
+)
+
+# Native async views for deployments behind an ASGI server
+if settings.ASYNC_VIEWS_ENABLED:
+    QuizListView, QuizView = AsyncGetQuizzesView, AsyncQuizDetailView
+else:
+    QuizListView, QuizView = GetQuizzesView, QuizDetailView
 
 urlpatterns = [
     path('createQuiz/', CreateQuizView.as_view(), name='create-quiz'),
-    path('quizzes/', GetQuizzesView.as_view(), name='get-quizzes'),
-    path('quizzes/<int:pk>/', QuizDetailView.as_view(), name='quiz-detail'),
+    path('createQuizBatch/', CreateQuizBatchView.as_view(), name='create-quiz-batch'),
+    path('batches/<int:pk>/', BatchDetailView.as_view(), name='batch-detail'),
+    path('quizzes/', QuizListView.as_view(), name='get-quizzes'),
+    path('quizzes/<int:pk>/', QuizView.as_view(), name='quiz-detail'),
+    path('quizzes/<int:pk>/attempts/', QuizAttemptsView.as_view(), name='quiz-attempts'),
+    path('quizzes/<int:pk>/stats/', QuizStatsView.as_view(), name='quiz-stats'),
+    path('jobs/<int:pk>/', JobDetailView.as_view(), name='job-detail'),
+    path('jobs/<int:pk>/events/', JobEventsView.as_view(), name='job-events'),
 ]
\ No newline at end of file
@@ -34,4 +34,15 @@ def clean_ai_json_response(response_text):
         cleaned_text = cleaned_text[7:]
     if cleaned_text.endswith("```"):
         cleaned_text = cleaned_text[:-3]
-    return cleaned_text
\ No newline at end of file
+    return cleaned_text
+
+
+def etag_matches(request, etag):
+    """
+    Checks whether the request's If-None-Match header contains the given ETag.
+    """
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or etag in candidates
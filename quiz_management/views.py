@@ -1,16 +1,40 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Count
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views import View
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Quiz, Question
-from .serializers import CreateQuizRequestSerializer, QuizResponseSerializer
-from .services import QuizGenerationService
+from authentication.authentication import AsyncAPIView
+
+from . import metrics, quiz_cache
+from .events import job_events
+from .jobs import enqueue_batch, enqueue_job
+from .models import GenerationBatch, GenerationJob, Quiz
+from .pagination import KeysetPagination
+from .serializers import (
+    AttemptSerializer,
+    AttemptSubmissionSerializer,
+    CreateQuizBatchRequestSerializer,
+    CreateQuizRequestSerializer,
+    GenerationBatchSerializer,
+    GenerationJobSerializer,
+    QuizResponseSerializer,
+    QuizSummarySerializer,
+)
+from .services import QuizAttemptService, QuizGenerationService
+from .utils import etag_matches, extract_youtube_video_id
 
 
 class CreateQuizView(APIView):
     """
-    API View to handle the creation of a new quiz from a YouTube URL.
+    API View to queue the creation of a new quiz from a YouTube URL.
+    Returns 202 Accepted with the job; progress is reported by JobDetailView.
     """
     permission_classes = [IsAuthenticated]
 
@@ -21,29 +45,83 @@ class CreateQuizView(APIView):
 
         raw_url = serializer.validated_data['url']
 
+        if not extract_youtube_video_id(raw_url):
+            return Response({"error": "Invalid YouTube URL"}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            generated_data = QuizGenerationService.generate_quiz_from_url(raw_url)
+            job = enqueue_job(request.user, raw_url)
+            response_serializer = GenerationJobSerializer(job, context={'request': request})
+            return Response(
+                response_serializer.data,
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': response_serializer.data['status_url']}
+            )
 
-            quiz = Quiz.objects.create(
-                user=request.user,
-                title=generated_data.get('title', 'Generated Quiz'),
-                description=generated_data.get('description', ''),
-                video_url=raw_url
+        except Exception as e:
+            return Response(
+                {"error": "Internal server error.", "details": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-            for q_data in generated_data.get('questions', []):
-                Question.objects.create(
-                    quiz=quiz,
-                    question_text=q_data['question_title'],
-                    options=q_data['options'],
-                    answer=q_data['answer']
+
+class CreateQuizBatchView(APIView):
+    """
+    API View to queue quiz creation for a list of YouTube URLs or a playlist.
+    Returns 202 Accepted with the batch. URLs that are not YouTube videos are
+    listed under `rejected` instead of failing the whole batch.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = CreateQuizBatchRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        playlist_url = serializer.validated_data.get('playlist_url', '')
+        title = ''
+        if playlist_url:
+            try:
+                title, urls = QuizGenerationService.expand_playlist(
+                    playlist_url, settings.GENERATION_BATCH_MAX_ITEMS
+                )
+            except Exception as e:
+                return Response(
+                    {"error": "Could not read the playlist.", "details": str(e)},
+                    status=status.HTTP_400_BAD_REQUEST
                 )
+        else:
+            urls = serializer.validated_data['urls']
 
-            response_serializer = QuizResponseSerializer(quiz)
-            return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+        accepted = []
+        rejected = []
+        seen_ids = set()
+        for url in urls:
+            video_id = extract_youtube_video_id(url)
+            if not video_id:
+                rejected.append({"url": url, "error": "Invalid YouTube URL"})
+            elif video_id in seen_ids:
+                rejected.append({"url": url, "error": "Duplicate video"})
+            else:
+                seen_ids.add(video_id)
+                accepted.append(url)
+
+        if not accepted:
+            return Response(
+                {"error": "No valid YouTube URLs in the batch.", "rejected": rejected},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            batch = enqueue_batch(request.user, accepted, source_url=playlist_url, title=title)
+            batch = GenerationBatch.objects.prefetch_related('jobs').get(pk=batch.pk)
+            data = GenerationBatchSerializer(batch, context={'request': request}).data
+            data['rejected'] = rejected
+            return Response(
+                data,
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': data['status_url']}
+            )
 
-        except ValueError as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response(
                 {"error": "Internal server error.", "details": str(e)},
@@ -51,18 +129,100 @@ class CreateQuizView(APIView):
             )
 
 
+class BatchDetailView(APIView):
+    """
+    API View to report the state of a generation batch and each of its jobs.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        batch = (
+            GenerationBatch.objects.filter(pk=pk, user=request.user)
+            .prefetch_related('jobs')
+            .first()
+        )
+        if batch is None:
+            return Response(
+                {"error": "Batch not found or not authorized."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = GenerationBatchSerializer(batch, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class JobDetailView(APIView):
+    """
+    API View to report the state of a quiz generation job.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            job = GenerationJob.objects.get(pk=pk, user=request.user)
+        except GenerationJob.DoesNotExist:
+            return Response(
+                {"error": "Job not found or not authorized."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = GenerationJobSerializer(job, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class JobEventsView(AsyncAPIView):
+    """
+    Streams the progress of a quiz generation job as Server-Sent Events.
+    The view is async, so under the ASGI application (Quizly/asgi.py) an
+    open stream does not hold a worker thread while it waits.
+    """
+
+    async def get(self, request, pk):
+        exists = await GenerationJob.objects.filter(pk=pk, user=request.user).aexists()
+        if not exists:
+            return JsonResponse(
+                {"error": "Job not found or not authorized."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        response = StreamingHttpResponse(job_events(request, pk), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+def quiz_list_queryset(request):
+    """
+    Returns the quizzes of the requesting user and the serializer for the
+    requested list view (`?view=summary` or full quizzes with questions).
+    """
+    quizzes = Quiz.objects.filter(user=request.user)
+    if request.GET.get('view') == 'summary':
+        quizzes = quizzes.only(
+            'id', 'title', 'description', 'created_at', 'updated_at', 'video_url'
+        ).annotate(question_count=Count('questions'))
+        return quizzes, QuizSummarySerializer
+    return quizzes.prefetch_related('questions'), QuizResponseSerializer
+
+
 class GetQuizzesView(APIView):
     """
-    API View to retrieve all quizzes for the authenticated user.
+    API View to retrieve the quizzes of the authenticated user, newest first.
+    Results are paginated by cursor; the next page is linked in the `Link` header.
+    With `?view=summary` only the quiz fields and a question count are returned.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        paginator = KeysetPagination()
         try:
-            quizzes = Quiz.objects.filter(user=request.user).order_by('-created_at')
-            serializer = QuizResponseSerializer(quizzes, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            quizzes, serializer_class = quiz_list_queryset(request)
+            page = paginator.paginate_queryset(quizzes, request, view=self)
+            serializer = serializer_class(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
 
+        except ValidationError as e:
+            return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response(
                 {"error": "Internal server error fetching quizzes.", "details": str(e)},
@@ -84,15 +244,33 @@ class QuizDetailView(APIView):
             return None
 
     def get(self, request, pk):
-        quiz = self.get_object(pk, request.user)
-        if not quiz:
+        """
+        Returns the quiz with a strong ETag. Only the quiz's `updated_at` is
+        queried up front: matching `If-None-Match` headers get 304, and the
+        serialized quiz is served from the cache while it is current.
+        """
+        updated_at = (
+            Quiz.objects.filter(pk=pk, user=request.user)
+            .values_list('updated_at', flat=True)
+            .first()
+        )
+        if updated_at is None:
             return Response(
                 {"error": "Quiz not found or not authorized."},
                 status=status.HTTP_404_NOT_FOUND
             )
-        
-        serializer = QuizResponseSerializer(quiz)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+
+        etag = quiz_cache.make_etag(pk, updated_at)
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        data = quiz_cache.get_detail(pk, updated_at)
+        if data is None:
+            quiz = Quiz.objects.prefetch_related('questions').get(pk=pk)
+            data = QuizResponseSerializer(quiz).data
+            quiz_cache.set_detail(pk, updated_at, data)
+
+        return Response(data, status=status.HTTP_200_OK, headers={'ETag': etag})
 
     def patch(self, request, pk):
         quiz = self.get_object(pk, request.user)
@@ -104,8 +282,12 @@ class QuizDetailView(APIView):
         
         serializer = QuizResponseSerializer(quiz, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            quiz = serializer.save()
+            return Response(
+                serializer.data,
+                status=status.HTTP_200_OK,
+                headers={'ETag': quiz_cache.make_etag(quiz.pk, quiz.updated_at)}
+            )
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -118,4 +300,163 @@ class QuizDetailView(APIView):
             )
         
         quiz.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class QuizAttemptsView(APIView):
+    """
+    API View to submit answers to a quiz.
+    The answers are graded on the server and stored as an attempt;
+    returns 201 with the score and the correct answers.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        quiz = Quiz.objects.filter(pk=pk, user=request.user).first()
+        if quiz is None:
+            return Response(
+                {"error": "Quiz not found or not authorized."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = AttemptSubmissionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        answers = {item['question']: item['answer'] for item in serializer.validated_data['answers']}
+        try:
+            attempt = QuizAttemptService.submit(request.user, quiz, answers)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(AttemptSerializer(attempt).data, status=status.HTTP_201_CREATED)
+
+
+class QuizStatsView(APIView):
+    """
+    API View to read the statistics of a quiz: number of attempts, average
+    score, score distribution and the correct rate of every question.
+    Served from running totals, independent of the number of attempts.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        quiz = Quiz.objects.filter(pk=pk, user=request.user).first()
+        if quiz is None:
+            return Response(
+                {"error": "Quiz not found or not authorized."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response(QuizAttemptService.statistics(quiz), status=status.HTTP_200_OK)
+
+
+class AsyncGetQuizzesView(AsyncAPIView):
+    """
+    Native async variant of GetQuizzesView using the async ORM.
+    Routed instead of it when ASYNC_VIEWS_ENABLED is set.
+    """
+
+    async def get(self, request):
+        paginator = KeysetPagination()
+        try:
+            quizzes, serializer_class = quiz_list_queryset(request)
+            page = await paginator.apaginate_queryset(quizzes, request)
+            serializer = serializer_class(page, many=True)
+            return JsonResponse(serializer.data, safe=False, headers=paginator.get_headers())
+
+        except ValidationError as e:
+            return JsonResponse(e.detail, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return JsonResponse(
+                {"error": "Internal server error fetching quizzes.", "details": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class AsyncQuizDetailView(AsyncAPIView):
+    """
+    Native async variant of QuizDetailView using the async ORM and cache.
+    Routed instead of it when ASYNC_VIEWS_ENABLED is set.
+    """
+
+    async def get_object(self, pk, user):
+        return await Quiz.objects.prefetch_related('questions').filter(pk=pk, user=user).afirst()
+
+    def not_found(self):
+        return JsonResponse(
+            {"error": "Quiz not found or not authorized."},
+            status=status.HTTP_404_NOT_FOUND
+        )
+
+    async def get(self, request, pk):
+        updated_at = await (
+            Quiz.objects.filter(pk=pk, user=request.user)
+            .values_list('updated_at', flat=True)
+            .afirst()
+        )
+        if updated_at is None:
+            return self.not_found()
+
+        etag = quiz_cache.make_etag(pk, updated_at)
+        if etag_matches(request, etag):
+            return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        data = await quiz_cache.aget_detail(pk, updated_at)
+        if data is None:
+            quiz = await Quiz.objects.prefetch_related('questions').aget(pk=pk)
+            data = QuizResponseSerializer(quiz).data
+            await quiz_cache.aset_detail(pk, updated_at, data)
+
+        return JsonResponse(data, headers={'ETag': etag})
+
+    async def patch(self, request, pk):
+        quiz = await self.get_object(pk, request.user)
+        if not quiz:
+            return self.not_found()
+
+        try:
+            data = self.parse_json(request)
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON"}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = QuizResponseSerializer(quiz, data=data, partial=True)
+        if serializer.is_valid():
+            quiz = await sync_to_async(serializer.save)()
+            return JsonResponse(
+                serializer.data,
+                headers={'ETag': quiz_cache.make_etag(quiz.pk, quiz.updated_at)}
+            )
+
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    async def delete(self, request, pk):
+        quiz = await Quiz.objects.filter(pk=pk, user=request.user).afirst()
+        if not quiz:
+            return self.not_found()
+
+        await quiz.adelete()
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+
+
+class MetricsView(View):
+    """
+    Serves the request, query and generation stage metrics of this process
+    in the Prometheus text format. Requires METRICS_TOKEN as bearer token;
+    without a configured token it is only served in DEBUG mode.
+    """
+
+    def get(self, request):
+        if not settings.METRICS_ENABLED:
+            raise Http404()
+
+        if settings.METRICS_TOKEN:
+            expected = f"Bearer {settings.METRICS_TOKEN}"
+            if not constant_time_compare(request.headers.get('Authorization', ''), expected):
+                return HttpResponse("Unauthorized.", status=status.HTTP_401_UNAUTHORIZED, content_type="text/plain")
+        elif not settings.DEBUG:
+            return HttpResponse(
+                "Set METRICS_TOKEN to enable /metrics.", status=status.HTTP_403_FORBIDDEN, content_type="text/plain"
+            )
+
+        return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
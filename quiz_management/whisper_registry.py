@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from . import metrics
+
+
+def load_whisper_model(name):
+    """
+    Loads a Whisper model. Whisper (and torch) are only imported here, so
+    processes that never transcribe do not pay for them.
+    """
+    import whisper
+
+    return whisper.load_model(name)
+
+
+class WhisperModelRegistry:
+    """
+    Process-wide registry of loaded Whisper models.
+
+    Each model size is loaded once per process and shared by all threads.
+    At most `max_models` models stay resident; the least recently used one
+    is evicted when a new size has to be loaded.
+
+    A model must not transcribe two inputs at once (its decoder keeps the
+    kv-cache in hooks on shared modules), so callers hold `lock_for(name)`
+    around every `transcribe()` call.
+    """
+
+    def __init__(self, max_models=1, loader=None):
+        self.max_models = max(1, max_models)
+        self._loader = loader or load_whisper_model
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._use_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = {}
+
+    def get(self, name):
+        """
+        Returns the model for `name`, loading it on first use.
+        Concurrent callers asking for the same size wait for a single load.
+        """
+        with self._lock:
+            model = self._touch(name)
+            if model is not None:
+                self.hits += 1
+                return model
+            load_lock = self._load_locks.setdefault(name, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                model = self._touch(name)
+                if model is not None:
+                    self.hits += 1
+                    return model
+                self.misses += 1
+
+            started = time.perf_counter()
+            model = self._loader(name)
+            elapsed = time.perf_counter() - started
+            metrics.observe_stage("whisper_load", elapsed)
+
+            with self._lock:
+                self.load_seconds[name] = elapsed
+                self._models[name] = model
+                while len(self._models) > self.max_models:
+                    self._models.popitem(last=False)
+                    self.evictions += 1
+            return model
+
+    def lock_for(self, name):
+        """
+        Returns the lock that serializes transcriptions with the model `name`.
+        """
+        with self._lock:
+            return self._use_locks.setdefault(name, threading.Lock())
+
+    def preload(self, names):
+        """
+        Loads the given model sizes ahead of the first request.
+        """
+        for name in names:
+            self.get(name)
+
+    def loaded(self):
+        with self._lock:
+            return list(self._models)
+
+    def stats(self):
+        """
+        Returns a snapshot of the registry counters.
+        """
+        with self._lock:
+            return {
+                "loaded": list(self._models),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "load_seconds": dict(self.load_seconds),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def _touch(self, name):
+        model = self._models.get(name)
+        if model is not None:
+            self._models.move_to_end(name)
+        return model
+
+
+registry = WhisperModelRegistry(max_models=settings.WHISPER_MAX_LOADED_MODELS)